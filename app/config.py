@@ -1,4 +1,4 @@
-from typing import Literal
+from typing import Dict, List, Literal, Optional
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -14,12 +14,104 @@ class Settings(BaseSettings):
     port: int = Field(default=8080)
     log_level: LogLevel = Field(default="INFO")
 
+    # Logging settings
+    # Write logs from a background thread instead of on the event loop
+    log_async: bool = Field(default=True)
+    log_queue_size: int = Field(default=10000, ge=1)
+    # Fraction of each high-volume event to keep, by event name
+    log_sample_rates: Dict[str, float] = Field(
+        default={"Cache hit": 0.01, "Fetching weather data": 0.1}
+    )
+
     # Weather API settings
     weather_api_base_url: str = Field(default="https://api.open-meteo.com/v1")
+    # Overall budget in seconds for a fetch, including retries
     weather_api_timeout: int = Field(default=30)
 
+    # Weather API per-phase timeout settings (seconds)
+    weather_api_connect_timeout: float = Field(default=3.0, gt=0)
+    weather_api_read_timeout: float = Field(default=10.0, gt=0)
+    weather_api_write_timeout: float = Field(default=5.0, gt=0)
+    weather_api_pool_timeout: float = Field(default=2.0, gt=0)
+
+    # Weather API retry and hedging settings
+    weather_api_max_retries: int = Field(default=2, ge=0)
+    weather_api_retry_base_delay: float = Field(default=0.1, gt=0)
+    weather_api_retry_max_delay: float = Field(default=2.0, gt=0)
+    weather_api_retry_budget_ratio: float = Field(default=0.1, ge=0)
+    weather_api_retry_budget_min_per_second: float = Field(default=1.0, ge=0)
+    weather_api_hedge_enabled: bool = Field(default=True)
+    weather_api_hedge_percentile: float = Field(default=95.0, gt=0, le=100)
+    weather_api_hedge_min_samples: int = Field(default=20, ge=1)
+
+    # Weather API client-side rate limit settings
+    weather_api_rate_limit_per_second: float = Field(default=10.0, gt=0)
+    weather_api_rate_limit_burst: int = Field(default=20, ge=1)
+    weather_api_max_concurrency: int = Field(default=10, ge=1)
+    weather_api_max_retry_after_seconds: float = Field(default=60.0, ge=0)
+
+    # Weather API circuit breaker settings
+    weather_api_breaker_failure_rate: float = Field(default=0.5, gt=0, le=1)
+    weather_api_breaker_minimum_calls: int = Field(default=10, ge=1)
+    weather_api_breaker_window_size: int = Field(default=20, ge=1)
+    weather_api_breaker_open_seconds: float = Field(default=30.0, gt=0)
+    weather_api_breaker_half_open_probes: int = Field(default=2, ge=1)
+
+    # Weather daily aggregation settings
+    # Derive daily forecasts from the hourly series instead of fetching them
+    weather_daily_from_hourly: bool = Field(default=False)
+
+    # Weather coordinate snapping settings
+    # "grid" rounds to weather_snap_resolution degrees, "geohash" to the centre
+    # of a weather_snap_geohash_precision cell, "none" keeps the coordinates
+    weather_snap_mode: Literal["none", "grid", "geohash"] = Field(default="none")
+    # ~5 km, inside one cell of the upstream models' grids
+    weather_snap_resolution: float = Field(default=0.05, gt=0, le=1)
+    weather_snap_geohash_precision: int = Field(default=5, ge=1, le=12)
+
+    # Weather cache settings
+    # Mapped forecasts kept per cached payload (by section, units and timezone),
+    # 0 maps on every request
+    weather_mapped_views_per_entry: int = Field(default=8, ge=0)
+    weather_cache_max_stale_minutes: int = Field(default=60, ge=0)
+
+    # Response cache settings
+    # Encoded weather responses kept by normalized request, 0 disables the cache
+    response_cache_max_entries: int = Field(default=1024, ge=0)
+    # zlib-compress cached bodies, less memory for a decompress on each hit
+    response_cache_compress: bool = Field(default=False)
+
+    # Request deadline settings
+    request_deadline_header: str = Field(default="X-Request-Deadline-Ms")
+    request_default_deadline_seconds: float = Field(default=29.0, gt=0)
+    request_deadline_margin_ms: int = Field(default=250, ge=0)
+
+    # Add a Server-Timing header and phase timings to each request
+    server_timing_enabled: bool = Field(default=True)
+
     # Health check settings
     health_check_timeout: int = Field(default=5)
+    # Minimum seconds between upstream probes, results are cached in between
+    health_probe_interval_seconds: float = Field(default=30.0, ge=0)
+    health_degraded_latency_ms: float = Field(default=1500.0, gt=0)
+    health_unhealthy_latency_ms: float = Field(default=5000.0, gt=0)
+    health_degraded_error_rate: float = Field(default=0.1, ge=0, le=1)
+    health_unhealthy_error_rate: float = Field(default=0.25, ge=0, le=1)
+
+    # Classification micro-batching settings
+    # Window to merge concurrent requests into one batch, 0 classifies each alone
+    classification_batch_window_ms: float = Field(default=0.0, ge=0)
+    classification_batch_max_rows: int = Field(default=512, ge=1)
+
+    # Classification result cache settings
+    # Discretized conditions remembered across requests, 0 disables the cache
+    classification_cache_max_entries: int = Field(default=4096, ge=0)
+
+    # Classifier model registry settings
+    # Directory of <model>/<version>.npy|.npz artifacts, no models when unset
+    classifier_model_dir: Optional[str] = Field(default=None)
+    # Models to map at startup instead of on first use
+    classifier_model_preload: List[str] = Field(default=[])
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False
@@ -1,24 +1,55 @@
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 from mangum import Mangum
+import structlog
 
+from app.middleware.deadline import DeadlineMiddleware
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.response_cache import ResponseCacheMiddleware
+from app.middleware.server_timing import ServerTimingMiddleware
 from app.routers.base_router import BaseRouter
-from app.routers.v1.weather_router import WeatherRouter
+from app.routers.v1.weather_router import (
+    WeatherRouter,
+    response_cache,
+    weather_service,
+)
 from app.config import settings
+from app.services.model_registry import model_registry
+from app.utils.logging import configure_logging, flush_logs
+
+configure_logging(
+    level=settings.log_level,
+    sample_rates=settings.log_sample_rates,
+    queue_size=settings.log_queue_size,
+    async_sink=settings.log_async,
+)
+
+logger = structlog.get_logger()
+
+
+def load_models() -> None:
+    """Discover model versions and map the ones configured for preloading"""
+    models = model_registry.scan()
+    for name in settings.classifier_model_preload:
+        model_registry.get(name)
+    logger.info("Models available", models=models)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
-    print(f"Starting {settings.app_name} v{settings.app_version}")
-    # Future: Initialize ML models, database connections, etc.
+    logger.info("Starting", app=settings.app_name, version=settings.app_version)
+    load_models()
 
     yield
 
     # Shutdown
-    print("Shutting down...")
-    # Future: Cleanup resources
+    logger.info("Shutting down")
+    model_registry.clear()
+    flush_logs()
 
 
 app = FastAPI(
@@ -29,6 +60,15 @@ app = FastAPI(
     root_path="/prod",  # Config API Gateway
 )
 
+# Repeated weather requests served from encoded responses, inside CORS so
+# cached responses still get its headers
+app.add_middleware(
+    ResponseCacheMiddleware,
+    cache=response_cache,
+    paths=("/api/v1/weather/current", "/api/v1/weather/hourly"),
+    snapper=weather_service.snapper,
+)
+
 # CORS middleware for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -38,11 +78,39 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request deadline for upstream calls
+app.add_middleware(
+    DeadlineMiddleware,
+    header=settings.request_deadline_header,
+    default_seconds=settings.request_default_deadline_seconds,
+    margin_ms=settings.request_deadline_margin_ms,
+)
+
+# Per-phase timings, spans are no-ops when this is disabled
+if settings.server_timing_enabled:
+    app.add_middleware(ServerTimingMiddleware)
+
+# Per-route latency metrics, outermost so it times the whole request
+app.add_middleware(MetricsMiddleware)
+
 # Include routes
 app.include_router(WeatherRouter, prefix="/api")
 app.include_router(BaseRouter, prefix="/api")
 
-handler = Mangum(app, lifespan="off", api_gateway_base_path="/prod")
+mangum_handler = Mangum(app, lifespan="off", api_gateway_base_path="/prod")
+
+# Lambda runs without the lifespan, load models during its init phase instead
+if "AWS_LAMBDA_FUNCTION_NAME" in os.environ:
+    load_models()
+
+
+def handler(event, context):
+    """Lambda entrypoint"""
+    try:
+        return mangum_handler(event, context)
+    finally:
+        # Lambda freezes the process between invocations, write queued logs first
+        flush_logs()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,60 @@
+"""Middleware attaching a per-request deadline to request.state"""
+
+from typing import Optional
+
+import structlog
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.utils.deadline import Deadline
+
+logger = structlog.get_logger()
+
+
+class DeadlineMiddleware:
+    """Sets `request.state.deadline` from the caller's remaining time budget
+
+    The budget is the smallest of a client supplied header (milliseconds left),
+    the Lambda context's remaining time and a default, less a safety margin so
+    there is still time to send the response.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        header: str,
+        default_seconds: float,
+        margin_ms: int = 0,
+    ):
+        self.app = app
+        self.header = header.lower().encode("latin-1")
+        self.default_seconds = default_seconds
+        self.margin_seconds = margin_ms / 1000
+
+    def _header_budget(self, scope: Scope) -> Optional[float]:
+        for name, value in scope.get("headers", []):
+            if name == self.header:
+                try:
+                    return float(value) / 1000
+                except ValueError:
+                    logger.warning("Ignoring invalid deadline header", value=value)
+        return None
+
+    @staticmethod
+    def _lambda_budget(scope: Scope) -> Optional[float]:
+        context = scope.get("aws.context")
+        if context is None or not hasattr(context, "get_remaining_time_in_millis"):
+            return None
+        return context.get_remaining_time_in_millis() / 1000
+
+    def deadline_for(self, scope: Scope) -> Deadline:
+        """Build the deadline for a request scope"""
+        budgets = [self.default_seconds]
+        for budget in (self._header_budget(scope), self._lambda_budget(scope)):
+            if budget is not None:
+                budgets.append(budget)
+        return Deadline.after(max(0.0, min(budgets) - self.margin_seconds))
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["deadline"] = self.deadline_for(scope)
+        await self.app(scope, receive, send)
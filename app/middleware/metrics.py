@@ -0,0 +1,48 @@
+"""Middleware recording per-route request latency"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.metrics import registry
+
+REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds",
+    "Latency of HTTP requests by route",
+    ("method", "route", "status"),
+)
+
+
+class MetricsMiddleware:
+    """Observes request latency labelled by the matched route template
+
+    Unmatched paths share one label so arbitrary URLs can't blow up the
+    number of series.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                str(status_code),
+            ).observe(time.perf_counter() - start)
@@ -0,0 +1,272 @@
+"""Middleware serving repeated weather requests from encoded response bytes
+
+Requests for the same route, snapped coordinates and other query parameters
+produce the same body apart from three fields, so the encoded body is kept
+and served without mapping, validation or encoding. A cached body lives no
+longer than the earliest expiring weather cache entry it was built from and
+is never kept for stale responses.
+
+Bodies start with `timestamp`, `latitude` and `longitude`, the fields that
+differ between such requests. Only the rest of the body is cached, the three
+fields are rendered for each response: the coordinates echo the request and
+`timestamp` is the time the response is sent, as for uncached responses.
+"""
+
+import json
+import math
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.services.weather.cache import ResponseExpiry, response_expiry
+from app.services.weather.snapping import CoordinateSnapper
+from app.utils.metrics import registry
+from app.utils.timing import span
+
+logger = structlog.get_logger()
+
+RESPONSE_CACHE_REQUESTS = registry.counter(
+    "response_cache_requests_total",
+    "Weather response cache lookups by result",
+    ("result",),
+)
+RESPONSE_CACHE_HITS = RESPONSE_CACHE_REQUESTS.labels("hit")
+RESPONSE_CACHE_MISSES = RESPONSE_CACHE_REQUESTS.labels("miss")
+
+BODY_HEAD = b'{"timestamp":'
+# First field after the per-request ones
+TAIL_START = b'"forecast_length":'
+CACHED_HEADERS = (b"content-type",)
+
+ResponseKey = Tuple[str, float, float, Tuple[Tuple[str, str], ...]]
+
+
+@dataclass(slots=True)
+class CachedResponse:
+    """Encoded body after the per-request fields, with what's needed to send it"""
+
+    tail: bytes
+    compressed: bool
+    headers: List[Tuple[bytes, bytes]]
+    expires_at: datetime
+    route: Any
+
+    def body_tail(self) -> bytes:
+        """Body after the per-request fields"""
+        return zlib.decompress(self.tail) if self.compressed else self.tail
+
+
+def split_body(body: bytes) -> Optional[bytes]:
+    """Body after `timestamp`, `latitude` and `longitude`, None if not shaped so"""
+    if not body.startswith(BODY_HEAD):
+        return None
+    start = body.find(b"," + TAIL_START)
+    if start == -1:
+        return None
+    return body[start + 1 :]
+
+
+def render_head(latitude: float, longitude: float) -> bytes:
+    """Per-request fields, encoded as the response model would"""
+    return (
+        f'{{"timestamp":{json.dumps(datetime.now().isoformat())},'
+        f'"latitude":{json.dumps(latitude)},"longitude":{json.dumps(longitude)},'
+    ).encode()
+
+
+class ResponseCache:
+    """Least recently used encoded weather responses by normalized request"""
+
+    def __init__(self, max_entries: int = 1024, compress: bool = False):
+        self.max_entries = max_entries
+        self.compress = compress
+        self.store: "OrderedDict[ResponseKey, CachedResponse]" = OrderedDict()
+
+    def get(self, key: ResponseKey) -> Optional[CachedResponse]:
+        """Unexpired response for a key"""
+        cached = self.store.get(key)
+        if cached is None:
+            return None
+        if datetime.now() >= cached.expires_at:
+            del self.store[key]
+            return None
+        self.store.move_to_end(key)
+        return cached
+
+    def set(
+        self,
+        key: ResponseKey,
+        tail: bytes,
+        headers: Iterable[Tuple[bytes, bytes]],
+        expires_at: datetime,
+        route: Any = None,
+    ) -> None:
+        """Keep a response until `expires_at`"""
+        if self.max_entries == 0:
+            return
+        if self.compress:
+            tail = zlib.compress(tail, 1)
+        self.store[key] = CachedResponse(
+            tail=tail,
+            compressed=self.compress,
+            headers=list(headers),
+            expires_at=expires_at,
+            route=route,
+        )
+        self.store.move_to_end(key)
+        while len(self.store) > self.max_entries:
+            self.store.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every cached response"""
+        self.store.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache statistics for monitoring"""
+        return {
+            "entries": len(self.store),
+            "bytes": sum(len(cached.tail) for cached in self.store.values()),
+            "max_entries": self.max_entries,
+            "compress": self.compress,
+        }
+
+
+class ResponseCacheMiddleware:
+    """Serves GET requests for `paths` from a `ResponseCache`
+
+    Requests are keyed by path, coordinates canonicalized by `snapper` and
+    the remaining query parameters, sorted. Requests with coordinates out of
+    range are passed on so they fail validation as usual.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        paths: Iterable[str],
+        snapper: CoordinateSnapper,
+    ):
+        self.app = app
+        self.cache = cache
+        self.paths = frozenset(paths)
+        self.snapper = snapper
+
+    def _request(self, scope: Scope) -> Optional[Tuple[ResponseKey, float, float]]:
+        """Cache key and echoed coordinates, None if the request isn't cacheable"""
+        if scope["type"] != "http" or scope["method"] != "GET":
+            return None
+        path = scope["path"]
+        root_path = scope.get("root_path", "")
+        if root_path and path.startswith(root_path):
+            path = path[len(root_path) :]
+        if path not in self.paths:
+            return None
+
+        params = parse_qsl(scope.get("query_string", b"").decode("latin-1"))
+        latitudes = [value for name, value in params if name == "latitude"]
+        longitudes = [value for name, value in params if name == "longitude"]
+        if len(latitudes) != 1 or len(longitudes) != 1:
+            return None
+        try:
+            latitude, longitude = float(latitudes[0]), float(longitudes[0])
+        except ValueError:
+            return None
+        if not (
+            math.isfinite(latitude)
+            and math.isfinite(longitude)
+            and -90 <= latitude <= 90
+            and -180 <= longitude <= 180
+        ):
+            return None
+
+        snapped = self.snapper.canonical(latitude, longitude)
+        others = tuple(
+            sorted(
+                (name, value)
+                for name, value in params
+                if name not in ("latitude", "longitude")
+            )
+        )
+        return (path, *snapped, others), latitude, longitude
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        request = self._request(scope) if self.cache.max_entries else None
+        if request is None:
+            await self.app(scope, receive, send)
+            return
+
+        key, latitude, longitude = request
+        cached = self.cache.get(key)
+        if cached is not None:
+            RESPONSE_CACHE_HITS.inc()
+            await self._send_cached(scope, send, cached, latitude, longitude)
+            return
+        RESPONSE_CACHE_MISSES.inc()
+
+        expiry = ResponseExpiry()
+        token = response_expiry.set(expiry)
+        starts: List[Message] = []
+        chunks: List[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                starts.append(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            response_expiry.reset(token)
+
+        if not starts:
+            return
+        start = starts[0]
+        if (
+            start["status"] != 200
+            or expiry.expires_at is None
+            or expiry.expires_at <= datetime.now()
+        ):
+            return
+        tail = split_body(b"".join(chunks))
+        if tail is None:
+            logger.warning("Response not cacheable", path=key[0])
+            return
+        headers = [
+            (name, value)
+            for name, value in start.get("headers", [])
+            if name.lower() in CACHED_HEADERS
+        ]
+        self.cache.set(key, tail, headers, expiry.expires_at, scope.get("route"))
+
+    @staticmethod
+    async def _send_cached(
+        scope: Scope,
+        send: Send,
+        cached: CachedResponse,
+        latitude: float,
+        longitude: float,
+    ) -> None:
+        if cached.route is not None:
+            # Labels metrics with the route, as the router would have
+            scope["route"] = cached.route
+        with span("response_cache"):
+            body = render_head(latitude, longitude) + cached.body_tail()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    *cached.headers,
+                    (b"content-length", str(len(body)).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,48 @@
+"""Middleware collecting per-phase request timings"""
+
+import structlog
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.utils.timing import RequestTimings, request_timings
+
+logger = structlog.get_logger()
+
+
+class ServerTimingMiddleware:
+    """Adds a Server-Timing header with the phases recorded by `span()`
+
+    The same timings are logged once per request as a "Request timings" event.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_timings.reset(token)
+            route = scope.get("route")
+            logger.info(
+                "Request timings",
+                route=getattr(route, "path", "unmatched"),
+                total_ms=round(timings.elapsed() * 1000, 2),
+                phases_ms={
+                    name: round(seconds * 1000, 2)
+                    for name, seconds in timings.phases.items()
+                },
+            )
@@ -0,0 +1,168 @@
+"""Module for the WMO weather code table
+
+Open-Meteo reports conditions as WMO 4677 "present weather" codes (0-99). The
+table is built once as arrays indexed by code, so whole hourly series are
+interpreted with `np.take` and reduced with `max` instead of per-hour lookups.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import List, Optional, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+class PrecipitationKind(int, Enum):
+    """Enum for the kind of precipitation a WMO weather code describes"""
+
+    NONE = 0
+    RAIN = 1
+    SNOW = 2
+    HAIL = 3
+    THUNDERSTORM = 4
+
+
+@dataclass(frozen=True)
+class WeatherCode:
+    """Interpretation of one WMO weather code
+
+    `severity` runs from 0 (clear) to 5 (hail storms, funnel clouds).
+    """
+
+    code: int
+    description: str
+    severity: int
+    precipitation: PrecipitationKind
+    icon: str
+
+
+_Entry = Tuple[str, int, PrecipitationKind, str]
+_NONE, _RAIN, _SNOW, _HAIL, _THUNDER = PrecipitationKind
+
+# WMO 4677 groups: (first, last) -> description, severity, precipitation, icon
+_GROUPS: Tuple[Tuple[int, int, _Entry], ...] = (
+    (0, 3, ("Cloud development", 0, _NONE, "partly-cloudy")),
+    (4, 9, ("Haze, dust or smoke", 1, _NONE, "haze")),
+    (10, 12, ("Mist", 1, _NONE, "fog")),
+    (13, 13, ("Lightning", 2, _NONE, "thunderstorm")),
+    (14, 16, ("Precipitation in sight", 1, _NONE, "overcast")),
+    (17, 17, ("Thunder without precipitation", 3, _NONE, "thunderstorm")),
+    (18, 18, ("Squalls", 3, _NONE, "wind")),
+    (19, 19, ("Funnel cloud", 5, _NONE, "tornado")),
+    (20, 29, ("Precipitation in the past hour", 1, _NONE, "overcast")),
+    (30, 35, ("Dust or sand storm", 3, _NONE, "dust")),
+    (36, 39, ("Blowing snow", 3, _SNOW, "snow")),
+    (40, 49, ("Fog", 2, _NONE, "fog")),
+    (50, 59, ("Drizzle", 2, _RAIN, "drizzle")),
+    (60, 69, ("Rain", 3, _RAIN, "rain")),
+    (70, 79, ("Snow", 3, _SNOW, "snow")),
+    (80, 84, ("Rain showers", 3, _RAIN, "showers")),
+    (85, 86, ("Snow showers", 3, _SNOW, "snow-showers")),
+    (87, 90, ("Hail showers", 4, _HAIL, "hail")),
+    (91, 99, ("Thunderstorm", 4, _THUNDER, "thunderstorm")),
+)
+
+# Codes Open-Meteo reports, described more precisely than their group
+_CODES = {
+    0: ("Clear sky", 0, _NONE, "clear"),
+    1: ("Mainly clear", 0, _NONE, "mostly-clear"),
+    2: ("Partly cloudy", 0, _NONE, "partly-cloudy"),
+    3: ("Overcast", 1, _NONE, "overcast"),
+    45: ("Fog", 2, _NONE, "fog"),
+    48: ("Depositing rime fog", 2, _NONE, "fog"),
+    51: ("Light drizzle", 2, _RAIN, "drizzle"),
+    53: ("Moderate drizzle", 2, _RAIN, "drizzle"),
+    55: ("Dense drizzle", 3, _RAIN, "drizzle"),
+    56: ("Light freezing drizzle", 3, _RAIN, "freezing-rain"),
+    57: ("Dense freezing drizzle", 3, _RAIN, "freezing-rain"),
+    61: ("Slight rain", 2, _RAIN, "rain"),
+    63: ("Moderate rain", 3, _RAIN, "rain"),
+    65: ("Heavy rain", 4, _RAIN, "rain"),
+    66: ("Light freezing rain", 4, _RAIN, "freezing-rain"),
+    67: ("Heavy freezing rain", 4, _RAIN, "freezing-rain"),
+    71: ("Slight snow fall", 2, _SNOW, "snow"),
+    73: ("Moderate snow fall", 3, _SNOW, "snow"),
+    75: ("Heavy snow fall", 4, _SNOW, "snow"),
+    77: ("Snow grains", 2, _SNOW, "snow"),
+    80: ("Slight rain showers", 2, _RAIN, "showers"),
+    81: ("Moderate rain showers", 3, _RAIN, "showers"),
+    82: ("Violent rain showers", 4, _RAIN, "showers"),
+    85: ("Slight snow showers", 3, _SNOW, "snow-showers"),
+    86: ("Heavy snow showers", 4, _SNOW, "snow-showers"),
+    95: ("Thunderstorm", 4, _THUNDER, "thunderstorm"),
+    96: ("Thunderstorm with slight hail", 5, _THUNDER, "thunderstorm-hail"),
+    99: ("Thunderstorm with heavy hail", 5, _THUNDER, "thunderstorm-hail"),
+}
+
+
+def _build_table() -> Tuple[WeatherCode, ...]:
+    entries: List[Optional[_Entry]] = [None] * 100
+    for first, last, entry in _GROUPS:
+        entries[first : last + 1] = [entry] * (last - first + 1)
+    for code, entry in _CODES.items():
+        entries[code] = entry
+    return tuple(WeatherCode(code, *entry) for code, entry in enumerate(entries))
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.setflags(write=False)
+    return array
+
+
+WEATHER_CODES = _build_table()
+CODE_COUNT = len(WEATHER_CODES)
+
+SEVERITY = _read_only(np.array([c.severity for c in WEATHER_CODES], dtype=np.int8))
+PRECIPITATION = _read_only(
+    np.array([c.precipitation.value for c in WEATHER_CODES], dtype=np.int8)
+)
+ICONS: Tuple[str, ...] = tuple(dict.fromkeys(c.icon for c in WEATHER_CODES))
+ICON_INDEX = _read_only(
+    np.array([ICONS.index(c.icon) for c in WEATHER_CODES], dtype=np.int8)
+)
+# Orders codes by severity, then code, so the max rank is the worst condition
+# and the code is recovered as rank % CODE_COUNT
+RANK = _read_only(SEVERITY.astype(np.int16) * CODE_COUNT + np.arange(CODE_COUNT))
+# Group result of worst_by_group when none of its codes are known
+MISSING_CODE = -1
+
+
+def describe(code: int) -> WeatherCode:
+    """Interpretation of a single weather code"""
+    return WEATHER_CODES[code]
+
+
+def severity(codes: ArrayLike) -> np.ndarray:
+    """Severity of each code"""
+    return np.take(SEVERITY, np.asarray(codes, dtype=np.intp))
+
+
+def precipitation(codes: ArrayLike) -> np.ndarray:
+    """PrecipitationKind value of each code"""
+    return np.take(PRECIPITATION, np.asarray(codes, dtype=np.intp))
+
+
+def icons(codes: ArrayLike) -> List[str]:
+    """Icon id of each code"""
+    return [ICONS[i] for i in np.take(ICON_INDEX, np.asarray(codes, dtype=np.intp))]
+
+
+def worst(codes: ArrayLike) -> int:
+    """Most severe code of a series, the higher code on ties"""
+    return int(np.take(RANK, np.asarray(codes, dtype=np.intp)).max() % CODE_COUNT)
+
+
+def worst_by_group(codes: ArrayLike, starts: ArrayLike) -> np.ndarray:
+    """Most severe code of each contiguous group, e.g. the hours of each day
+
+    `starts` are the indexes where each group begins, in increasing order.
+    Missing codes (None or NaN) are skipped, a group without any code gets
+    MISSING_CODE.
+    """
+    codes = np.asarray(codes, dtype=float)
+    missing = np.isnan(codes)
+    ranks = np.take(RANK, np.where(missing, 0, codes).astype(np.intp))
+    ranks = np.where(missing, -1, ranks)
+    worst_ranks = np.maximum.reduceat(ranks, np.asarray(starts, dtype=np.intp))
+    return np.where(worst_ranks < 0, MISSING_CODE, worst_ranks % CODE_COUNT)
@@ -1,12 +1,47 @@
-from datetime import datetime
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Response, status
+from fastapi.responses import PlainTextResponse
 import structlog
 
-from app.schemas.health_check import HealthCheck
-from app.config import settings
+from app.schemas.health_check import HealthCheck, HealthStatus
+from app.services.health import HealthService
+from app.services.model_registry import ModelRegistry, model_registry
+from app.services.weather import CircuitState, WeatherService
+from app.routers.v1.weather_router import get_weather_service, weather_service
+from app.utils.metrics import PROMETHEUS_CONTENT_TYPE, registry
 
 logger = structlog.get_logger()
 
+CACHE_ENTRIES = registry.gauge(
+    "weather_cache_entries", "Entries in the weather cache by state", ("state",)
+)
+CIRCUIT_OPEN = registry.gauge(
+    "weather_upstream_circuit_open", "1 while the weather API circuit is not closed"
+)
+UPSTREAM_QUEUE_DEPTH = registry.gauge(
+    "weather_upstream_queue_depth", "Requests waiting on the weather API rate limiter"
+)
+UPSTREAM_IN_FLIGHT = registry.gauge(
+    "weather_upstream_in_flight", "Requests currently sent to the weather API"
+)
+MODEL_MAPPED_BYTES = registry.gauge(
+    "model_mapped_bytes", "Bytes of model arrays memory mapped", ("model",)
+)
+MODEL_RESIDENT_BYTES = registry.gauge(
+    "model_resident_bytes", "Bytes of mapped model artifacts resident", ("model",)
+)
+
+health_service = HealthService(weather_service)
+
+
+def get_health_service():
+    """Returns the shared HealthService instance as a dependency."""
+    return health_service
+
+
+def get_model_registry():
+    """Returns the shared ModelRegistry instance as a dependency."""
+    return model_registry
+
 
 BaseRouter = APIRouter()
 
@@ -20,23 +55,46 @@ async def hello_world():
     return {"Welcome": "Python FastAPI image running on Lambda"}
 
 
-@BaseRouter.get("/health", response_model=HealthCheck)
-async def health_check():
-    """Health check endpoint"""
+@BaseRouter.get(
+    "/health",
+    response_model=HealthCheck,
+    responses={503: {"model": HealthCheck}},
+)
+async def health_check(
+    response: Response, health_service: HealthService = Depends(get_health_service)
+):
+    """Health check endpoint
+
+    Returns 503 only when unhealthy, when nothing can be served, so load
+    balancers drain the instance. Degraded instances can still serve cached
+    data and answer 200.
+    """
+
+    health = await health_service.check()
+    if health.status == HealthStatus.UNHEALTHY:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+
+    logger.info("Health check requested", status=health.status)
 
-    healthy_status = "healthy"
+    return health
 
-    logger.info("Health check requested", status=healthy_status)
 
-    return HealthCheck(
-        status=healthy_status, timestamp=datetime.now(), version=settings.app_version
-    )
+@BaseRouter.get("/metrics", response_class=PlainTextResponse)
+async def metrics(
+    weather_service: WeatherService = Depends(get_weather_service),
+    model_registry: ModelRegistry = Depends(get_model_registry),
+):
+    """Prometheus metrics endpoint"""
 
-    # # Return appropriate HTTP status based on health
-    # if health_data.status == "unhealthy":
-    #     raise HTTPException(
-    #         status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-    #         detail=health_data.dict()
-    #     )
+    stats = weather_service.get_stats()
+    CACHE_ENTRIES.labels("active").set(stats["active_entries"])
+    CACHE_ENTRIES.labels("expired").set(stats["expired_entries"])
+    CIRCUIT_OPEN.set(0 if stats["circuit_state"] == CircuitState.CLOSED else 1)
+    UPSTREAM_QUEUE_DEPTH.set(stats["upstream_queue_depth"])
+    UPSTREAM_IN_FLIGHT.set(stats["upstream_in_flight"])
+    for name, model_stats in model_registry.get_stats().items():
+        MODEL_MAPPED_BYTES.labels(name).set(model_stats["mapped_bytes"])
+        if model_stats["resident_bytes"] is not None:
+            MODEL_RESIDENT_BYTES.labels(name).set(model_stats["resident_bytes"])
 
-    # return health_data
+    return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
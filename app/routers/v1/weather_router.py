@@ -1,81 +1,158 @@
 """Weather Router module for handling weather-related API endpoints."""
 
 from typing import Annotated, Optional
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 import structlog
 
+from app.config import settings
+from app.middleware.response_cache import ResponseCache
 from app.schemas.api.weather_response import (
+    Timezone,
     WeatherRequestParams,
     WeatherForecastResponse,
 )
-from app.services.weather import WeatherService
+from app.schemas.units import PrecipitationUnit, TemperatureUnit, WindSpeedUnit
+from app.services.weather import UnitSelection, WeatherService
+from app.services.weather.cache import stale_data_served
+from app.utils.deadline import Deadline
+from app.utils.timing import TimedJSONResponse, span
 
 logger = structlog.get_logger()
 
-WeatherRouter = APIRouter(prefix="/v1/weather", tags=["weather"])
+WeatherRouter = APIRouter(
+    prefix="/v1/weather", tags=["weather"], default_response_class=TimedJSONResponse
+)
 
 
 async def get_weather_params(
     latitude: Annotated[float, Query(..., ge=-90, le=90)],
     longitude: Annotated[float, Query(..., ge=-180, le=180)],
     forecast_length: Annotated[Optional[int], Query(..., ge=-180, le=180)] = 3,
+    temperature_unit: TemperatureUnit = TemperatureUnit.CELSIUS,
+    wind_speed_unit: WindSpeedUnit = WindSpeedUnit.KMH,
+    precipitation_unit: PrecipitationUnit = PrecipitationUnit.MM,
+    timezone: Optional[Timezone] = None,
 ):
     """Extracts and returns weather request parameters from query."""
     return WeatherRequestParams(
-        latitude=latitude, longitude=longitude, forecast_length=forecast_length
+        latitude=latitude,
+        longitude=longitude,
+        forecast_length=forecast_length,
+        temperature_unit=temperature_unit,
+        wind_speed_unit=wind_speed_unit,
+        precipitation_unit=precipitation_unit,
+        timezone=timezone,
     )
 
 
+def get_unit_selection(query: WeatherRequestParams) -> UnitSelection:
+    """Units requested in the query"""
+    return UnitSelection(
+        temperature=query.temperature_unit,
+        wind_speed=query.wind_speed_unit,
+        precipitation=query.precipitation_unit,
+    )
+
+
+def get_request_deadline(request: Request) -> Optional[Deadline]:
+    """Returns the deadline set for this request by DeadlineMiddleware."""
+    return getattr(request.state, "deadline", None)
+
+
+weather_service = WeatherService(cache_duration_minutes=10)
+
+# Encoded responses of the routes below, served by ResponseCacheMiddleware
+response_cache = ResponseCache(
+    max_entries=settings.response_cache_max_entries,
+    compress=settings.response_cache_compress,
+)
+
+
 def get_weather_service():
-    """Creates and returns an instance of WeatherService as a dependency."""
-    return WeatherService(cache_duration_minutes=10)
+    """Returns the shared WeatherService instance as a dependency."""
+    return weather_service
 
 
 @WeatherRouter.get("/current", response_model=WeatherForecastResponse)
 async def get_current_forecast(
     query: Annotated[WeatherRequestParams, Depends(get_weather_params)],
     weather_service: WeatherService = Depends(get_weather_service),
+    deadline: Optional[Deadline] = Depends(get_request_deadline),
 ):
     """Handler for getting current weather conditions"""
     logger.info("Requesting current weather...")
+    stale_data_served.set(False)
+    units = get_unit_selection(query)
 
     current = await weather_service.get_current_weather(
         latitude=query.latitude,
         longitude=query.longitude,
+        deadline=deadline,
+        units=units,
+        timezone=query.timezone,
     )
     daily = await weather_service.get_daily_weather(
         latitude=query.latitude,
         longitude=query.longitude,
+        deadline=deadline,
+        units=units,
+        timezone=query.timezone,
     )
 
     logger.info("Requested current weather")
 
-    return WeatherForecastResponse(
-        latitude=query.latitude,
-        longitude=query.longitude,
-        current=current,
-        today=daily[0],
-    )
+    with span("validate"):
+        response = WeatherForecastResponse(
+            latitude=query.latitude,
+            longitude=query.longitude,
+            temperature_unit=query.temperature_unit,
+            wind_speed_unit=query.wind_speed_unit,
+            precipitation_unit=query.precipitation_unit,
+            timezone=query.timezone,
+            current=current,
+            today=daily[0],
+            stale=stale_data_served.get(),
+        )
+        # Serialized here and returned as a response, so FastAPI doesn't
+        # validate and serialize the model again outside this phase
+        content = response.model_dump(mode="json", by_alias=True)
+    return TimedJSONResponse(content)
 
 
 @WeatherRouter.get("/hourly", response_model=WeatherForecastResponse)
 async def get_hourly_forecast(
     query: Annotated[WeatherRequestParams, Depends(get_weather_params)],
     weather_service: WeatherService = Depends(get_weather_service),
+    deadline: Optional[Deadline] = Depends(get_request_deadline),
 ):
     """Handler for getting hourly weather conditions"""
     logger.info("Requesting hourly weather...")
+    stale_data_served.set(False)
+    units = get_unit_selection(query)
     hourly = await weather_service.get_hourly_weather(
         latitude=query.latitude,
         longitude=query.longitude,
         forecast_length=query.forecast_length,
+        deadline=deadline,
+        units=units,
+        timezone=query.timezone,
     )
 
     logger.info("Requested hourly weather")
 
-    return WeatherForecastResponse(
-        latitude=query.latitude,
-        longitude=query.longitude,
-        forecast_length=query.forecast_length,
-        hourly=hourly,
-    )
+    with span("validate"):
+        response = WeatherForecastResponse(
+            latitude=query.latitude,
+            longitude=query.longitude,
+            forecast_length=query.forecast_length,
+            temperature_unit=query.temperature_unit,
+            wind_speed_unit=query.wind_speed_unit,
+            precipitation_unit=query.precipitation_unit,
+            timezone=query.timezone,
+            hourly=hourly,
+            stale=stale_data_served.get(),
+        )
+        # Serialized here and returned as a response, so FastAPI doesn't
+        # validate and serialize the model again outside this phase
+        content = response.model_dump(mode="json", by_alias=True)
+    return TimedJSONResponse(content)
@@ -1,12 +1,26 @@
-from typing import Optional
-from pydantic import BaseModel, Field
+from typing import Annotated, Optional
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import AfterValidator, BaseModel, Field
 
 # from datetime import datetime
 
+from app.schemas.units import PrecipitationUnit, TemperatureUnit, WindSpeedUnit
 from app.schemas.weather_data import WeatherForecastData, WeatherDailyForecastData
 from app.schemas.api.response_base import ResponseBase
 
 
+def check_timezone(name: str) -> str:
+    """Validates an IANA timezone name"""
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone: {name}") from e
+    return name
+
+
+Timezone = Annotated[str, AfterValidator(check_timezone)]
+
+
 class WeatherRequestParams(BaseModel):
     """Schema for the request parameters of weather routes"""
 
@@ -15,6 +29,19 @@ class WeatherRequestParams(BaseModel):
     forecast_length: Optional[int] = Field(
         default=3, ge=1, le=16, description="Request timeline in days (1, 3, 7, 14, 16)"
     )
+    temperature_unit: TemperatureUnit = Field(
+        default=TemperatureUnit.CELSIUS, description="Unit of temperatures"
+    )
+    wind_speed_unit: WindSpeedUnit = Field(
+        default=WindSpeedUnit.KMH, description="Unit of wind speeds"
+    )
+    precipitation_unit: PrecipitationUnit = Field(
+        default=PrecipitationUnit.MM, description="Unit of precipitation amounts"
+    )
+    timezone: Optional[Timezone] = Field(
+        default=None,
+        description="IANA timezone of returned times, the location's own by default",
+    )
 
 
 class WeatherForecastResponse(WeatherRequestParams, ResponseBase):
@@ -22,6 +49,10 @@ class WeatherForecastResponse(WeatherRequestParams, ResponseBase):
 
     # last_updated: datetime = Field(default_factory=datetime.now)
 
+    stale: bool = Field(
+        False, description="Served from expired cache while the upstream is down"
+    )
+
     current: Optional[WeatherForecastData] = Field(
         None, description="Current forecast for requested coords"
     )
@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from enum import Enum
 
 
@@ -10,9 +10,17 @@ class HealthStatus(str, Enum):
     DEGRADED = "degraded"
 
 
+class ServiceCheck(BaseModel):
+    name: str
+    status: HealthStatus
+    latency_ms: Optional[float] = None
+    message: Optional[str] = None
+    details: Dict[str, Any] = {}
+
+
 class HealthCheck(BaseModel):
     status: HealthStatus
     timestamp: datetime
     version: str
     uptime_seconds: Optional[float] = 0.0
-    # checks: List[ServiceCheck] = []
+    checks: List[ServiceCheck] = []
@@ -0,0 +1,26 @@
+"""Units clients can request, named as the weather API names them"""
+
+from enum import Enum
+
+
+class TemperatureUnit(str, Enum):
+    """Enum for temperature units, named as the weather API names them"""
+
+    CELSIUS = "celsius"
+    FAHRENHEIT = "fahrenheit"
+
+
+class WindSpeedUnit(str, Enum):
+    """Enum for wind speed units, named as the weather API names them"""
+
+    KMH = "kmh"
+    MS = "ms"
+    MPH = "mph"
+    KN = "kn"
+
+
+class PrecipitationUnit(str, Enum):
+    """Enum for precipitation units, named as the weather API names them"""
+
+    MM = "mm"
+    INCH = "inch"
@@ -1,9 +1,20 @@
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel, Field
 
 from app.schemas.metric_value import MetricValue, MetricRangeValue
 
 
+class ClothingRecommendation(BaseModel):
+    warmth: str = Field(..., description="How warmly to dress, very_cold to hot")
+    rain_protection: str = Field(..., description="none, umbrella or waterproof")
+    sun_protection: str = Field(..., description="none, sunglasses or full")
+    items: List[str] = Field(..., description="Recommended clothing and accessories")
+    comfort_index: Optional[float] = Field(
+        None, ge=0, le=1, description="Overall comfort from 0 (worst) to 1 (best)"
+    )
+
+
 class WeatherForecastBase(BaseModel):
     time: datetime = Field(default_factory=datetime.now)
     weather_code: int = Field(
@@ -30,6 +41,10 @@ class WeatherForecastData(WeatherForecastBase):
     cloud_cover: MetricValue[float] = Field(..., description="Cloud cover percentage")
     uv_index: MetricValue[float] = Field(..., description="UV index")
 
+    clothing: Optional[ClothingRecommendation] = Field(
+        None, description="What to wear for these conditions"
+    )
+
 
 class WeatherDailyForecastData(WeatherForecastBase):
     sunrise: datetime = Field(..., description="Time of sun rise")
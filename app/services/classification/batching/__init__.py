@@ -0,0 +1,5 @@
+"""Micro-batching package - main public interface"""
+
+from .batcher import MicroBatcher
+
+__all__ = ["MicroBatcher"]
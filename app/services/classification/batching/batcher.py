@@ -0,0 +1,145 @@
+"""Async micro-batching of vectorized inference calls"""
+
+import asyncio
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from app.utils.metrics import registry
+
+BATCH_ROWS = registry.histogram(
+    "classification_batch_rows",
+    "Rows scored per batched inference call",
+    ("batcher",),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024),
+)
+BATCH_REQUESTS = registry.histogram(
+    "classification_batch_requests",
+    "Caller requests merged into each batched inference call",
+    ("batcher",),
+    buckets=(1, 2, 4, 8, 16, 32, 64),
+)
+BATCH_WAIT_SECONDS = registry.histogram(
+    "classification_batch_wait_seconds",
+    "Time a request waited for its batch to start",
+    ("batcher",),
+    buckets=(0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+BATCH_INFERENCE_SECONDS = registry.histogram(
+    "classification_batch_inference_seconds",
+    "Duration of each batched inference call",
+    ("batcher",),
+    buckets=(0.0001, 0.0005, 0.001, 0.002, 0.005, 0.01, 0.025, 0.05, 0.1),
+)
+BATCH_FLUSHES = registry.counter(
+    "classification_batch_flushes_total",
+    "Batches run, by what triggered them",
+    ("batcher", "reason"),
+)
+
+# Pending request: rows, future for its slice of the output, enqueue time
+_Pending = Tuple[np.ndarray, asyncio.Future, float]
+
+
+class MicroBatcher:
+    """Merges concurrent inference calls into one vectorized call
+
+    Callers `submit` a (rows, features) array and get back their own rows of
+    the output. The first request to arrive opens a window: the batch runs
+    when `max_wait_ms` has passed or `max_batch_rows` rows are pending,
+    whichever comes first, so no request waits longer than the window for its
+    batch to start. `infer` must map an (n, features) array to an output whose
+    first axis has the same n rows.
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[np.ndarray], np.ndarray],
+        name: str,
+        max_batch_rows: int = 256,
+        max_wait_ms: float = 2.0,
+    ):
+        self.infer = infer
+        self.name = name
+        self.max_batch_rows = max_batch_rows
+        self.max_wait = max_wait_ms / 1000
+
+        self._pending: List[_Pending] = []
+        self._pending_rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+        self._rows = BATCH_ROWS.labels(name)
+        self._requests = BATCH_REQUESTS.labels(name)
+        self._wait = BATCH_WAIT_SECONDS.labels(name)
+        self._inference = BATCH_INFERENCE_SECONDS.labels(name)
+        self._size_flushes = BATCH_FLUSHES.labels(name, "size")
+        self._timeout_flushes = BATCH_FLUSHES.labels(name, "timeout")
+
+    @property
+    def pending_rows(self) -> int:
+        """Rows waiting for the next batch"""
+        return self._pending_rows
+
+    async def submit(self, rows: np.ndarray) -> np.ndarray:
+        """Score rows as part of the next batch, returning their outputs"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((rows, future, time.perf_counter()))
+        self._pending_rows += len(rows)
+
+        if self._pending_rows >= self.max_batch_rows:
+            self._size_flushes.inc()
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush_on_timeout)
+
+        return await future
+
+    def _flush_on_timeout(self) -> None:
+        self._timer = None
+        if self._pending:
+            self._timeout_flushes.inc()
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        self._pending_rows = 0
+
+        start = time.perf_counter()
+        for _, _, queued_at in batch:
+            self._wait.observe(start - queued_at)
+        self._requests.observe(len(batch))
+
+        try:
+            inputs = np.concatenate([rows for rows, _, _ in batch])
+            self._rows.observe(len(inputs))
+            outputs = self.infer(inputs)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            self._inference.observe(time.perf_counter() - start)
+
+        offsets = np.cumsum([len(rows) for rows, _, _ in batch[:-1]])
+        for (_, future, _), result in zip(batch, np.split(outputs, offsets)):
+            # Callers that gave up still had their rows scored, just drop them
+            if not future.done():
+                future.set_result(result)
+
+    def get_stats(self) -> dict:
+        """Batch size and wait statistics for tuning"""
+        rows, wait = self._rows, self._wait
+        return {
+            "batches": rows.count,
+            "mean_batch_rows": rows.sum / rows.count if rows.count else 0.0,
+            "mean_wait_ms": wait.sum / wait.count * 1000 if wait.count else 0.0,
+            "pending_rows": self._pending_rows,
+            "max_batch_rows": self.max_batch_rows,
+            "max_wait_ms": self.max_wait * 1000,
+        }
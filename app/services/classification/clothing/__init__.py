@@ -0,0 +1,14 @@
+"""Clothing classifier package - main public interface"""
+
+from .classifier import FEATURES, ClothingClassification, ClothingClassifier
+from .models import PrecipitationKind, RainProtection, SunProtection, WarmthLevel
+
+__all__ = [
+    "FEATURES",
+    "ClothingClassification",
+    "ClothingClassifier",
+    "PrecipitationKind",
+    "RainProtection",
+    "SunProtection",
+    "WarmthLevel",
+]
@@ -0,0 +1,274 @@
+"""Clothing classifier built on precomputed lookup tables"""
+
+import math
+from dataclasses import dataclass
+from itertools import product
+from typing import List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.models import weather_codes
+from app.models.weather_conditions import WeatherClassificationFields as Fields
+from app.schemas.weather_data import ClothingRecommendation, WeatherForecastData
+
+from ..comfort_calculator import ComfortIndexCalculator
+from .models import (
+    PRECIPITATION_MIN_PROTECTION,
+    RAIN_AMOUNT_BOUNDARIES,
+    RAIN_ITEMS,
+    RAIN_LEVELS,
+    RAIN_PROBABILITY_BOUNDARIES,
+    SNOW_ITEMS,
+    SUN_ITEMS,
+    UV_BOUNDARIES,
+    WARMTH_BOUNDARIES,
+    WARMTH_ITEMS,
+    WIND_ITEMS,
+    WINDPROOF_BOUNDARY,
+    PrecipitationKind,
+    RainProtection,
+    SunProtection,
+    WarmthLevel,
+)
+
+WARMTH_LEVELS = tuple(WarmthLevel)
+RAIN_PROTECTIONS = tuple(RainProtection)
+SUN_PROTECTIONS = tuple(SunProtection)
+# Columns of a feature matrix: the classification fields then the hour's flags
+FEATURES = (*(field.value for field in Fields), "weather_code", "is_day")
+WEATHER_CODE_COLUMN = FEATURES.index("weather_code")
+IS_DAY_COLUMN = FEATURES.index("is_day")
+# Assumed when the API has no value for an hour
+MILD_TEMPERATURE = 15.0
+# Decimal places of the comfort index in recommendations
+COMFORT_DECIMALS = 3
+# Discretized comfort index of hours without one
+MISSING_COMFORT = -1
+
+
+class DecisionInputs(NamedTuple):
+    """What each decision sees of an hour: bin indexes and flags"""
+
+    warmth: np.ndarray
+    rain_probability: np.ndarray
+    rain_amount: np.ndarray
+    uv: np.ndarray
+    is_day: np.ndarray
+    windproof: np.ndarray
+    precipitation: np.ndarray
+
+
+@dataclass(frozen=True)
+class ClothingClassification:
+    """Per-hour classification as indexes into the level enums
+
+    `outfit` indexes the classifier's precomputed outfits, one per
+    combination of levels.
+    """
+
+    warmth: np.ndarray
+    rain: np.ndarray
+    sun: np.ndarray
+    windproof: np.ndarray
+    snow: np.ndarray
+    outfit: np.ndarray
+    comfort_index: np.ndarray
+
+    def __len__(self) -> int:
+        return self.outfit.shape[0]
+
+
+class ClothingClassifier:
+    """Maps hourly weather conditions to clothing recommendations
+
+    All decision boundaries are turned into lookup tables when the classifier
+    is built, so classifying a forecast is a handful of `np.digitize` calls and
+    table lookups over whole arrays, with no per-hour branching.
+    """
+
+    def __init__(self, comfort_calculator: Optional[ComfortIndexCalculator] = None):
+        self.comfort_calculator = comfort_calculator or ComfortIndexCalculator()
+
+        self._warmth_bounds = np.asarray(WARMTH_BOUNDARIES)
+        self._probability_bounds = np.asarray(RAIN_PROBABILITY_BOUNDARIES)
+        self._amount_bounds = np.asarray(RAIN_AMOUNT_BOUNDARIES)
+        self._uv_bounds = np.asarray(UV_BOUNDARIES)
+
+        self._rain_table = np.array(
+            [[RAIN_PROTECTIONS.index(level) for level in row] for row in RAIN_LEVELS],
+            dtype=np.int8,
+        )
+        # Indexed by [is_day, uv level], nothing is needed at night
+        self._sun_table = np.array(
+            [[0] * len(SUN_PROTECTIONS), range(len(SUN_PROTECTIONS))], dtype=np.int8
+        )
+
+        self._min_rain = np.array(
+            [
+                RAIN_PROTECTIONS.index(PRECIPITATION_MIN_PROTECTION[kind])
+                for kind in PrecipitationKind
+            ],
+            dtype=np.int8,
+        )
+
+        self._outfits = [
+            {
+                "warmth": warmth.value,
+                "rain_protection": rain.value,
+                "sun_protection": sun.value,
+                "items": list(
+                    WARMTH_ITEMS[warmth]
+                    + RAIN_ITEMS[rain]
+                    + SUN_ITEMS[sun]
+                    + WIND_ITEMS[windproof]
+                    + (SNOW_ITEMS if snow else ())
+                ),
+            }
+            for warmth, rain, sun, windproof, snow in product(
+                WARMTH_LEVELS, RAIN_PROTECTIONS, SUN_PROTECTIONS, (0, 1), (0, 1)
+            )
+        ]
+
+    @staticmethod
+    def _outfit_index(
+        warmth: np.ndarray,
+        rain: np.ndarray,
+        sun: np.ndarray,
+        windproof: np.ndarray,
+        snow: np.ndarray,
+    ) -> np.ndarray:
+        """Index into the outfits, in the order `product` generated them"""
+        index = warmth.astype(np.intp) * len(RAIN_PROTECTIONS) + rain
+        index = index * len(SUN_PROTECTIONS) + sun
+        return (index * 2 + windproof) * 2 + snow
+
+    def classify_series(
+        self,
+        series: Mapping[Fields, ArrayLike],
+        weather_code: ArrayLike,
+        is_day: ArrayLike,
+    ) -> ClothingClassification:
+        """Classify every hour of a forecast at once"""
+        inputs = self.decision_inputs(series, weather_code, is_day)
+        warmth = inputs.warmth
+        rain = np.maximum(
+            self._rain_table[inputs.rain_probability, inputs.rain_amount],
+            self._min_rain[inputs.precipitation],
+        )
+        sun = self._sun_table[inputs.is_day, inputs.uv]
+        windproof = inputs.windproof
+        snow = (inputs.precipitation == PrecipitationKind.SNOW.value).astype(np.int8)
+
+        return ClothingClassification(
+            warmth=warmth,
+            rain=rain,
+            sun=sun,
+            windproof=windproof,
+            snow=snow,
+            outfit=self._outfit_index(warmth, rain, sun, windproof, snow),
+            comfort_index=self.comfort_calculator.score_series(series).composite,
+        )
+
+    def decision_inputs(
+        self,
+        series: Mapping[Fields, ArrayLike],
+        weather_code: ArrayLike,
+        is_day: ArrayLike,
+    ) -> DecisionInputs:
+        """Bin of every hour against each decision's boundaries"""
+        hours = np.size(weather_code)
+
+        def values(field: Fields, missing: float) -> np.ndarray:
+            if field not in series:
+                return np.full(hours, missing)
+            return np.nan_to_num(np.asarray(series[field], dtype=float), nan=missing)
+
+        temperature = values(Fields.TEMPERATURE, MILD_TEMPERATURE)
+        apparent = np.asarray(
+            series.get(Fields.APPARENT_TEMPERATURE, temperature), dtype=float
+        )
+        apparent = np.where(np.isnan(apparent), temperature, apparent)
+
+        return DecisionInputs(
+            warmth=np.digitize(apparent, self._warmth_bounds).astype(np.int8),
+            rain_probability=np.digitize(
+                values(Fields.PRECIPITATION_PROBABILITY, 0.0), self._probability_bounds
+            ),
+            rain_amount=np.digitize(
+                values(Fields.PRECIPITATION, 0.0), self._amount_bounds
+            ),
+            uv=np.digitize(values(Fields.UV_INDEX, 0.0), self._uv_bounds),
+            is_day=np.asarray(is_day, dtype=np.intp),
+            windproof=(values(Fields.WIND_SPEED, 0.0) >= WINDPROOF_BOUNDARY).astype(
+                np.int8
+            ),
+            precipitation=weather_codes.precipitation(weather_code),
+        )
+
+    @staticmethod
+    def feature_matrix(forecast: Sequence[WeatherForecastData]) -> np.ndarray:
+        """(hours, FEATURES) float matrix of a mapped forecast"""
+        return np.array(
+            [
+                [getattr(hour, field.value).value for field in Fields]
+                + [hour.weather_code, hour.is_day]
+                for hour in forecast
+            ],
+            dtype=float,
+        ).reshape(len(forecast), len(FEATURES))
+
+    def classify_matrix(self, matrix: np.ndarray) -> ClothingClassification:
+        """Classify the rows of a `feature_matrix`"""
+        columns = matrix.T
+        return self.classify_series(
+            dict(zip(Fields, columns)),
+            weather_code=columns[WEATHER_CODE_COLUMN],
+            is_day=columns[IS_DAY_COLUMN],
+        )
+
+    def discretize(self, matrix: np.ndarray) -> np.ndarray:
+        """Rows of a `feature_matrix` as everything their result depends on
+
+        Each decision's bin index plus the comfort index at the precision
+        recommendations show, so rows with equal keys are classified and
+        recommended identically.
+        """
+        columns = matrix.T
+        inputs = self.decision_inputs(
+            dict(zip(Fields, columns)),
+            weather_code=columns[WEATHER_CODE_COLUMN],
+            is_day=columns[IS_DAY_COLUMN],
+        )
+        comfort = self.comfort_calculator.score_series(
+            dict(zip(Fields, columns))
+        ).composite
+        comfort = np.round(comfort * 10**COMFORT_DECIMALS)
+        return np.column_stack(
+            [
+                *inputs,
+                np.where(np.isnan(comfort), MISSING_COMFORT, comfort),
+            ]
+        ).astype(np.int32)
+
+    def recommendations(
+        self, outfit: ArrayLike, comfort_index: ArrayLike
+    ) -> List[ClothingRecommendation]:
+        """Recommendation models for classified outfits and comfort indexes"""
+        comfort = np.round(
+            np.asarray(comfort_index, dtype=float), COMFORT_DECIMALS
+        ).tolist()
+        return [
+            ClothingRecommendation(
+                **self._outfits[outfit],
+                comfort_index=None if math.isnan(comfort_index) else comfort_index,
+            )
+            for outfit, comfort_index in zip(np.asarray(outfit).tolist(), comfort)
+        ]
+
+    def classify_forecast(
+        self, forecast: Sequence[WeatherForecastData]
+    ) -> List[ClothingRecommendation]:
+        """Recommendations for each entry of a mapped forecast"""
+        classification = self.classify_matrix(self.feature_matrix(forecast))
+        return self.recommendations(classification.outfit, classification.comfort_index)
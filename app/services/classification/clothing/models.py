@@ -0,0 +1,88 @@
+"""Clothing classifier levels, decision boundaries and outfits"""
+
+from enum import Enum
+from typing import Dict, Tuple
+
+from app.models.weather_codes import PrecipitationKind
+
+
+class WarmthLevel(str, Enum):
+    """Enum for how warmly to dress, coldest first"""
+
+    VERY_COLD = "very_cold"
+    COLD = "cold"
+    COOL = "cool"
+    MILD = "mild"
+    WARM = "warm"
+    HOT = "hot"
+
+
+class RainProtection(str, Enum):
+    """Enum for rain protection levels, least first"""
+
+    NONE = "none"
+    UMBRELLA = "umbrella"
+    WATERPROOF = "waterproof"
+
+
+class SunProtection(str, Enum):
+    """Enum for sun protection levels, least first"""
+
+    NONE = "none"
+    SUNGLASSES = "sunglasses"
+    FULL = "full"
+
+
+# Upper bounds of each level, values on a boundary fall in the level above
+# Apparent temperature (°C) -> WarmthLevel
+WARMTH_BOUNDARIES = (-5.0, 5.0, 12.0, 18.0, 24.0)
+# Precipitation probability (%) and amount (mm) -> rows/columns of RAIN_LEVELS
+RAIN_PROBABILITY_BOUNDARIES = (30.0, 60.0)
+RAIN_AMOUNT_BOUNDARIES = (0.2, 2.0)
+# UV index -> SunProtection, daytime only
+UV_BOUNDARIES = (3.0, 6.0)
+# Wind speed (km/h) above which a windproof layer is worth it
+WINDPROOF_BOUNDARY = 30.0
+
+RAIN_LEVELS: Tuple[Tuple[RainProtection, ...], ...] = (
+    (RainProtection.NONE, RainProtection.UMBRELLA, RainProtection.WATERPROOF),
+    (RainProtection.UMBRELLA, RainProtection.UMBRELLA, RainProtection.WATERPROOF),
+    (RainProtection.UMBRELLA, RainProtection.WATERPROOF, RainProtection.WATERPROOF),
+)
+
+# Minimum rain protection for the precipitation the weather code reports
+PRECIPITATION_MIN_PROTECTION: Dict[PrecipitationKind, RainProtection] = {
+    PrecipitationKind.NONE: RainProtection.NONE,
+    PrecipitationKind.RAIN: RainProtection.UMBRELLA,
+    PrecipitationKind.SNOW: RainProtection.WATERPROOF,
+    PrecipitationKind.HAIL: RainProtection.WATERPROOF,
+    PrecipitationKind.THUNDERSTORM: RainProtection.WATERPROOF,
+}
+
+WARMTH_ITEMS: Dict[WarmthLevel, Tuple[str, ...]] = {
+    WarmthLevel.VERY_COLD: (
+        "thermal base layer",
+        "jumper",
+        "insulated coat",
+        "hat",
+        "gloves",
+        "scarf",
+    ),
+    WarmthLevel.COLD: ("long sleeves", "jumper", "winter coat", "hat", "gloves"),
+    WarmthLevel.COOL: ("long sleeves", "jumper", "light jacket"),
+    WarmthLevel.MILD: ("long sleeves", "light jacket"),
+    WarmthLevel.WARM: ("t-shirt",),
+    WarmthLevel.HOT: ("t-shirt", "shorts"),
+}
+RAIN_ITEMS: Dict[RainProtection, Tuple[str, ...]] = {
+    RainProtection.NONE: (),
+    RainProtection.UMBRELLA: ("umbrella",),
+    RainProtection.WATERPROOF: ("waterproof jacket", "waterproof shoes"),
+}
+SUN_ITEMS: Dict[SunProtection, Tuple[str, ...]] = {
+    SunProtection.NONE: (),
+    SunProtection.SUNGLASSES: ("sunglasses",),
+    SunProtection.FULL: ("sunglasses", "sunscreen", "sun hat"),
+}
+WIND_ITEMS: Tuple[Tuple[str, ...], Tuple[str, ...]] = ((), ("windproof layer",))
+SNOW_ITEMS: Tuple[str, ...] = ("snow boots",)
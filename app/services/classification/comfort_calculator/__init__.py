@@ -0,0 +1,17 @@
+"""Comfort calculator package - main public interface"""
+
+from .factory import ComfortIndexCalculator
+from .models import (
+    DEFAULT_COMFORT_PROFILE,
+    ComfortProfile,
+    ComfortRange,
+    ComfortScores,
+)
+
+__all__ = [
+    "ComfortIndexCalculator",
+    "DEFAULT_COMFORT_PROFILE",
+    "ComfortProfile",
+    "ComfortRange",
+    "ComfortScores",
+]
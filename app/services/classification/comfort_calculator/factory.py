@@ -1,12 +1,84 @@
 """Factory for ComfortCalculator"""
 
-from app.models.weather_conditions import WeatherClassificationFields
+from typing import Mapping, Optional, Sequence
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.models.weather_conditions import WeatherClassificationFields, WeatherConditions
+
+from .models import DEFAULT_COMFORT_PROFILE, ComfortProfile, ComfortScores
+
+FIELDS = tuple(WeatherClassificationFields)
 
 
 class ComfortIndexCalculator:
-    """Calculates comfort index based on values and their types"""
+    """Calculates comfort index based on values and their types
+
+    Scores every field of every hour in one set of array operations: the
+    profile is held as per-field column vectors that broadcast against a
+    (fields, hours) matrix of values.
+    """
+
+    def __init__(self, profile: Optional[ComfortProfile] = None):
+        self.profile = profile or DEFAULT_COMFORT_PROFILE
+        self.fields = tuple(field for field in FIELDS if field in self.profile)
+
+        ranges = [self.profile[field] for field in self.fields]
+        self._ideal_min = np.array([r.ideal_min for r in ranges], dtype=float)[:, None]
+        self._ideal_max = np.array([r.ideal_max for r in ranges], dtype=float)[:, None]
+        self._tolerance = np.array([r.tolerance for r in ranges], dtype=float)[:, None]
+        self._weights = np.array([r.weight for r in ranges], dtype=float)[:, None]
+
+    def _stack(
+        self, series: Mapping[WeatherClassificationFields, ArrayLike]
+    ) -> np.ndarray:
+        """(fields, hours) float matrix, NaN for missing fields or values"""
+        hours = max((np.size(values) for values in series.values()), default=0)
+        values = np.full((len(self.fields), hours), np.nan)
+        for row, field in enumerate(self.fields):
+            if field in series:
+                # None from the API becomes NaN
+                values[row] = np.asarray(series[field], dtype=float)
+        return values
+
+    def _score_matrix(self, values: np.ndarray) -> np.ndarray:
+        distance = np.maximum(self._ideal_min - values, values - self._ideal_max)
+        return np.clip(1.0 - np.maximum(distance, 0.0) / self._tolerance, 0.0, 1.0)
+
+    def score_series(
+        self, series: Mapping[WeatherClassificationFields, ArrayLike]
+    ) -> ComfortScores:
+        """Per-field and composite scores for whole hourly series at once"""
+        scores = self._score_matrix(self._stack(series))
+
+        present = ~np.isnan(scores)
+        weights = np.where(present, self._weights, 0.0)
+        total_weight = weights.sum(axis=0)
+        weighted = (np.where(present, scores, 0.0) * weights).sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            composite = np.where(total_weight > 0, weighted / total_weight, np.nan)
+
+        return ComfortScores(fields=self.fields, scores=scores, composite=composite)
+
+    def score_conditions(
+        self, conditions: Sequence[WeatherConditions]
+    ) -> ComfortScores:
+        """Scores for a sequence of hourly conditions"""
+        return self.score_series(
+            {
+                field: [getattr(hour, field.value) for hour in conditions]
+                for field in self.fields
+            }
+        )
 
     def normalize(
         self, value: str | int | float, type: WeatherClassificationFields
     ) -> float:
-        return 0.0
+        """Comfort score between 0 and 1 of a single value"""
+        # pylint: disable=redefined-builtin
+        return float(self.score_series({type: [float(value)]}).field(type)[0])
+
+    def comfort_index(self, conditions: WeatherConditions) -> float:
+        """Composite comfort score between 0 and 1 of a single hour"""
+        return float(self.score_conditions([conditions]).composite[0])
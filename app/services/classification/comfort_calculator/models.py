@@ -0,0 +1,59 @@
+"""Comfort calculator data models"""
+
+from dataclasses import dataclass
+from typing import Dict, Tuple
+
+import numpy as np
+
+from app.models.weather_conditions import WeatherClassificationFields
+
+
+@dataclass(frozen=True)
+class ComfortRange:
+    """Comfortable band for one field
+
+    Values inside [ideal_min, ideal_max] score 1.0, falling linearly to 0.0
+    at `tolerance` beyond either edge.
+    """
+
+    ideal_min: float
+    ideal_max: float
+    tolerance: float
+    weight: float
+
+
+ComfortProfile = Dict[WeatherClassificationFields, ComfortRange]
+
+DEFAULT_COMFORT_PROFILE: ComfortProfile = {
+    WeatherClassificationFields.TEMPERATURE: ComfortRange(18, 24, 12, 0.15),
+    WeatherClassificationFields.APPARENT_TEMPERATURE: ComfortRange(18, 24, 12, 0.25),
+    WeatherClassificationFields.HUMIDITY: ComfortRange(30, 60, 40, 0.10),
+    WeatherClassificationFields.WIND_SPEED: ComfortRange(0, 15, 35, 0.10),
+    WeatherClassificationFields.PRECIPITATION: ComfortRange(0, 0, 5, 0.15),
+    WeatherClassificationFields.PRECIPITATION_PROBABILITY: ComfortRange(
+        0, 20, 80, 0.10
+    ),
+    WeatherClassificationFields.CLOUD_COVER: ComfortRange(10, 60, 50, 0.05),
+    WeatherClassificationFields.UV_INDEX: ComfortRange(0, 5, 6, 0.10),
+}
+
+
+@dataclass(frozen=True)
+class ComfortScores:
+    """Comfort scores for a series of hours
+
+    `scores` has one row per field in `fields` order and one column per hour,
+    NaN where the input value was missing. `composite` is the weighted mean
+    over the fields that have a value for that hour.
+    """
+
+    fields: Tuple[WeatherClassificationFields, ...]
+    scores: np.ndarray
+    composite: np.ndarray
+
+    def __len__(self) -> int:
+        return self.composite.shape[0]
+
+    def field(self, field: WeatherClassificationFields) -> np.ndarray:
+        """Scores of one field for every hour"""
+        return self.scores[self.fields.index(field)]
@@ -0,0 +1,5 @@
+"""Classification result cache package - main public interface"""
+
+from .cache import ClassificationCache
+
+__all__ = ["ClassificationCache"]
@@ -0,0 +1,110 @@
+"""LRU cache of classification results keyed by what decides them"""
+
+from collections import OrderedDict
+from typing import Callable, Dict
+
+import numpy as np
+
+from app.utils.metrics import registry
+
+CACHE_REQUESTS = registry.counter(
+    "classification_cache_requests_total",
+    "Rows looked up in the classification cache, by result",
+    ("cache", "result"),
+)
+CACHE_EVICTIONS = registry.counter(
+    "classification_cache_evictions_total",
+    "Entries evicted from the classification cache",
+    ("cache",),
+)
+
+
+class ClassificationCache:
+    """Bounded LRU cache in front of a row-wise classifier
+
+    Rows are keyed by `key`, which must map rows to everything their result
+    depends on, such as the bin indexes the classifier's decisions see. Rows
+    with equal keys then get the same result classified or not, so hits read
+    exactly as fresh classifications do. Repeated keys within one call are
+    classified once.
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[np.ndarray], np.ndarray],
+        key: Callable[[np.ndarray], np.ndarray],
+        name: str,
+        max_entries: int = 4096,
+    ):
+        self.infer = infer
+        self.key = key
+        self.name = name
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, np.ndarray] = OrderedDict()
+
+        self._hits = CACHE_REQUESTS.labels(name, "hit")
+        self._misses = CACHE_REQUESTS.labels(name, "miss")
+        self._evictions = CACHE_EVICTIONS.labels(name)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def classify(self, features: np.ndarray) -> np.ndarray:
+        """Results for each row of `features`, classifying only unseen keys"""
+        if not len(features):
+            return self.infer(features)
+        keys = [row.tobytes() for row in np.ascontiguousarray(self.key(features))]
+
+        found: Dict[bytes, np.ndarray] = {}
+        missing: Dict[bytes, int] = {}
+        for row, key in enumerate(keys):
+            if key in found or key in missing:
+                continue
+            result = self._entries.get(key)
+            if result is None:
+                missing[key] = row
+            else:
+                self._entries.move_to_end(key)
+                found[key] = result
+
+        if missing:
+            rows = list(missing.values())
+            results = self.infer(features[rows])
+            for key, result in zip(missing, results):
+                found[key] = result
+                self._entries[key] = result
+            self._evict()
+
+        # Repeats of a missing key within the call are served without inference
+        missed = len(missing)
+        self.misses += missed
+        self.hits += len(keys) - missed
+        self._misses.inc(missed)
+        self._hits.inc(len(keys) - missed)
+
+        return np.stack([found[key] for key in keys])
+
+    def _evict(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+            self._evictions.inc()
+
+    def get_stats(self) -> dict:
+        """Size and hit-rate statistics for monitoring"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        """Drop every entry and reset the stats"""
+        self._entries.clear()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
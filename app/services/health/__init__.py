@@ -0,0 +1,5 @@
+"""Health service package - main public interface"""
+
+from .service import HealthService, ProbeResult
+
+__all__ = ["HealthService", "ProbeResult"]
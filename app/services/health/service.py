@@ -0,0 +1,188 @@
+"""Health checks of the service and its upstream weather API"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import structlog
+
+from app.config import settings
+from app.schemas.health_check import HealthCheck, HealthStatus, ServiceCheck
+from app.services.weather import CircuitState, WeatherService
+
+logger = structlog.get_logger()
+
+_SEVERITY = {
+    HealthStatus.HEALTHY: 0,
+    HealthStatus.DEGRADED: 1,
+    HealthStatus.UNHEALTHY: 2,
+}
+
+
+def worst_status(statuses: List[HealthStatus]) -> HealthStatus:
+    """Most severe of the given statuses, healthy when there are none"""
+    return max(statuses, key=_SEVERITY.__getitem__, default=HealthStatus.HEALTHY)
+
+
+def grade(value: float, degraded_at: float, unhealthy_at: float) -> HealthStatus:
+    """Status for a value measured against degraded and unhealthy thresholds"""
+    if value >= unhealthy_at:
+        return HealthStatus.UNHEALTHY
+    if value >= degraded_at:
+        return HealthStatus.DEGRADED
+    return HealthStatus.HEALTHY
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Outcome of one upstream probe"""
+
+    checked_at: float
+    latency_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+
+class HealthService:
+    """Readiness checks for the service and its upstream weather API
+
+    The upstream probe result is cached for `probe_interval_seconds` and
+    concurrent health polls share a single probe, so polling load balancers
+    never translate into load on Open-Meteo.
+    """
+
+    def __init__(
+        self,
+        weather_service: WeatherService,
+        probe_interval_seconds: float = settings.health_probe_interval_seconds,
+        probe_timeout: float = settings.health_check_timeout,
+        degraded_latency_ms: float = settings.health_degraded_latency_ms,
+        unhealthy_latency_ms: float = settings.health_unhealthy_latency_ms,
+        degraded_error_rate: float = settings.health_degraded_error_rate,
+        unhealthy_error_rate: float = settings.health_unhealthy_error_rate,
+    ):
+        self.weather_service = weather_service
+        self.probe_interval_seconds = probe_interval_seconds
+        self.probe_timeout = probe_timeout
+        self.degraded_latency_ms = degraded_latency_ms
+        self.unhealthy_latency_ms = unhealthy_latency_ms
+        self.degraded_error_rate = degraded_error_rate
+        self.unhealthy_error_rate = unhealthy_error_rate
+
+        self.started_at = time.monotonic()
+        self._probe: Optional[ProbeResult] = None
+        self._probe_task: Optional[asyncio.Task] = None
+
+    @property
+    def uptime_seconds(self) -> float:
+        """Seconds since the service started"""
+        return time.monotonic() - self.started_at
+
+    def reset(self) -> None:
+        """Forget the cached probe result"""
+        self._probe = None
+        self._probe_task = None
+
+    async def _run_probe(self) -> ProbeResult:
+        api_client = self.weather_service.api_client
+        try:
+            latency = await api_client.probe(self.probe_timeout)
+        except Exception as e:  # pylint: disable=broad-except
+            # Any probe failure is reported as an unhealthy check, never raised
+            logger.warning("Weather API health probe failed", error=str(e))
+            return ProbeResult(checked_at=time.monotonic(), error=type(e).__name__)
+        return ProbeResult(checked_at=time.monotonic(), latency_seconds=latency)
+
+    async def get_probe(self) -> ProbeResult:
+        """Latest upstream probe, re-probing once the cached result is too old"""
+        if (
+            self._probe is not None
+            and time.monotonic() - self._probe.checked_at < self.probe_interval_seconds
+        ):
+            return self._probe
+
+        # Join a probe already running on this event loop
+        task = self._probe_task
+        loop = asyncio.get_running_loop()
+        if task is None or task.done() or task.get_loop() is not loop:
+            task = self._probe_task = asyncio.ensure_future(self._run_probe())
+
+        self._probe = await asyncio.shield(task)
+        return self._probe
+
+    def check_cache(self) -> ServiceCheck:
+        """Cache occupancy, informational only"""
+        stats = self.weather_service.api_client.cache.get_stats()
+        return ServiceCheck(
+            name="cache",
+            status=HealthStatus.HEALTHY,
+            details={
+                "total_entries": stats["total_entries"],
+                "active_entries": stats["active_entries"],
+                "expired_entries": stats["expired_entries"],
+            },
+        )
+
+    def _upstream_down(self, message: str, details: dict) -> ServiceCheck:
+        """Upstream check while it's failing, degraded if cached data remains"""
+        servable = self.weather_service.api_client.cache.get_stats()["servable_entries"]
+        details["servable_entries"] = servable
+        return ServiceCheck(
+            name="weather_api",
+            status=HealthStatus.DEGRADED if servable else HealthStatus.UNHEALTHY,
+            message=message if servable else f"{message}, no cached data to serve",
+            details=details,
+        )
+
+    async def check_upstream(self) -> ServiceCheck:
+        """Upstream latency and error rate against the configured thresholds
+
+        Latency is the p95 of recent real requests when there are enough of
+        them, otherwise the probe latency. An open circuit (not probed) or a
+        failed probe is degraded while requests can fall back to cached data,
+        and unhealthy once there is none left to serve.
+        """
+        api_client = self.weather_service.api_client
+        circuit_state = self.weather_service.get_circuit_state()
+        error_rate = api_client.circuit_breaker.error_rate
+        details = {
+            "circuit_state": circuit_state.value,
+            "error_rate": round(error_rate, 3),
+        }
+
+        if circuit_state != CircuitState.CLOSED:
+            return self._upstream_down(
+                f"Circuit breaker {circuit_state.value}", details
+            )
+
+        probe = await self.get_probe()
+        if probe.error is not None:
+            return self._upstream_down(f"Probe failed: {probe.error}", details)
+
+        p95 = api_client.latency_tracker.percentile(95)
+        latency_ms = (p95 if p95 is not None else probe.latency_seconds) * 1000
+        details["probe_latency_ms"] = round(probe.latency_seconds * 1000, 1)
+        status = worst_status(
+            [
+                grade(latency_ms, self.degraded_latency_ms, self.unhealthy_latency_ms),
+                grade(error_rate, self.degraded_error_rate, self.unhealthy_error_rate),
+            ]
+        )
+        return ServiceCheck(
+            name="weather_api",
+            status=status,
+            latency_ms=round(latency_ms, 1),
+            details=details,
+        )
+
+    async def check(self) -> HealthCheck:
+        """Run all checks, the overall status being the worst of them"""
+        checks = [self.check_cache(), await self.check_upstream()]
+        return HealthCheck(
+            status=worst_status([check.status for check in checks]),
+            timestamp=datetime.now(),
+            version=settings.app_version,
+            uptime_seconds=round(self.uptime_seconds, 3),
+            checks=checks,
+        )
@@ -0,0 +1,16 @@
+"""Model registry package - main public interface"""
+
+from .exceptions import ModelLoadError, ModelNotFoundError, ModelRegistryError
+from .loader import map_artifact, resident_bytes
+from .registry import ModelArtifact, ModelRegistry, model_registry
+
+__all__ = [
+    "ModelArtifact",
+    "ModelLoadError",
+    "ModelNotFoundError",
+    "ModelRegistry",
+    "ModelRegistryError",
+    "map_artifact",
+    "model_registry",
+    "resident_bytes",
+]
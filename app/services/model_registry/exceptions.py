@@ -0,0 +1,19 @@
+"""Model registry exception hierarchy"""
+
+
+class ModelRegistryError(Exception):
+    """Base exception for model registry errors"""
+
+    pass
+
+
+class ModelNotFoundError(ModelRegistryError):
+    """Raised when no artifact exists for a model or version"""
+
+    pass
+
+
+class ModelLoadError(ModelRegistryError):
+    """Raised when an artifact can't be memory mapped"""
+
+    pass
@@ -0,0 +1,130 @@
+"""Memory-mapped loading of NumPy model artifacts
+
+Arrays are mapped read-only straight from the artifact file rather than read
+into process memory, so pages are only faulted in when used and every worker
+mapping the same file shares them through the OS page cache.
+"""
+
+import os
+import struct
+import zipfile
+from typing import Dict, Optional
+
+import numpy as np
+
+from .exceptions import ModelLoadError
+
+ARTIFACT_SUFFIXES = (".npy", ".npz")
+# Name given to the array of a single .npy artifact, as np.savez names positionals
+DEFAULT_ARRAY_NAME = "arr_0"
+
+_ZIP_LOCAL_HEADER = struct.Struct("<4s22xHH")
+_ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+_NPY_HEADER_READERS = {
+    (1, 0): np.lib.format.read_array_header_1_0,
+    (2, 0): np.lib.format.read_array_header_2_0,
+}
+
+
+def _map(path: str, dtype: np.dtype, shape: tuple, fortran: bool, offset: int):
+    if dtype.hasobject:
+        raise ModelLoadError(f"{path}: object arrays can't be memory mapped")
+    if not np.prod(shape, dtype=np.int64):
+        # mmap can't map zero bytes
+        return np.empty(shape, dtype=dtype)
+    array = np.memmap(
+        path,
+        dtype=dtype,
+        mode="r",
+        offset=offset,
+        shape=shape,
+        order="F" if fortran else "C",
+    )
+    return array.view(np.ndarray)
+
+
+def _map_npy_at(path: str, handle, offset: int) -> np.ndarray:
+    handle.seek(offset)
+    version = np.lib.format.read_magic(handle)
+    read_header = _NPY_HEADER_READERS.get(version)
+    if read_header is None:
+        raise ModelLoadError(f"{path}: unsupported .npy format version {version}")
+    shape, fortran, dtype = read_header(handle)
+    return _map(path, dtype, shape, fortran, handle.tell())
+
+
+def map_npy(path: str) -> Dict[str, np.ndarray]:
+    """Map the single array of a .npy file"""
+    with open(path, "rb") as handle:
+        return {DEFAULT_ARRAY_NAME: _map_npy_at(path, handle, 0)}
+
+
+def map_npz(path: str) -> Dict[str, np.ndarray]:
+    """Map every array of an uncompressed .npz archive
+
+    `np.load` ignores `mmap_mode` for archives, but members written by
+    `np.savez` are stored uncompressed, so each is a .npy file at a fixed
+    offset that can be mapped directly.
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as handle:
+        for info in archive.infolist():
+            if not info.filename.endswith(".npy"):
+                continue
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ModelLoadError(
+                    f"{path}: {info.filename} is compressed, save models with "
+                    "np.savez rather than np.savez_compressed"
+                )
+            handle.seek(info.header_offset)
+            signature, name_length, extra_length = _ZIP_LOCAL_HEADER.unpack(
+                handle.read(_ZIP_LOCAL_HEADER.size)
+            )
+            if signature != _ZIP_LOCAL_SIGNATURE:
+                raise ModelLoadError(f"{path}: corrupt archive member {info.filename}")
+            member_offset = (
+                info.header_offset + _ZIP_LOCAL_HEADER.size + name_length + extra_length
+            )
+            arrays[info.filename[: -len(".npy")]] = _map_npy_at(
+                path, handle, member_offset
+            )
+    return arrays
+
+
+def map_artifact(path: str) -> Dict[str, np.ndarray]:
+    """Map the arrays of a .npy or .npz artifact by name"""
+    try:
+        if path.endswith(".npz"):
+            return map_npz(path)
+        if path.endswith(".npy"):
+            return map_npy(path)
+    except (OSError, ValueError, zipfile.BadZipFile) as e:
+        raise ModelLoadError(f"{path}: {e}") from e
+    raise ModelLoadError(f"{path}: expected one of {ARTIFACT_SUFFIXES}")
+
+
+def resident_bytes(path: str) -> Optional[int]:
+    """Bytes of a mapped file currently resident in this process
+
+    Sums the Rss of every mapping of `path` in /proc/self/smaps, so None where
+    that isn't available.
+    """
+    try:
+        with open("/proc/self/smaps", encoding="utf-8") as smaps:
+            lines = smaps.readlines()
+    except OSError:
+        return None
+
+    target = os.path.realpath(path)
+    total = 0
+    in_target = False
+    for line in lines:
+        parts = line.split(maxsplit=5)
+        if not parts:
+            continue
+        if not parts[0].endswith(":"):
+            # Mapping header: address perms offset device inode [pathname]
+            in_target = len(parts) == 6 and parts[5].rstrip("\n") == target
+        elif in_target and parts[0] == "Rss:":
+            total += int(parts[1]) * 1024
+    return total
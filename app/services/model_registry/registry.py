@@ -0,0 +1,211 @@
+"""Registry of versioned, memory-mapped model artifacts"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from app.config import settings
+from app.utils.metrics import registry as metrics_registry
+
+from .exceptions import ModelNotFoundError
+from .loader import ARTIFACT_SUFFIXES, map_artifact, resident_bytes
+
+logger = structlog.get_logger()
+
+MODEL_LOAD_SECONDS = metrics_registry.histogram(
+    "model_load_duration_seconds",
+    "Time to memory map a model artifact",
+    ("model",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.5, 1.0),
+)
+MODEL_LOADS = metrics_registry.counter(
+    "model_loads_total", "Model artifacts mapped, by version", ("model", "version")
+)
+
+
+def _version_key(version: str) -> tuple:
+    """Natural sort key so that "v10" orders after "v9" """
+    return tuple(
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in re.findall(r"\d+|\D+", version)
+    )
+
+
+@dataclass(frozen=True)
+class ModelArtifact:
+    """Read-only, memory-mapped arrays of one model version"""
+
+    name: str
+    version: str
+    path: str
+    arrays: Dict[str, np.ndarray] = field(repr=False)
+    load_seconds: float
+
+    def __getitem__(self, array_name: str) -> np.ndarray:
+        return self.arrays[array_name]
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes mapped for the model's arrays"""
+        return sum(array.nbytes for array in self.arrays.values())
+
+    def resident_bytes(self) -> Optional[int]:
+        """Bytes of the artifact resident in this process, if known"""
+        return resident_bytes(self.path)
+
+
+class ModelRegistry:
+    """Lazily maps model artifacts laid out as `<root>/<name>/<version>.npz`
+
+    Versions are discovered by `scan`, or on first use when it was never
+    called. `get` maps the active version of a model on first use and hands
+    out the same artifact until the version changes. Swapping versions replaces the
+    artifact atomically: callers holding the old one keep using it, and its
+    mapping is released once they drop it.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+        self._versions: Dict[str, Dict[str, str]] = {}
+        self._pinned: Dict[str, str] = {}
+        self._loaded: Dict[str, ModelArtifact] = {}
+        self._scanned = False
+        # Reentrant, so lookups under the lock can scan on first use
+        self._lock = threading.RLock()
+
+    def scan(self) -> Dict[str, List[str]]:
+        """Discover available model versions, without loading any"""
+        versions: Dict[str, Dict[str, str]] = {}
+        if self.root and os.path.isdir(self.root):
+            for name in sorted(os.listdir(self.root)):
+                model_dir = os.path.join(self.root, name)
+                if not os.path.isdir(model_dir):
+                    continue
+                for filename in os.listdir(model_dir):
+                    version, suffix = os.path.splitext(filename)
+                    if suffix in ARTIFACT_SUFFIXES:
+                        versions.setdefault(name, {})[version] = os.path.join(
+                            model_dir, filename
+                        )
+        with self._lock:
+            self._versions = versions
+            self._scanned = True
+        return self.list_models()
+
+    def _ensure_scanned(self) -> None:
+        """Scan on first use, for processes started without the app lifespan"""
+        if self._scanned:
+            return
+        with self._lock:
+            if not self._scanned:
+                self.scan()
+
+    def list_models(self) -> Dict[str, List[str]]:
+        """Known versions of each model, oldest first"""
+        self._ensure_scanned()
+        return {
+            name: sorted(versions, key=_version_key)
+            for name, versions in self._versions.items()
+        }
+
+    def active_version(self, name: str) -> str:
+        """Pinned version of a model, otherwise its latest"""
+        self._ensure_scanned()
+        versions = self._versions.get(name)
+        if not versions:
+            raise ModelNotFoundError(f"No artifacts for model {name!r}")
+        pinned = self._pinned.get(name)
+        if pinned is not None:
+            return pinned
+        return max(versions, key=_version_key)
+
+    def _load(self, name: str, version: str) -> ModelArtifact:
+        self._ensure_scanned()
+        path = self._versions.get(name, {}).get(version)
+        if path is None:
+            raise ModelNotFoundError(f"No artifact for model {name!r} {version!r}")
+
+        start = time.perf_counter()
+        arrays = map_artifact(path)
+        load_seconds = time.perf_counter() - start
+
+        MODEL_LOAD_SECONDS.labels(name).observe(load_seconds)
+        MODEL_LOADS.labels(name, version).inc()
+        logger.info(
+            "Model mapped",
+            model=name,
+            version=version,
+            arrays=len(arrays),
+            load_ms=round(load_seconds * 1000, 3),
+        )
+        return ModelArtifact(name, version, path, arrays, load_seconds)
+
+    def get(self, name: str) -> ModelArtifact:
+        """Active version of a model, mapped on first use"""
+        artifact = self._loaded.get(name)
+        if artifact is not None:
+            return artifact
+        self._ensure_scanned()
+        with self._lock:
+            version = self.active_version(name)
+            artifact = self._loaded.get(name)
+            if artifact is None or artifact.version != version:
+                artifact = self._loaded[name] = self._load(name, version)
+            return artifact
+
+    def activate(self, name: str, version: str) -> ModelArtifact:
+        """Pin and swap to a version, mapped before it becomes active"""
+        artifact = self._load(name, version)
+        with self._lock:
+            self._pinned[name] = version
+            self._loaded[name] = artifact
+        return artifact
+
+    def unpin(self, name: str) -> None:
+        """Follow the latest version again from the next `get`"""
+        with self._lock:
+            self._pinned.pop(name, None)
+            self._invalidate_stale()
+
+    def refresh(self) -> Dict[str, List[str]]:
+        """Rescan, so models whose active version changed reload on next use"""
+        models = self.scan()
+        with self._lock:
+            self._invalidate_stale()
+        return models
+
+    def _invalidate_stale(self) -> None:
+        for name, artifact in list(self._loaded.items()):
+            try:
+                stale = artifact.version != self.active_version(name)
+            except ModelNotFoundError:
+                stale = True
+            if stale:
+                del self._loaded[name]
+
+    def get_stats(self) -> Dict[str, dict]:
+        """Mapped and resident bytes of each loaded model for monitoring"""
+        return {
+            name: {
+                "version": artifact.version,
+                "mapped_bytes": artifact.nbytes,
+                "resident_bytes": artifact.resident_bytes(),
+                "load_seconds": artifact.load_seconds,
+            }
+            for name, artifact in self._loaded.items()
+        }
+
+    def clear(self) -> None:
+        """Forget loaded artifacts and pins"""
+        with self._lock:
+            self._loaded.clear()
+            self._pinned.clear()
+
+
+model_registry = ModelRegistry(settings.classifier_model_dir)
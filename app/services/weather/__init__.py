@@ -4,16 +4,32 @@ from .service import WeatherService
 from .exceptions import (
     WeatherServiceError,
     WeatherAPITimeoutError,
+    WeatherAPIDeadlineExceededError,
     WeatherAPIHTTPError,
     WeatherAPIFormatError,
+    WeatherAPICircuitOpenError,
 )
+from .circuit_breaker import CircuitState
 from .models import WeatherDataType
+from .units import (
+    PrecipitationUnit,
+    TemperatureUnit,
+    UnitSelection,
+    WindSpeedUnit,
+)
 
 __all__ = [
     "WeatherService",
     "WeatherServiceError",
     "WeatherAPITimeoutError",
+    "WeatherAPIDeadlineExceededError",
     "WeatherAPIHTTPError",
     "WeatherAPIFormatError",
+    "WeatherAPICircuitOpenError",
+    "CircuitState",
     "WeatherDataType",
+    "PrecipitationUnit",
+    "TemperatureUnit",
+    "UnitSelection",
+    "WindSpeedUnit",
 ]
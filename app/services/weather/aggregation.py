@@ -0,0 +1,184 @@
+"""Daily aggregates derived from the hourly series
+
+Builds the `daily` section of an Open-Meteo response from its `hourly`
+section, so the upstream request can leave `daily` out and
+`map_daily_weather` maps the result unchanged. Hours are grouped by the
+location's calendar days, with unix times localized by the UTC offset of
+the location's timezone at each hour, so days stay right across DST
+changes. Unix-time responses get unix-time days, sunrise and sunset as the
+API returns them, so they are localized like a fetched `daily` section.
+"""
+
+from typing import Dict, List, Optional
+
+import numpy as np
+import structlog
+
+from app.models import weather_codes
+from app.utils.solar import sunrise_sunset
+from app.utils.timing import timed
+
+from .exceptions import WeatherAPIFormatError
+from .localization import Offsets, is_unix_time, location_offsets
+from .models import WeatherApiResponse
+from .time_axis import TimeAxis
+
+logger = structlog.get_logger()
+
+# Hourly variables the aggregates need beyond those fetched for current weather
+EXTRA_HOURLY_PARAMS = ["sunshine_duration"]
+SECONDS_PER_HOUR = 3600
+
+
+def _column(hourly: dict, name: str) -> np.ndarray:
+    """Hourly values as floats, None becomes NaN"""
+    return np.array(hourly[name], dtype=float)
+
+
+def local_times(
+    data: WeatherApiResponse, offsets: Optional[Offsets] = None
+) -> np.ndarray:
+    """Hourly times as local datetime64[m]
+
+    ISO times and time axes are already local to the response's timezone,
+    unix times are UTC and shifted by the location's UTC offset at each time,
+    `offsets` when they were already looked up.
+    """
+    times = data["hourly"]["time"]
+    if isinstance(times, TimeAxis):
+        return times.values().astype("datetime64[m]")
+    times = np.asarray(times)
+    if times.dtype.kind in "iuf":
+        if offsets is None:
+            offsets = location_offsets(data, times)
+        shift = np.asarray(offsets).astype("timedelta64[s]")
+        return (times.astype("datetime64[s]") + shift).astype("datetime64[m]")
+    return times.astype("datetime64[m]")
+
+
+def _times(local: np.ndarray, offsets: Offsets, unix: bool, unit: str) -> List:
+    """Local datetime64 values as unix times, or ISO strings in `unit`"""
+    if not unix:
+        return np.datetime_as_string(local, unit=unit).tolist()
+    utc = local.astype("datetime64[s]") - np.asarray(offsets).astype("timedelta64[s]")
+    return utc.astype(np.int64).tolist()
+
+
+def _group_max(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return np.fmax.reduceat(values, starts)
+
+
+def _group_min(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    with np.errstate(invalid="ignore"):
+        return np.fmin.reduceat(values, starts)
+
+
+def _group_sum(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    return np.add.reduceat(np.nan_to_num(values), starts)
+
+
+def _group_mean(values: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    counts = np.add.reduceat(~np.isnan(values), starts)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return _group_sum(values, starts) / counts
+
+
+def _to_list(values: np.ndarray, decimals: int = 2) -> List:
+    """JSON-ready values, NaN as None like the upstream API"""
+    return [
+        None if value != value else value
+        for value in np.round(values, decimals).tolist()
+    ]
+
+
+@timed("aggregate")
+def aggregate_daily(data: WeatherApiResponse) -> Dict[str, dict]:
+    """`daily` and `daily_units` sections computed from the hourly series"""
+    try:
+        hourly = data["hourly"]
+        hourly_units = data["hourly_units"]
+
+        unix = is_unix_time(hourly["time"])
+        offsets = location_offsets(data, hourly["time"]) if unix else 0
+        times = local_times(data, offsets)
+        days = times.astype("datetime64[D]")
+        if not len(days):
+            return {"daily": {"time": []}, "daily_units": {}}
+        starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+        day_dates = days[starts]
+        midnight_offsets = np.broadcast_to(offsets, days.shape)[starts]
+
+        temperature = _column(hourly, "temperature_2m")
+        apparent_temperature = _column(hourly, "apparent_temperature")
+        precipitation = _column(hourly, "precipitation")
+        cloud_cover = _column(hourly, "cloud_cover")
+
+        if "sunshine_duration" in hourly:
+            sunshine = _group_sum(_column(hourly, "sunshine_duration"), starts)
+        else:
+            # Estimate from daylight hours and cloud cover
+            daylight = _column(hourly, "is_day") * SECONDS_PER_HOUR
+            sunshine = _group_sum(daylight * (1 - cloud_cover / 100), starts)
+
+        # Offsets at each day's noon, DST changes happen at night
+        utc_offset_seconds = int(data.get("utc_offset_seconds", 0))
+        noons = day_dates.astype("datetime64[s]") + np.timedelta64(12, "h")
+        sun_offsets = location_offsets(
+            data, noons.astype(np.int64) - utc_offset_seconds
+        )
+        sunrise, sunset = sunrise_sunset(
+            day_dates, data["latitude"], data["longitude"], sun_offsets
+        )
+        time_format = "unixtime" if unix else "iso8601"
+
+        daily = {
+            "time": _times(day_dates, midnight_offsets, unix, "D"),
+            "weather_code": [
+                None if code == weather_codes.MISSING_CODE else code
+                for code in weather_codes.worst_by_group(
+                    hourly["weather_code"], starts
+                ).tolist()
+            ],
+            "sunrise": _times(sunrise, sun_offsets, unix, "m"),
+            "sunset": _times(sunset, sun_offsets, unix, "m"),
+            "sunshine_duration": _to_list(sunshine),
+            "temperature_2m_max": _to_list(_group_max(temperature, starts)),
+            "temperature_2m_min": _to_list(_group_min(temperature, starts)),
+            "apparent_temperature_max": _to_list(
+                _group_max(apparent_temperature, starts)
+            ),
+            "apparent_temperature_min": _to_list(
+                _group_min(apparent_temperature, starts)
+            ),
+            "precipitation_probability_max": _to_list(
+                _group_max(_column(hourly, "precipitation_probability"), starts)
+            ),
+            "precipitation_hours": _group_sum(precipitation > 0, starts)
+            .astype(float)
+            .tolist(),
+            "cloud_cover_mean": _to_list(_group_mean(cloud_cover, starts), 0),
+            "uv_index_max": _to_list(_group_max(_column(hourly, "uv_index"), starts)),
+        }
+        daily_units = {
+            "time": time_format,
+            "weather_code": hourly_units.get("weather_code", "wmo code"),
+            "sunrise": time_format,
+            "sunset": time_format,
+            "sunshine_duration": "s",
+            "temperature_2m_max": hourly_units.get("temperature_2m", ""),
+            "temperature_2m_min": hourly_units.get("temperature_2m", ""),
+            "apparent_temperature_max": hourly_units.get("apparent_temperature", ""),
+            "apparent_temperature_min": hourly_units.get("apparent_temperature", ""),
+            "precipitation_probability_max": hourly_units.get(
+                "precipitation_probability", ""
+            ),
+            "precipitation_hours": "h",
+            "cloud_cover_mean": hourly_units.get("cloud_cover", ""),
+            "uv_index_max": hourly_units.get("uv_index", ""),
+        }
+        return {"daily": daily, "daily_units": daily_units}
+
+    except KeyError as e:
+        logger.error("Missing hourly field for daily aggregates", error=str(e))
+        raise WeatherAPIFormatError("Invalid hourly weather data format") from e
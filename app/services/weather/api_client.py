@@ -1,29 +1,125 @@
 """Weather API client - handles HTTP communication"""
 
-from typing import List, Optional
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 import httpx
 import structlog
 
-from .cache import WeatherCache
+from app.config import settings
+from app.utils.deadline import Deadline
+from app.utils.metrics import registry
+from app.utils.timing import span
+
+from .cache import WeatherCache, record_expiry, stale_data_served
+from .circuit_breaker import CircuitBreaker
+from .compact import compact_response
 from .models import WeatherApiParams, WeatherApiResponse
+from .rate_limiter import UpstreamRateLimiter, parse_retry_after
+from .retry import LatencyTracker, RetryBudget, RetryPolicy
 
-from .exceptions import WeatherAPITimeoutError, WeatherAPIHTTPError, WeatherServiceError
+from .exceptions import (
+    WeatherAPICircuitOpenError,
+    WeatherAPIDeadlineExceededError,
+    WeatherAPITimeoutError,
+    WeatherAPIHTTPError,
+    WeatherServiceError,
+)
 
 logger = structlog.get_logger()
 
+UPSTREAM_DURATION = registry.histogram(
+    "weather_upstream_request_duration_seconds",
+    "Latency of individual requests to the weather API",
+    ("outcome",),
+)
+UPSTREAM_DURATION_RESPONDED = UPSTREAM_DURATION.labels("response")
+UPSTREAM_DURATION_FAILED = UPSTREAM_DURATION.labels("transport_error")
+UPSTREAM_ERRORS = registry.counter(
+    "weather_upstream_errors_total",
+    "Failed requests to the weather API by reason",
+    ("reason",),
+)
+UPSTREAM_RETRIES = registry.counter(
+    "weather_upstream_retries_total", "Retried requests to the weather API"
+)
+UPSTREAM_HEDGES = registry.counter(
+    "weather_upstream_hedges_total", "Hedged requests to the weather API"
+)
+SINGLE_FLIGHT = registry.counter(
+    "weather_singleflight_requests_total",
+    "Cache misses that started (leader) or joined (follower) an upstream fetch",
+    ("role",),
+)
+SINGLE_FLIGHT_LEADERS = SINGLE_FLIGHT.labels("leader")
+SINGLE_FLIGHT_FOLLOWERS = SINGLE_FLIGHT.labels("follower")
+STALE_SERVED = registry.counter(
+    "weather_cache_stale_served_total",
+    "Expired cache entries served while the weather API was failing",
+)
+
 
 class WeatherAPIClient:
     """Handles the actual API communication"""
 
+    RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
     def __init__(
         self,
         base_url: str,
         timeout: float,
         cache_duration_minutes: Optional[int] = None,
+        *,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        latency_tracker: Optional[LatencyTracker] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        timeouts: Optional[httpx.Timeout] = None,
+        rate_limiter: Optional[UpstreamRateLimiter] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
     ):
         self.base_url = base_url
         self.timeout = timeout
-        self.cache = WeatherCache(cache_duration_minutes)
+        self.timeouts = timeouts or httpx.Timeout(
+            connect=settings.weather_api_connect_timeout,
+            read=settings.weather_api_read_timeout,
+            write=settings.weather_api_write_timeout,
+            pool=settings.weather_api_pool_timeout,
+        )
+        self.cache = WeatherCache(
+            cache_duration_minutes,
+            max_stale_minutes=settings.weather_cache_max_stale_minutes,
+        )
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=settings.weather_api_max_retries,
+            base_delay=settings.weather_api_retry_base_delay,
+            max_delay=settings.weather_api_retry_max_delay,
+        )
+        self.retry_budget = retry_budget or RetryBudget(
+            ratio=settings.weather_api_retry_budget_ratio,
+            min_per_second=settings.weather_api_retry_budget_min_per_second,
+        )
+        self.latency_tracker = latency_tracker or LatencyTracker(
+            min_samples=settings.weather_api_hedge_min_samples
+        )
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(
+            failure_rate_threshold=settings.weather_api_breaker_failure_rate,
+            minimum_calls=settings.weather_api_breaker_minimum_calls,
+            window_size=settings.weather_api_breaker_window_size,
+            open_seconds=settings.weather_api_breaker_open_seconds,
+            half_open_probes=settings.weather_api_breaker_half_open_probes,
+        )
+        self.rate_limiter = rate_limiter or UpstreamRateLimiter(
+            rate_per_second=settings.weather_api_rate_limit_per_second,
+            burst=settings.weather_api_rate_limit_burst,
+            max_concurrency=settings.weather_api_max_concurrency,
+            max_retry_after_seconds=settings.weather_api_max_retry_after_seconds,
+        )
+        self.transport = transport
+        self._in_flight: Dict[tuple, asyncio.Future] = {}
+        self.hedge_enabled = settings.weather_api_hedge_enabled
+        self.hedge_percentile = settings.weather_api_hedge_percentile
 
     def _get_cache_key(self, params: WeatherApiParams) -> List[str]:
         cache_keys = [params.get("forecast_days")]
@@ -32,35 +128,351 @@ class WeatherAPIClient:
                 cache_keys.append(weather_type)
         return cache_keys
 
-    async def fetch_weather_data(self, params: WeatherApiParams) -> WeatherApiResponse:
-        """Generic method to fetch weather data from API"""
+    def _timeouts_within(self, deadline: Deadline) -> httpx.Timeout:
+        """Per-phase timeouts clipped to the time left before the deadline"""
+        remaining = deadline.remaining()
+        return httpx.Timeout(
+            connect=min(self.timeouts.connect, remaining),
+            read=min(self.timeouts.read, remaining),
+            write=min(self.timeouts.write, remaining),
+            pool=min(self.timeouts.pool, remaining),
+        )
+
+    def _is_retryable(self, error: Exception) -> bool:
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.RETRYABLE_STATUS_CODES
+        return isinstance(error, httpx.TransportError)
+
+    def _is_upstream_failure(self, error: Exception) -> bool:
+        """Whether an error counts against the circuit breaker
+
+        Non-retryable HTTP errors (4xx) mean the upstream is up and answering.
+        """
+        if isinstance(error, httpx.HTTPStatusError):
+            return self._is_retryable(error)
+        return True
+
+    @staticmethod
+    def _is_caller_deadline(
+        error: Exception, deadline: Deadline, own_deadline: Deadline
+    ) -> bool:
+        """Whether a timeout comes from the caller's budget rather than upstream
+
+        Callers set their own deadline, so running out of it says nothing
+        about the upstream and mustn't count against the circuit breaker.
+        Timeouts within the client's own timeout still do.
+        """
+        return (
+            isinstance(error, (WeatherAPIDeadlineExceededError, httpx.TimeoutException))
+            and deadline.expires_at < own_deadline.expires_at
+            and deadline.expired()
+        )
+
+    def _get_stale_data(
+        self, cache_keys: List[str], params: WeatherApiParams
+    ) -> Optional[WeatherApiResponse]:
+        """Fallback to an expired cache entry while the upstream is failing"""
+        entry = self.cache.get_stale(
+            cache_keys=cache_keys,
+            latitude=params.get("latitude"),
+            longitude=params.get("longitude"),
+        )
+        if entry is None:
+            return None
+
+        logger.warning(
+            "Serving stale weather data",
+            age_seconds=round(entry.age_seconds()),
+            circuit_state=self.circuit_breaker.state.value,
+        )
+        STALE_SERVED.inc()
+        return entry.data
+
+    async def _timed_get(
+        self, client: httpx.AsyncClient, params: WeatherApiParams
+    ) -> httpx.Response:
+        """Single rate limited GET to the forecast endpoint, recording its latency"""
+        async with self.rate_limiter.acquire():
+            start = time.perf_counter()
+            try:
+                response = await client.get(f"{self.base_url}/forecast", params=params)
+            except httpx.TransportError as e:
+                UPSTREAM_DURATION_FAILED.observe(time.perf_counter() - start)
+                UPSTREAM_ERRORS.labels(type(e).__name__).inc()
+                raise
+
+            elapsed = time.perf_counter() - start
+            self.latency_tracker.record(elapsed)
+            UPSTREAM_DURATION_RESPONDED.observe(elapsed)
+        return response
+
+    async def probe(self, timeout: float) -> float:
+        """Minimal rate limited forecast request, returning its latency in seconds
+
+        Used by health checks. It bypasses the cache, retries and the circuit
+        breaker, and is not recorded as request latency.
+        """
+        params = {
+            "latitude": 0,
+            "longitude": 0,
+            "current": "temperature_2m",
+            "forecast_days": 1,
+        }
+        async with httpx.AsyncClient(
+            timeout=timeout, transport=self.transport
+        ) as client:
+            async with self.rate_limiter.acquire():
+                start = time.perf_counter()
+                response = await client.get(f"{self.base_url}/forecast", params=params)
+                elapsed = time.perf_counter() - start
+        response.raise_for_status()
+        return elapsed
+
+    def _retry_after(self, error: Exception) -> float:
+        """Pause the rate limiter for a 429's Retry-After, returning the pause"""
+        if not (
+            isinstance(error, httpx.HTTPStatusError)
+            and error.response.status_code == 429
+        ):
+            return 0.0
+
+        retry_after = parse_retry_after(error.response.headers.get("Retry-After"))
+        if retry_after is None:
+            return 0.0
+        logger.warning("Weather API rate limited", retry_after=retry_after)
+        return self.rate_limiter.pause(retry_after)
+
+    async def _hedged_get(
+        self, client: httpx.AsyncClient, params: WeatherApiParams
+    ) -> httpx.Response:
+        """GET that sends a second attempt once the first exceeds the observed p95
+
+        Whichever attempt answers first wins and the other is cancelled. The
+        hedge draws from the retry budget so it can't amplify load either, and
+        is skipped while requests are queued behind the rate limiter.
+        """
+        hedge_delay = (
+            self.latency_tracker.percentile(self.hedge_percentile)
+            if self.hedge_enabled
+            else None
+        )
+        if hedge_delay is None:
+            return await self._timed_get(client, params)
+
+        primary = asyncio.ensure_future(self._timed_get(client, params))
+        pending = {primary}
+        # Attempts never outlive the caller, even if it's cancelled mid-wait
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info("Fetching weather data", params=params)
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if (
+                done
+                or self.rate_limiter.queue_depth
+                or not self.retry_budget.try_withdraw()
+            ):
+                return await primary
 
-                cache_keys = self._get_cache_key(params)
-                cached_data = self.cache.get(
-                    cache_keys=cache_keys,
-                    latitude=params.get("latitude"),
-                    longitude=params.get("longitude"),
+            logger.info("Hedging slow weather API request", hedge_delay=hedge_delay)
+            UPSTREAM_HEDGES.inc()
+            pending.add(asyncio.ensure_future(self._timed_get(client, params)))
+            while True:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
                 )
-                if cached_data:
-                    print("----------- Using cached weather data")
-                    return cached_data
+                succeeded = [task for task in done if task.exception() is None]
+                if succeeded or not pending:
+                    return (succeeded or list(done))[0].result()
+        finally:
+            for task in pending:
+                task.cancel()
 
-                response = await client.get(f"{self.base_url}/forecast", params=params)
-                print("----------- REQUEST MADE TO WEATHER API")
+    async def _get_with_retries(
+        self, client: httpx.AsyncClient, params: WeatherApiParams, deadline: Deadline
+    ) -> httpx.Response:
+        """GET with retries that is cancelled once the deadline passes"""
+        try:
+            async with asyncio.timeout(deadline.remaining()):
+                return await self._retry_loop(client, params, deadline)
+        except TimeoutError as e:
+            raise WeatherAPIDeadlineExceededError(
+                "Weather service deadline exceeded"
+            ) from e
+
+    async def _retry_loop(
+        self, client: httpx.AsyncClient, params: WeatherApiParams, deadline: Deadline
+    ) -> httpx.Response:
+        """GET with decorrelated-jitter retries for transient upstream failures"""
+        self.retry_budget.record_request()
+        delay = self.retry_policy.base_delay
+        attempt = 1
+
+        while True:
+            try:
+                response = await self._hedged_get(client, params)
                 response.raise_for_status()
-                raw_data = response.json()
+                return response
+            except (httpx.TransportError, httpx.HTTPStatusError) as e:
+                if isinstance(e, httpx.HTTPStatusError):
+                    UPSTREAM_ERRORS.labels(f"http_{e.response.status_code}").inc()
+                delay = self.retry_policy.next_delay(delay)
+                wait = max(delay, self._retry_after(e))
+                if (
+                    attempt >= self.retry_policy.max_attempts
+                    or not self._is_retryable(e)
+                    # A retry that can't finish before the deadline is doomed
+                    or wait >= deadline.remaining()
+                    or not self.retry_budget.try_withdraw()
+                ):
+                    raise
+
+                logger.warning(
+                    "Retrying weather API request",
+                    attempt=attempt,
+                    delay=wait,
+                    error=str(e),
+                )
+                UPSTREAM_RETRIES.inc()
+                await asyncio.sleep(wait)
+                attempt += 1
+
+    def _record_upstream_failure(
+        self, error: Exception, cache_keys: List[str], params: WeatherApiParams
+    ) -> Optional[WeatherApiResponse]:
+        """Update the circuit breaker for a failed fetch and look for stale data"""
+        if not self._is_upstream_failure(error):
+            self.circuit_breaker.record_success()
+            return None
+        self.circuit_breaker.record_failure()
+        return self._get_stale_data(cache_keys, params)
+
+    async def _fetch_upstream(
+        self, cache_keys: List[str], params: WeatherApiParams, deadline: Deadline
+    ) -> Tuple[WeatherApiResponse, bool]:
+        """Fetch from the upstream and cache the result
 
-                # Cache the raw result
-                self.cache.set(
+        Returns the data and whether it is stale data served as a fallback.
+        """
+        if not self.circuit_breaker.allow_request():
+            stale_data = self._get_stale_data(cache_keys, params)
+            if stale_data is not None:
+                return stale_data, True
+            raise WeatherAPICircuitOpenError("Weather service unavailable")
+
+        own_deadline = Deadline.after(self.timeout)
+        recorded = False
+        try:
+            async with httpx.AsyncClient(
+                timeout=self._timeouts_within(deadline), transport=self.transport
+            ) as client:
+                try:
+                    response = await self._get_with_retries(client, params, deadline)
+                    logger.debug("Weather API request made")
+                    raw_data = compact_response(response.json())
+                except Exception as e:
+                    if self._is_caller_deadline(e, deadline, own_deadline):
+                        raise
+                    recorded = True
+                    stale_data = self._record_upstream_failure(e, cache_keys, params)
+                    if stale_data is not None:
+                        return stale_data, True
+                    raise
+
+            self.circuit_breaker.record_success()
+            recorded = True
+        finally:
+            if not recorded:
+                # Cancelled or out of the caller's time before an outcome, don't
+                # hold a half-open probe slot
+                self.circuit_breaker.release()
+
+        # Cache the result, series stored as compact arrays
+        self.cache.set(
+            cache_keys=cache_keys,
+            data=raw_data,
+            latitude=params.get("latitude"),
+            longitude=params.get("longitude"),
+        )
+        return raw_data, False
+
+    async def _single_flight(
+        self, cache_keys: List[str], params: WeatherApiParams, deadline: Deadline
+    ) -> Tuple[WeatherApiResponse, bool]:
+        """Share one upstream fetch between concurrent identical cache misses
+
+        The shared fetch runs within the client's own timeout rather than the
+        first caller's deadline, so a caller with a short budget can't fail
+        the others. Each caller waits no longer than its own deadline.
+        """
+        key = (
+            tuple(cache_keys),
+            params.get("latitude"),
+            params.get("longitude"),
+        )
+        task = self._in_flight.get(key)
+        if task is None:
+            SINGLE_FLIGHT_LEADERS.inc()
+            task = asyncio.ensure_future(
+                self._fetch_upstream(cache_keys, params, Deadline.after(self.timeout))
+            )
+            self._in_flight[key] = task
+            task.add_done_callback(lambda done: self._finish_flight(key, done))
+        else:
+            SINGLE_FLIGHT_FOLLOWERS.inc()
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), deadline.remaining())
+        except TimeoutError as e:
+            raise WeatherAPIDeadlineExceededError(
+                "Weather service deadline exceeded"
+            ) from e
+
+    def _finish_flight(self, key: tuple, task: asyncio.Future) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every waiter gave up
+            task.exception()
+
+    async def fetch_weather_data(
+        self, params: WeatherApiParams, deadline: Optional[Deadline] = None
+    ) -> WeatherApiResponse:
+        """Generic method to fetch weather data from API
+
+        Callers wait no longer than `deadline` (when given) or the client's
+        overall timeout, whichever comes first. Upstream calls never outlive
+        the client's overall timeout.
+        """
+        deadline = Deadline.after(self.timeout).earliest(deadline)
+        try:
+            logger.info("Fetching weather data", params=params)
+
+            cache_keys = self._get_cache_key(params)
+            with span("cache"):
+                cached_data = self.cache.get(
                     cache_keys=cache_keys,
-                    data=raw_data,
                     latitude=params.get("latitude"),
                     longitude=params.get("longitude"),
                 )
-                return raw_data
+            if cached_data:
+                return cached_data
+
+            if deadline.expired():
+                # Caller has already given up, don't start upstream work
+                raise WeatherAPIDeadlineExceededError(
+                    "Weather service deadline exceeded"
+                )
+
+            with span("upstream"):
+                data, stale = await self._single_flight(cache_keys, params, deadline)
+            if stale:
+                stale_data_served.set(True)
+                record_expiry(datetime.now())
+            else:
+                self.cache.record_fresh_expiry()
+            return data
+
+        except WeatherServiceError as e:
+            logger.error("Weather API request dropped", error=str(e))
+            raise
 
         except httpx.TimeoutException as e:
             logger.error("Weather API timeout", error=str(e))
@@ -1,15 +1,77 @@
 """Weather service caching functionality"""
 
+from contextvars import ContextVar
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Tuple
 
 import structlog
 
+from app.utils.logging import lazy
+from app.utils.metrics import registry
+
 logger = structlog.get_logger()
 
+CACHE_REQUESTS = registry.counter(
+    "weather_cache_requests_total", "Weather cache lookups by result", ("result",)
+)
+CACHE_HITS = CACHE_REQUESTS.labels("hit")
+CACHE_MISSES = CACHE_REQUESTS.labels("miss")
+CACHE_EVICTIONS = registry.counter(
+    "weather_cache_evictions_total", "Entries removed from the weather cache"
+)
+CACHE_SNAPPED_HITS = registry.counter(
+    "weather_cache_snapped_hits_total",
+    "Cache hits for coordinates that only matched the entry after snapping",
+)
+
+# Allow small coordinate differences (within ~100m)
+COORDINATE_TOLERANCE = 0.001
+
+# Set when the current request was answered from an expired cache entry
+stale_data_served: ContextVar[bool] = ContextVar("stale_data_served", default=False)
+
+# Coordinates the client sent for the current request, before snapping
+requested_coordinates: ContextVar[Optional[Tuple[float, float]]] = ContextVar(
+    "requested_coordinates", default=None
+)
+
+
+class ResponseExpiry:
+    """Earliest expiry of the cached data a response was built from
+
+    Set for a request by the response cache, which keeps the encoded response
+    no longer than the data behind it.
+    """
+
+    __slots__ = ("expires_at",)
+
+    def __init__(self):
+        self.expires_at: Optional[datetime] = None
+
+    def add(self, expires_at: datetime) -> None:
+        """Record data used by the response that expires at `expires_at`"""
+        if self.expires_at is None or expires_at < self.expires_at:
+            self.expires_at = expires_at
+
+
+response_expiry: ContextVar[Optional[ResponseExpiry]] = ContextVar(
+    "response_expiry", default=None
+)
+
+
+def record_expiry(expires_at: datetime) -> None:
+    """Note the expiry of data used by the current request, if anyone asks"""
+    expiry = response_expiry.get()
+    if expiry is not None:
+        expiry.add(expires_at)
+
+
+def _format_cache_keys(cache_keys: list[str]) -> str:
+    return "".join(str(x) for x in cache_keys)
 
-@dataclass
+
+@dataclass(slots=True)
 class WeatherCacheEntry:
     """Represents a cached weather entry and data"""
 
@@ -19,28 +81,52 @@ class WeatherCacheEntry:
     cache_keys: list[str]
     latitude: float
     longitude: float
+    # Coordinates of the request that filled the entry, before snapping
+    requested: Optional[Tuple[float, float]] = None
+
+    def expires_at(self, cache_duration_minutes: int = 30) -> datetime:
+        """Time the entry expires"""
+        return self.timestamp + timedelta(minutes=cache_duration_minutes)
 
     def is_expired(self, cache_duration_minutes: int = 30) -> bool:
         """Check if cache entry is expired"""
-        expiry_time = self.timestamp + timedelta(minutes=cache_duration_minutes)
-        return datetime.now() > expiry_time
+        return datetime.now() > self.expires_at(cache_duration_minutes)
 
     def matches_request(self, cache_keys: list[str], lat: float, lon: float) -> bool:
         """Check if cache entry matches the request parameters"""
         key_match = set(self.cache_keys) == set(cache_keys)
-        # Allow small coordinate differences (within ~100m)
-        lat_diff = abs(self.latitude - lat) < 0.001
-        lon_diff = abs(self.longitude - lon) < 0.001
+        lat_diff = abs(self.latitude - lat) < COORDINATE_TOLERANCE
+        lon_diff = abs(self.longitude - lon) < COORDINATE_TOLERANCE
 
         return lat_diff and lon_diff and key_match
 
+    def is_snapped_match(self, requested: Optional[Tuple[float, float]]) -> bool:
+        """Whether a matching request would have missed without snapping"""
+        if requested is None or self.requested is None:
+            return False
+        return (
+            abs(self.requested[0] - requested[0]) >= COORDINATE_TOLERANCE
+            or abs(self.requested[1] - requested[1]) >= COORDINATE_TOLERANCE
+        )
+
+    def age_seconds(self) -> float:
+        """Seconds since the entry was cached"""
+        return (datetime.now() - self.timestamp).total_seconds()
+
 
 class WeatherCache:
     """Manages weather data caching"""
 
-    def __init__(self, cache_duration_minutes: int = 30):
+    def __init__(self, cache_duration_minutes: int = 30, max_stale_minutes: int = 0):
         self.store: List[WeatherCacheEntry] = []
         self.cache_duration_minutes = cache_duration_minutes
+        self.max_stale_minutes = max_stale_minutes
+        self.hits = 0
+        self.snapped_hits = 0
+
+    def _is_evictable(self, entry: WeatherCacheEntry) -> bool:
+        """Entries are kept past expiry until they are too stale to fall back on"""
+        return entry.is_expired(self.cache_duration_minutes + self.max_stale_minutes)
 
     def get(
         self, cache_keys: list[str], latitude: float, longitude: float
@@ -50,23 +136,55 @@ class WeatherCache:
             if entry.matches_request(
                 cache_keys, latitude, longitude
             ) and not entry.is_expired(self.cache_duration_minutes):
-                logger.info("Cache hit", cache_keys="".join(str(x) for x in cache_keys))
+                logger.info(
+                    "Cache hit", cache_keys=lazy(_format_cache_keys, cache_keys)
+                )
+                CACHE_HITS.inc()
+                record_expiry(entry.expires_at(self.cache_duration_minutes))
+                self.hits += 1
+                if entry.is_snapped_match(requested_coordinates.get()):
+                    CACHE_SNAPPED_HITS.inc()
+                    self.snapped_hits += 1
                 return entry.data
+        CACHE_MISSES.inc()
+        return None
+
+    def record_fresh_expiry(self) -> None:
+        """Note that the current request used data cached just now
+
+        The entry was set by this request or a concurrent identical one.
+        """
+        if response_expiry.get() is not None:
+            record_expiry(
+                datetime.now() + timedelta(minutes=self.cache_duration_minutes)
+            )
+
+    def get_stale(
+        self, cache_keys: list[str], latitude: float, longitude: float
+    ) -> Optional[WeatherCacheEntry]:
+        """Retrieve an expired entry that is still within the max staleness"""
+        for entry in self.store:
+            if entry.matches_request(
+                cache_keys, latitude, longitude
+            ) and not self._is_evictable(entry):
+                return entry
         return None
 
     def set(
         self, cache_keys: list[str], data: Any, latitude: float, longitude: float
     ) -> None:
         """Add data to cache"""
-        # Remove expired entries and entries for same location/type
+        # Remove too stale entries and entries for same location/type
+        size_before = len(self.store)
         self.store = [
             entry
             for entry in self.store
             if not (
-                entry.is_expired(self.cache_duration_minutes)
+                self._is_evictable(entry)
                 or entry.matches_request(cache_keys, latitude, longitude)
             )
         ]
+        CACHE_EVICTIONS.inc(size_before - len(self.store))
 
         # Add new entry
         entry = WeatherCacheEntry(
@@ -75,17 +193,21 @@ class WeatherCache:
             latitude=latitude,
             longitude=longitude,
             cache_keys=cache_keys,
+            requested=requested_coordinates.get(),
         )
         self.store.append(entry)
         logger.info(
             "Data cached",
-            cache_keys="".join(str(x) for x in cache_keys),
+            cache_keys=lazy(_format_cache_keys, cache_keys),
             cache_size=len(self.store),
         )
 
     def clear(self) -> None:
         """Clear all cached data"""
+        CACHE_EVICTIONS.inc(len(self.store))
         self.store.clear()
+        self.hits = 0
+        self.snapped_hits = 0
         logger.info("Cache cleared")
 
     def get_stats(self) -> Dict[str, Any]:
@@ -94,10 +216,18 @@ class WeatherCache:
         expired_entries = sum(
             1 for entry in self.store if entry.is_expired(self.cache_duration_minutes)
         )
+        servable_entries = sum(
+            1 for entry in self.store if not self._is_evictable(entry)
+        )
 
         return {
             "total_entries": total_entries,
             "expired_entries": expired_entries,
             "active_entries": total_entries - expired_entries,
+            # Fresh entries plus those still within the max staleness
+            "servable_entries": servable_entries,
             "cache_duration_minutes": self.cache_duration_minutes,
+            "max_stale_minutes": self.max_stale_minutes,
+            "hits": self.hits,
+            "snapped_hits": self.snapped_hits,
         }
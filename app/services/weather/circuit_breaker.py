@@ -0,0 +1,114 @@
+"""Circuit breaker for failing fast while the upstream weather API is down"""
+
+import time
+from collections import deque
+from enum import Enum
+
+
+class CircuitState(str, Enum):
+    """Enum for circuit breaker states"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Opens after the error rate over a rolling window crosses a threshold
+
+    While open, calls are rejected without touching the upstream. Once the open
+    period has elapsed a limited number of half-open probes are let through;
+    if they all succeed the circuit closes again, any failure re-opens it.
+    Every probe must end with `record_success`, `record_failure` or, when it
+    is cancelled before an outcome, `release`.
+    """
+
+    def __init__(
+        self,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 2,
+    ):
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+
+        self.outcomes: deque[bool] = deque(maxlen=window_size)
+        self._state = CircuitState.CLOSED
+        self._opened_at = 0.0
+        self._probes_in_flight = 0
+        self._probe_successes = 0
+
+    @property
+    def state(self) -> CircuitState:
+        """Current state, moving from open to half-open once the timer elapses"""
+        if (
+            self._state == CircuitState.OPEN
+            and time.monotonic() - self._opened_at >= self.open_seconds
+        ):
+            self._state = CircuitState.HALF_OPEN
+            self._probes_in_flight = 0
+            self._probe_successes = 0
+        return self._state
+
+    @property
+    def error_rate(self) -> float:
+        """Failure ratio over the rolling window"""
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+
+    def allow_request(self) -> bool:
+        """Whether a call to the upstream may go ahead"""
+        state = self.state
+        if state == CircuitState.CLOSED:
+            return True
+        if state == CircuitState.HALF_OPEN and (
+            self._probes_in_flight < self.half_open_probes
+        ):
+            self._probes_in_flight += 1
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Record a successful upstream call"""
+        if self.state == CircuitState.HALF_OPEN:
+            self.release()
+            self._probe_successes += 1
+            if self._probe_successes >= self.half_open_probes:
+                self._close()
+            return
+        self.outcomes.append(True)
+
+    def record_failure(self) -> None:
+        """Record a failed upstream call, opening the circuit if needed"""
+        if self.state == CircuitState.HALF_OPEN:
+            self.release()
+            self._open()
+            return
+        self.outcomes.append(False)
+        if (
+            len(self.outcomes) >= self.minimum_calls
+            and self.error_rate >= self.failure_rate_threshold
+        ):
+            self._open()
+
+    def release(self) -> None:
+        """Free a half-open probe slot, for probes that end without an outcome"""
+        if self._state == CircuitState.HALF_OPEN and self._probes_in_flight:
+            self._probes_in_flight -= 1
+
+    def reset(self) -> None:
+        """Close the circuit and forget recorded outcomes"""
+        self._close()
+
+    def _open(self) -> None:
+        self._state = CircuitState.OPEN
+        self._opened_at = time.monotonic()
+
+    def _close(self) -> None:
+        self._state = CircuitState.CLOSED
+        self.outcomes.clear()
@@ -0,0 +1,148 @@
+"""Compact storage of weather API payloads for the cache
+
+Decoded JSON keeps each hourly value as a boxed float in a list, around 32
+bytes a value. Series sections are stored instead as one contiguous array per
+variable: the smallest integer type that fits, float32 when every value
+survives the round trip at the variable's decimal places, else float64.
+Reading a variable returns a float64 or integer array, missing values as NaN.
+"""
+
+from collections.abc import Mapping
+from typing import Any, Dict, Hashable, Iterator, List, Optional, Union
+
+import numpy as np
+
+from .models import WeatherApiResponse
+from .time_axis import TimeAxis
+
+# Sections holding equal-length series, other sections are kept as they are
+SERIES_SECTIONS = ("hourly", "daily")
+# Decimal places tried before falling back to float64
+MAX_DECIMALS = 3
+INTEGER_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+Column = Union[np.ndarray, TimeAxis, list]
+
+
+def _float_column(values: np.ndarray) -> tuple[np.ndarray, Optional[int]]:
+    """Array and decimal places to restore, None when stored as float64"""
+    finite = values[np.isfinite(values)]
+    for decimals in range(MAX_DECIMALS + 1):
+        if not np.array_equal(np.round(finite, decimals), finite):
+            continue
+        narrow = values.astype(np.float32)
+        restored = np.round(narrow.astype(np.float64), decimals)
+        if np.array_equal(restored, values, equal_nan=True):
+            return narrow, decimals
+        break
+    return values, None
+
+
+def _integer_column(values: np.ndarray) -> np.ndarray:
+    if not len(values):
+        return values.astype(np.int8)
+    low, high = values.min(), values.max()
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return values.astype(dtype)
+    return values
+
+
+class CompactSeries(Mapping):
+    """A section of equal-length series, one contiguous array per variable"""
+
+    __slots__ = ("_columns", "_decimals")
+
+    def __init__(self, columns: Dict[str, Column], decimals: Dict[str, int]):
+        self._columns = columns
+        self._decimals = decimals
+
+    @classmethod
+    def from_section(cls, section: Dict[str, Any]) -> "CompactSeries":
+        """Compact a decoded JSON section"""
+        columns: Dict[str, Column] = {}
+        decimals: Dict[str, int] = {}
+        for name, values in section.items():
+            columns[name], places = cls._compact(values)
+            if places is not None:
+                decimals[name] = places
+        return cls(columns, decimals)
+
+    @staticmethod
+    def _compact(values) -> tuple[Column, Optional[int]]:
+        if not isinstance(values, list) or not values:
+            return values, None
+        if any(isinstance(value, str) for value in values):
+            try:
+                return TimeAxis.parse(values), None
+            except ValueError:
+                return values, None
+        if all(isinstance(value, int) for value in values):
+            return _integer_column(np.array(values, dtype=np.int64)), None
+        try:
+            array = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            return values, None
+        return _float_column(array)
+
+    def __getitem__(self, name: str) -> Column:
+        column = self._columns[name]
+        decimals = self._decimals.get(name)
+        if decimals is not None:
+            return np.round(column.astype(np.float64), decimals)
+        return column
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._columns)
+
+    def __len__(self) -> int:
+        return len(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the arrays"""
+        total = 0
+        for column in self._columns.values():
+            if isinstance(column, np.ndarray):
+                total += column.nbytes
+            elif isinstance(column, TimeAxis) and not column.is_regular:
+                total += column.values().nbytes
+        return total
+
+
+class CompactResponse(dict):
+    """A compacted payload, with the forecasts mapped from it
+
+    `views` holds mapped results by whatever key the service uses. It lives
+    and is dropped with the cache entry that holds the payload.
+    """
+
+    __slots__ = ("views",)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.views: Dict[Hashable, Any] = {}
+
+
+def compact_response(data: WeatherApiResponse) -> CompactResponse:
+    """Copy of a decoded payload with its series sections compacted"""
+    compacted = CompactResponse(data)
+    for section in SERIES_SECTIONS:
+        if isinstance(data.get(section), dict):
+            compacted[section] = CompactSeries.from_section(data[section])
+    return compacted
+
+
+def to_list(values: Column) -> Column:
+    """Array values as Python scalars, missing values as None
+
+    Converts a whole array at once, so mappers don't box numpy scalars one
+    value at a time.
+    """
+    if not isinstance(values, np.ndarray):
+        return values
+    items: List = values.tolist()
+    if values.dtype.kind == "f" and np.isnan(values).any():
+        return [None if value != value else value for value in items]
+    return items
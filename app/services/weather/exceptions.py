@@ -13,6 +13,12 @@ class WeatherAPITimeoutError(WeatherServiceError):
     pass
 
 
+class WeatherAPIDeadlineExceededError(WeatherAPITimeoutError):
+    """Raised when the request deadline leaves no time for the weather API"""
+
+    pass
+
+
 class WeatherAPIHTTPError(WeatherServiceError):
     """Raised when the weather API returns an HTTP error"""
 
@@ -25,3 +31,9 @@ class WeatherAPIFormatError(WeatherServiceError):
     """Raised when the weather API returns unexpected data format"""
 
     pass
+
+
+class WeatherAPICircuitOpenError(WeatherServiceError):
+    """Raised when the circuit breaker is rejecting calls to the weather API"""
+
+    pass
@@ -0,0 +1,155 @@
+"""Re-projection of UTC time axes into a local timezone
+
+The weather API is asked for unix times, so cached payloads hold absolute
+UTC instants that any timezone can be derived from. On the way out, time
+series become local `TimeAxis` values, single times local ISO strings in the
+format the API returns for `timeformat=iso8601`, and the offset fields are
+set for the zone.
+"""
+
+from datetime import datetime, timezone as dt_timezone
+from typing import Optional, Sequence, Union
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+import numpy as np
+import structlog
+
+from .models import WeatherApiResponse
+from .time_axis import TimeAxis
+
+logger = structlog.get_logger()
+
+# Local time fields of each section, daily `time` is handled separately
+TIME_FIELDS = {
+    "current": ("time",),
+    "hourly": ("time",),
+    "daily": ("sunrise", "sunset"),
+}
+
+Offsets = Union[int, np.ndarray]
+
+
+def get_zone(name: str) -> ZoneInfo:
+    """Zone for an IANA timezone name, raising ValueError when unknown"""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError) as e:
+        raise ValueError(f"Unknown timezone: {name}") from e
+
+
+def is_unix_time(values) -> bool:
+    """Whether a time value or axis holds unix times rather than ISO strings"""
+    if isinstance(values, np.ndarray):
+        return values.dtype.kind in "iuf"
+    if isinstance(values, list):
+        return bool(values) and isinstance(values[0], (int, float))
+    return isinstance(values, (int, float))
+
+
+def utc_offsets(times: np.ndarray, zone: Optional[ZoneInfo], default: int) -> Offsets:
+    """UTC offset in seconds of each unix time in a zone
+
+    Offsets are only looked up per time when the axis crosses a transition,
+    otherwise one offset covers the whole axis.
+    """
+    if zone is None or not len(times):
+        return default
+
+    def offset(seconds) -> int:
+        instant = datetime.fromtimestamp(int(seconds), dt_timezone.utc)
+        return int(instant.astimezone(zone).utcoffset().total_seconds())
+
+    first, last = offset(times[0]), offset(times[-1])
+    if first == last:
+        return first
+    return np.array([offset(t) for t in times])
+
+
+def location_offsets(data: WeatherApiResponse, times: Sequence) -> Offsets:
+    """UTC offsets of unix times in the response location's own timezone
+
+    Falls back to the fixed `utc_offset_seconds` when the response names no
+    known zone.
+    """
+    return utc_offsets(
+        np.asarray(times, dtype=np.int64),
+        _find_zone(data.get("timezone")),
+        int(data.get("utc_offset_seconds", 0)),
+    )
+
+
+def _local_axis(values: Sequence, zone: Optional[ZoneInfo], default: int) -> TimeAxis:
+    times = np.asarray(values, dtype=np.int64)
+    offsets = utc_offsets(times, zone, default)
+    return TimeAxis.parse((times + offsets).astype("datetime64[s]"))
+
+
+def localize_response(
+    data: WeatherApiResponse, timezone: Optional[str] = None
+) -> WeatherApiResponse:
+    """Copy of a unix-time response with local times
+
+    Times are shown in `timezone`, or the location's own timezone when not
+    given. Daily rows keep the location's calendar days, the API groups
+    them, only their sunrise and sunset move to the requested zone.
+    Responses that already hold ISO times are returned unchanged.
+    """
+    if not any(
+        is_unix_time((data.get(section) or {}).get("time")) for section in TIME_FIELDS
+    ):
+        return data
+
+    default_offset = int(data.get("utc_offset_seconds", 0))
+    location_zone = _find_zone(data.get("timezone"))
+    zone = get_zone(timezone) if timezone else location_zone
+
+    localized = dict(data)
+    for section, fields in TIME_FIELDS.items():
+        values = data.get(section)
+        if not values:
+            continue
+        section_values = dict(values)
+        for field in fields:
+            value = section_values.get(field)
+            if not is_unix_time(value):
+                continue
+            if isinstance(value, (list, np.ndarray)):
+                section_values[field] = _local_axis(value, zone, default_offset)
+            else:
+                axis = _local_axis([value], zone, default_offset)
+                section_values[field] = axis.iso()[0]
+        if section == "daily" and is_unix_time(section_values.get("time")):
+            days = _local_axis(section_values["time"], location_zone, default_offset)
+            section_values["time"] = TimeAxis.parse(
+                days.values().astype("datetime64[D]")
+            )
+        localized[section] = section_values
+
+        units_section = f"{section}_units"
+        if data.get(units_section):
+            localized[units_section] = {
+                **data[units_section],
+                **{
+                    field: "iso8601"
+                    for field in ("time", *fields)
+                    if field in data[units_section]
+                },
+            }
+
+    if timezone:
+        local_now = datetime.now(dt_timezone.utc).astimezone(zone)
+        localized["timezone"] = timezone
+        localized["timezone_abbreviation"] = local_now.tzname()
+        localized["utc_offset_seconds"] = int(local_now.utcoffset().total_seconds())
+    return localized
+
+
+def _find_zone(name: Optional[str]) -> Optional[ZoneInfo]:
+    """Zone named by the API, None falls back to its fixed utc_offset_seconds"""
+    if not name:
+        return None
+    try:
+        return get_zone(name)
+    except ValueError:
+        logger.warning("Unknown timezone in weather data", timezone=name)
+        return None
@@ -7,13 +7,17 @@ from app.utils.metric_transformers import (
     transform_maps_to_metric,
     transform_maps_to_metric_range,
 )
+from app.utils.timing import timed
 
+from .compact import to_list
 from .exceptions import WeatherAPIFormatError
 from .models import WeatherApiResponse
+from .time_axis import TimeAxis
 
 logger = structlog.get_logger()
 
 
+@timed("map")
 def map_current_weather(data: WeatherApiResponse) -> WeatherForecastData:
     """Map current weather API response to WeatherForecastData"""
     try:
@@ -44,13 +48,19 @@ def map_current_weather(data: WeatherApiResponse) -> WeatherForecastData:
         raise WeatherAPIFormatError("Invalid current weather data format") from e
 
 
+@timed("map")
 def map_daily_weather(data: WeatherApiResponse) -> List[WeatherDailyForecastData]:
     """Map daily weather API response to list of WeatherDailyForecastData"""
     try:
-        daily_data = data["daily"]
+        # Whole columns to Python values at once, compact arrays included
+        daily_data = {name: to_list(values) for name, values in data["daily"].items()}
         daily_units = data["daily_units"]
 
-        total_days = len(daily_data["time"])
+        # Parsed in bulk rather than per day by the schema
+        times = TimeAxis.of(daily_data["time"]).datetimes()
+        sunrises = TimeAxis.of(daily_data["sunrise"]).datetimes()
+        sunsets = TimeAxis.of(daily_data["sunset"]).datetimes()
+        total_days = len(times)
         daily_list = []
 
         for i in range(total_days):
@@ -73,10 +83,10 @@ def map_daily_weather(data: WeatherApiResponse) -> List[WeatherDailyForecastData
             )
 
             daily_forecast = WeatherDailyForecastData(
-                time=daily_data["time"][i],
+                time=times[i],
                 weather_code=daily_data["weather_code"][i],
-                sunrise=daily_data["sunrise"][i],
-                sunset=daily_data["sunset"][i],
+                sunrise=sunrises[i],
+                sunset=sunsets[i],
                 sunshine_duration=daily_data["sunshine_duration"][i],
                 precipitation_hours=daily_data["precipitation_hours"][i],
                 # Metrics
@@ -97,12 +107,16 @@ def map_daily_weather(data: WeatherApiResponse) -> List[WeatherDailyForecastData
         raise WeatherAPIFormatError("Invalid daily weather data format") from e
 
 
+@timed("map")
 def map_hourly_weather(data: WeatherApiResponse) -> List[WeatherForecastData]:
     """Map daily weather API response to list of WeatherDailyForecastData"""
     try:
-        hourly_data = data["hourly"]
+        # Whole columns to Python values at once, compact arrays included
+        hourly_data = {name: to_list(values) for name, values in data["hourly"].items()}
         hourly_units = data["hourly_units"]
-        total_hours = len(hourly_data["time"])
+        # Parsed in bulk rather than per hour by the schema
+        times = TimeAxis.of(hourly_data["time"]).datetimes()
+        total_hours = len(times)
         hourly_list = []
 
         for i in range(total_hours):
@@ -123,7 +137,7 @@ def map_hourly_weather(data: WeatherApiResponse) -> List[WeatherForecastData]:
             )
 
             hour_forecast = WeatherForecastData(
-                time=hourly_data["time"][i],
+                time=times[i],
                 weather_code=hourly_data["weather_code"][i],
                 is_day=hourly_data["is_day"][i],
                 # Metrics
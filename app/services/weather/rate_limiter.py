@@ -0,0 +1,127 @@
+"""Client-side rate limiting and concurrency cap for upstream weather API calls"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, Optional
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (delta-seconds or HTTP-date) into seconds"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at `rate_per_second` up to `burst`"""
+
+    def __init__(self, rate_per_second: float, burst: int):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+
+    def pause(self, seconds: float) -> None:
+        """Hand out no tokens for the given time, e.g. after a 429"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def try_take(self) -> float:
+        """Take a token, returning 0 on success or the seconds to wait"""
+        now = time.monotonic()
+        if now < self._paused_until:
+            return self._paused_until - now
+
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last_refill) * self.rate_per_second
+        )
+        self._last_refill = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_per_second
+
+
+class UpstreamRateLimiter:
+    """Token bucket rate limit plus a concurrency cap for upstream requests
+
+    Waiters are served in arrival order. `queue_depth` counts callers waiting
+    for either a concurrency slot or a token.
+    """
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        burst: int,
+        max_concurrency: int,
+        max_retry_after_seconds: float = 60.0,
+    ):
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.max_concurrency = max_concurrency
+        self.max_retry_after_seconds = max_retry_after_seconds
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._bucket_lock = asyncio.Lock()
+        self.queue_depth = 0
+        self.in_flight = 0
+
+    def _bind_to_running_loop(self) -> None:
+        """Recreate the asyncio primitives when running on a new event loop
+
+        They bind to the first loop that uses them, and Mangum or the test
+        client may start a fresh loop.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._bucket_lock = asyncio.Lock()
+
+    async def _take_token(self) -> None:
+        async with self._bucket_lock:
+            wait = self.bucket.try_take()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self.bucket.try_take()
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[None]:
+        """Wait for a concurrency slot and a token before calling upstream"""
+        self._bind_to_running_loop()
+        self.queue_depth += 1
+        try:
+            await self._semaphore.acquire()
+            try:
+                await self._take_token()
+            except BaseException:
+                self._semaphore.release()
+                raise
+        finally:
+            self.queue_depth -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+    def pause(self, retry_after_seconds: float) -> float:
+        """Honour an upstream Retry-After, capped to a sane maximum"""
+        seconds = min(retry_after_seconds, self.max_retry_after_seconds)
+        self.bucket.pause(seconds)
+        return seconds
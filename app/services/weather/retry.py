@@ -0,0 +1,94 @@
+"""Retry, hedging and latency tracking for upstream weather API calls"""
+
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass
+class RetryPolicy:
+    """Retry settings using decorrelated jitter between attempts"""
+
+    max_retries: int = 2
+    base_delay: float = 0.1
+    max_delay: float = 2.0
+
+    @property
+    def max_attempts(self) -> int:
+        """Total number of attempts including the first one"""
+        return self.max_retries + 1
+
+    def next_delay(self, previous_delay: float) -> float:
+        """Decorrelated jitter: random between base and 3x the previous delay"""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+
+class RetryBudget:
+    """Caps retries to a fraction of recent requests so they can't amplify load
+
+    Every request deposits `ratio` tokens and every retry (or hedge) withdraws a
+    whole token. A small per-second allowance keeps low-traffic instances able
+    to retry at all.
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.1,
+        min_per_second: float = 1.0,
+        max_tokens: float = 10.0,
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.max_tokens = max_tokens
+        self._tokens = max_tokens
+        self._last_refill = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._last_refill = now
+        self._tokens = min(
+            self.max_tokens, self._tokens + elapsed * self.min_per_second
+        )
+
+    @property
+    def available(self) -> float:
+        """Tokens currently available for retries"""
+        self._refill()
+        return self._tokens
+
+    def record_request(self) -> None:
+        """Deposit tokens for an original (non-retry) request"""
+        self._refill()
+        self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Take a token for a retry, returns False if the budget is exhausted"""
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+
+class LatencyTracker:
+    """Rolling window of observed upstream latencies"""
+
+    def __init__(self, window_size: int = 256, min_samples: int = 20):
+        self.samples: deque[float] = deque(maxlen=window_size)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float) -> None:
+        """Record a completed request duration"""
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency at the given percentile, None until enough samples exist"""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+        return ordered[index]
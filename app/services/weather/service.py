@@ -1,13 +1,36 @@
+from typing import Any, Callable, Optional
+
+import numpy as np
 import structlog
 
 from app.schemas.weather_data import WeatherForecastData, WeatherDailyForecastData
 from app.config import settings
+from app.services.classification.batching import MicroBatcher
+from app.services.classification.clothing import ClothingClassifier
+from app.services.classification.result_cache import ClassificationCache
+from app.utils.deadline import Deadline
+from app.utils.metrics import registry
+from app.utils.timing import span
 
+from .aggregation import EXTRA_HOURLY_PARAMS, aggregate_daily
 from .api_client import WeatherAPIClient
+from .circuit_breaker import CircuitState
+from .localization import localize_response
 from .mappers import map_current_weather, map_daily_weather, map_hourly_weather
+from .models import WeatherApiResponse
+from .snapping import CoordinateSnapper
+from .units import CANONICAL_UNITS, UnitSelection, convert_response
 
 logger = structlog.get_logger()
 
+MAPPED_REQUESTS = registry.counter(
+    "weather_mapped_cache_requests_total",
+    "Lookups of forecasts mapped from cached payloads by result",
+    ("result",),
+)
+MAPPED_HITS = MAPPED_REQUESTS.labels("hit")
+MAPPED_MISSES = MAPPED_REQUESTS.labels("miss")
+
 
 class WeatherService:
     """API client for fetching current, daily, and hourly weather from Open-Meteo"""
@@ -41,9 +64,14 @@ class WeatherService:
         "uv_index_max",
     ]
 
+    # Always fetched in the canonical units and as unix times, converted and
+    # localized per request after caching
     DEFAULT_PARAMS = {
-        "wind_speed_unit": "kmh",
+        "temperature_unit": CANONICAL_UNITS.temperature.value,
+        "wind_speed_unit": CANONICAL_UNITS.wind_speed.value,
+        "precipitation_unit": CANONICAL_UNITS.precipitation.value,
         "timezone": "auto",
+        "timeformat": "unixtime",
         "current": CURRENT_PARAMS,
         "daily": DAILY_PARAMS,
         "hourly": CURRENT_PARAMS,
@@ -56,11 +84,132 @@ class WeatherService:
             timeout=settings.weather_api_timeout,
             cache_duration_minutes=cache_duration_minutes,
         )
+        self.snapper = CoordinateSnapper(
+            settings.weather_snap_mode,
+            resolution=settings.weather_snap_resolution,
+            geohash_precision=settings.weather_snap_geohash_precision,
+        )
+        self.max_mapped_views = settings.weather_mapped_views_per_entry
+        self.daily_from_hourly = settings.weather_daily_from_hourly
+        self.params = self.DEFAULT_PARAMS
+        if self.daily_from_hourly:
+            # One upstream section less to fetch, cache and parse
+            self.params = {
+                key: value
+                for key, value in self.DEFAULT_PARAMS.items()
+                if key != "daily"
+            }
+            self.params["hourly"] = self.CURRENT_PARAMS + EXTRA_HOURLY_PARAMS
+        self.clothing_classifier = ClothingClassifier()
+        self.clothing_cache: Optional[ClassificationCache] = None
+        classify_rows = self._classify_clothing
+        if settings.classification_cache_max_entries > 0:
+            self.clothing_cache = ClassificationCache(
+                self._classify_clothing,
+                self.clothing_classifier.discretize,
+                name="clothing",
+                max_entries=settings.classification_cache_max_entries,
+            )
+            classify_rows = self.clothing_cache.classify
+        self._classify_clothing_rows = classify_rows
+        self.clothing_batcher: Optional[MicroBatcher] = None
+        if settings.classification_batch_window_ms > 0:
+            self.clothing_batcher = MicroBatcher(
+                classify_rows,
+                name="clothing",
+                max_batch_rows=settings.classification_batch_max_rows,
+                max_wait_ms=settings.classification_batch_window_ms,
+            )
+
+    def _classify_clothing(self, features: np.ndarray) -> np.ndarray:
+        """Outfit and comfort index columns for rows of clothing features"""
+        classification = self.clothing_classifier.classify_matrix(features)
+        return np.column_stack([classification.outfit, classification.comfort_index])
+
+    async def add_clothing(
+        self,
+        forecast: list[WeatherForecastData],
+        canonical: Optional[list[WeatherForecastData]] = None,
+    ) -> None:
+        """Attach clothing recommendations, classifying the forecast in one batch
+
+        Classification thresholds are in the canonical units, so a forecast in
+        other units is classified from `canonical`, the same forecast mapped
+        before conversion. With batching enabled the forecast shares a batch
+        with concurrent requests.
+        """
+        with span("classify"):
+            features = self.clothing_classifier.feature_matrix(
+                forecast if canonical is None else canonical
+            )
+            if self.clothing_batcher is not None:
+                outputs = await self.clothing_batcher.submit(features)
+            else:
+                outputs = self._classify_clothing_rows(features)
+            recommendations = self.clothing_classifier.recommendations(
+                outputs[:, 0].astype(np.intp), outputs[:, 1]
+            )
+        for hour, clothing in zip(forecast, recommendations):
+            hour.clothing = clothing
+
+    async def _get_mapped(
+        self,
+        raw_data: WeatherApiResponse,
+        section: str,
+        forecast_days: int,
+        units: Optional[UnitSelection],
+        timezone: Optional[str],
+        build: Callable,
+    ) -> Any:
+        """Forecast mapped from a payload, built once per cached payload
+
+        Mapped forecasts are kept on the cached payload, so they expire with
+        its cache entry, and are shared between requests, so callers must not
+        modify them.
+        """
+        units = units or CANONICAL_UNITS
+        views = getattr(raw_data, "views", None)
+        if views is None or self.max_mapped_views == 0:
+            return await build(raw_data, units, timezone)
+
+        key = (section, forecast_days, units, timezone)
+        if key in views:
+            MAPPED_HITS.inc()
+            return views[key]
+        MAPPED_MISSES.inc()
+        mapped = await build(raw_data, units, timezone)
+        if len(views) >= self.max_mapped_views:
+            # Drop the oldest view, e.g. for a rarely requested timezone
+            views.pop(next(iter(views)))
+        views[key] = mapped
+        return mapped
+
+    def get_circuit_state(self) -> CircuitState:
+        """Current state of the upstream circuit breaker"""
+        return self.api_client.circuit_breaker.state
+
+    def get_stats(self) -> dict:
+        """Cache and upstream client statistics for monitoring"""
+        api_client = self.api_client
+        stats = {
+            **api_client.cache.get_stats(),
+            "circuit_state": api_client.circuit_breaker.state.value,
+            "upstream_error_rate": api_client.circuit_breaker.error_rate,
+            "upstream_queue_depth": api_client.rate_limiter.queue_depth,
+            "upstream_in_flight": api_client.rate_limiter.in_flight,
+            "retry_budget_tokens": api_client.retry_budget.available,
+        }
+        if self.clothing_cache is not None:
+            stats["classification_cache"] = self.clothing_cache.get_stats()
+        return stats
 
     async def get_current_weather(
         self,
         latitude: float,
         longitude: float,
+        deadline: Optional[Deadline] = None,
+        units: Optional[UnitSelection] = None,
+        timezone: Optional[str] = None,
     ) -> WeatherForecastData:
         """Fetch current weather from API"""
 
@@ -68,17 +217,38 @@ class WeatherService:
             "Fetching current weather data", latitude=latitude, longitude=longitude
         )
 
-        # Fetch from API
+        # Fetch from API, for the snapped coordinates so nearby requests share
+        # a cache entry
+        latitude, longitude = self.snapper.snap(latitude, longitude)
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            **self.DEFAULT_PARAMS,
+            **self.params,
         }
 
-        raw_data = await self.api_client.fetch_weather_data(params)
+        raw_data = await self.api_client.fetch_weather_data(params, deadline=deadline)
 
-        weather_data = map_current_weather(raw_data)
+        return await self._get_mapped(
+            raw_data,
+            "current",
+            params["forecast_days"],
+            units,
+            timezone,
+            self._map_current,
+        )
 
+    async def _map_current(
+        self,
+        raw_data: WeatherApiResponse,
+        units: Optional[UnitSelection],
+        timezone: Optional[str],
+    ) -> WeatherForecastData:
+        raw_data = localize_response(raw_data, timezone)
+        weather_data = map_current_weather(convert_response(raw_data, units))
+        canonical = None
+        if units is not None and not units.is_canonical:
+            canonical = [map_current_weather(raw_data)]
+        await self.add_clothing([weather_data], canonical)
         return weather_data
 
     async def get_daily_weather(
@@ -86,6 +256,9 @@ class WeatherService:
         latitude: float,
         longitude: float,
         forecast_length: int = DEFAULT_PARAMS["forecast_days"],
+        deadline: Optional[Deadline] = None,
+        units: Optional[UnitSelection] = None,
+        timezone: Optional[str] = None,
     ) -> list[WeatherDailyForecastData]:
         """Fetch daily weather from Open-Meteo API"""
 
@@ -93,25 +266,48 @@ class WeatherService:
             "Fetching daily weather data", latitude=latitude, longitude=longitude
         )
 
-        # Fetch from API
+        # Fetch from API, for the snapped coordinates so nearby requests share
+        # a cache entry
+        latitude, longitude = self.snapper.snap(latitude, longitude)
         params = {
             "latitude": latitude,
             "longitude": longitude,
-            **self.DEFAULT_PARAMS,
+            **self.params,
             "forecast_days": forecast_length,
         }
 
-        raw_data = await self.api_client.fetch_weather_data(params)
+        raw_data = await self.api_client.fetch_weather_data(params, deadline=deadline)
 
-        weather_data = map_daily_weather(raw_data)
+        return await self._get_mapped(
+            raw_data,
+            "daily",
+            params["forecast_days"],
+            units,
+            timezone,
+            self._map_daily,
+        )
 
-        return weather_data
+    async def _map_daily(
+        self,
+        raw_data: WeatherApiResponse,
+        units: Optional[UnitSelection],
+        timezone: Optional[str],
+    ) -> list[WeatherDailyForecastData]:
+        if self.daily_from_hourly:
+            # Grouped by the location's days before times are localized
+            raw_data = {**raw_data, **aggregate_daily(raw_data)}
+        raw_data = localize_response(raw_data, timezone)
+        raw_data = convert_response(raw_data, units)
+        return map_daily_weather(raw_data)
 
     async def get_hourly_weather(
         self,
         latitude: float,
         longitude: float,
         forecast_length: int = 1,
+        deadline: Optional[Deadline] = None,
+        units: Optional[UnitSelection] = None,
+        timezone: Optional[str] = None,
     ) -> list[WeatherForecastData]:
         """Fetch daily weather from Open-Meteo API"""
 
@@ -119,16 +315,37 @@ class WeatherService:
             "Fetching daily weather data", latitude=latitude, longitude=longitude
         )
 
-        # Fetch from API
+        # Fetch from API, for the snapped coordinates so nearby requests share
+        # a cache entry
+        latitude, longitude = self.snapper.snap(latitude, longitude)
         params = {
             "latitude": latitude,
             "longitude": longitude,
             "forecast_days": forecast_length,
-            **self.DEFAULT_PARAMS,
+            **self.params,
         }
 
-        raw_data = await self.api_client.fetch_weather_data(params)
+        raw_data = await self.api_client.fetch_weather_data(params, deadline=deadline)
 
-        weather_data = map_hourly_weather(raw_data)
+        return await self._get_mapped(
+            raw_data,
+            "hourly",
+            params["forecast_days"],
+            units,
+            timezone,
+            self._map_hourly,
+        )
 
+    async def _map_hourly(
+        self,
+        raw_data: WeatherApiResponse,
+        units: Optional[UnitSelection],
+        timezone: Optional[str],
+    ) -> list[WeatherForecastData]:
+        raw_data = localize_response(raw_data, timezone)
+        weather_data = map_hourly_weather(convert_response(raw_data, units))
+        canonical = None
+        if units is not None and not units.is_canonical:
+            canonical = map_hourly_weather(raw_data)
+        await self.add_clothing(weather_data, canonical)
         return weather_data
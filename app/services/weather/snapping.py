@@ -0,0 +1,126 @@
+"""Coordinate snapping so nearby requests share cache entries
+
+The weather API's models run on grids several kilometres wide, so requests a
+few hundred metres apart get the same forecast. Snapping coordinates to a
+coarser grid (or geohash cell) before the cache and upstream lets them share
+one entry. Responses still echo the coordinates the client sent.
+"""
+
+from enum import Enum
+from typing import Tuple
+
+from app.utils.metrics import registry
+
+from .cache import requested_coordinates
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+_GEOHASH_DECODE = {char: index for index, char in enumerate(GEOHASH_ALPHABET)}
+
+COORDINATES_SNAPPED = registry.counter(
+    "weather_coordinates_snapped_total",
+    "Requests whose coordinates were moved by snapping",
+)
+
+
+class SnapMode(str, Enum):
+    """Enum for coordinate snapping policies"""
+
+    NONE = "none"
+    GRID = "grid"
+    GEOHASH = "geohash"
+
+
+def geohash_encode(latitude: float, longitude: float, precision: int) -> str:
+    """Geohash of a point with `precision` characters"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < precision:
+        coordinate, bounds = (longitude, lon_range) if even else (latitude, lat_range)
+        middle = (bounds[0] + bounds[1]) / 2
+        value <<= 1
+        if coordinate >= middle:
+            value |= 1
+            bounds[0] = middle
+        else:
+            bounds[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits = 0
+            value = 0
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """(min latitude, max latitude, min longitude, max longitude) of a cell"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    even = True
+    for char in geohash:
+        value = _GEOHASH_DECODE[char]
+        for shift in range(4, -1, -1):
+            bounds = lon_range if even else lat_range
+            middle = (bounds[0] + bounds[1]) / 2
+            if value >> shift & 1:
+                bounds[0] = middle
+            else:
+                bounds[1] = middle
+            even = not even
+    return lat_range[0], lat_range[1], lon_range[0], lon_range[1]
+
+
+class CoordinateSnapper:
+    """Canonicalizes coordinates to a grid resolution or geohash precision"""
+
+    def __init__(
+        self,
+        mode: SnapMode = SnapMode.NONE,
+        resolution: float = 0.05,
+        geohash_precision: int = 5,
+    ):
+        self.mode = SnapMode(mode)
+        self.resolution = resolution
+        self.geohash_precision = geohash_precision
+
+    def _snap_grid(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        # Rounded again to drop float noise from the multiplication
+        return (
+            round(round(latitude / self.resolution) * self.resolution, 6),
+            round(round(longitude / self.resolution) * self.resolution, 6),
+        )
+
+    def _snap_geohash(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        min_lat, max_lat, min_lon, max_lon = geohash_bounds(
+            geohash_encode(latitude, longitude, self.geohash_precision)
+        )
+        return round((min_lat + max_lat) / 2, 6), round((min_lon + max_lon) / 2, 6)
+
+    def canonical(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Canonical coordinates for a location"""
+        if self.mode == SnapMode.GRID:
+            snapped = self._snap_grid(latitude, longitude)
+        elif self.mode == SnapMode.GEOHASH:
+            snapped = self._snap_geohash(latitude, longitude)
+        else:
+            return latitude, longitude
+        return (
+            min(max(snapped[0], -90.0), 90.0),
+            min(max(snapped[1], -180.0), 180.0),
+        )
+
+    def snap(self, latitude: float, longitude: float) -> Tuple[float, float]:
+        """Canonical coordinates for the cache and upstream request
+
+        Records the original coordinates for the current request, so cache
+        hits that snapping made possible can be counted.
+        """
+        requested_coordinates.set((latitude, longitude))
+        snapped = self.canonical(latitude, longitude)
+        if snapped != (latitude, longitude):
+            COORDINATES_SNAPPED.inc()
+        return snapped
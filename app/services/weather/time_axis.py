@@ -0,0 +1,82 @@
+"""Compact time axes for weather series
+
+Hourly and daily axes are evenly spaced, so they are parsed once in bulk and
+kept as a datetime64 start, step and count. Timestamps are only produced
+when a consumer asks for them, as a whole axis at a time.
+"""
+
+from datetime import datetime
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+
+class TimeAxis:
+    """A series of local timestamps, stored as start + step * index when regular"""
+
+    __slots__ = ("start", "step", "count", "_values")
+
+    def __init__(
+        self,
+        start: Optional[np.datetime64],
+        step: Optional[np.timedelta64],
+        count: int,
+        values: Optional[np.ndarray] = None,
+    ):
+        self.start = start
+        self.step = step
+        self.count = count
+        # Only kept for irregular axes
+        self._values = values
+
+    @classmethod
+    def parse(cls, values: Sequence, unit: str = "m") -> "TimeAxis":
+        """Axis of ISO strings or datetime64 values, parsed in one pass"""
+        times = np.asarray(values, dtype=f"datetime64[{unit}]")
+        count = len(times)
+        if count == 0:
+            return cls(None, None, 0, times)
+        if count == 1:
+            return cls(times[0], np.timedelta64(0, unit), 1)
+        steps = np.diff(times)
+        if steps[0] > np.timedelta64(0, unit) and (steps == steps[0]).all():
+            return cls(times[0], steps[0], count)
+        return cls(times[0], None, count, times)
+
+    @classmethod
+    def of(cls, values) -> "TimeAxis":
+        """`values` as an axis, parsing them if they aren't one already"""
+        if isinstance(values, cls):
+            return values
+        return cls.parse(values)
+
+    @property
+    def is_regular(self) -> bool:
+        """Whether the axis is stored as start, step and count"""
+        return self._values is None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: int) -> datetime:
+        if not -self.count <= index < self.count:
+            raise IndexError("time axis index out of range")
+        if self.is_regular:
+            value = self.start + self.step * (index % self.count)
+        else:
+            value = self._values[index]
+        return value.astype("datetime64[us]").item()
+
+    def values(self) -> np.ndarray:
+        """Timestamps as a datetime64 array"""
+        if not self.is_regular:
+            return self._values
+        return self.start + self.step * np.arange(self.count)
+
+    def datetimes(self) -> List[datetime]:
+        """Timestamps as naive datetimes, converted in bulk"""
+        return self.values().astype("datetime64[us]").tolist()
+
+    def iso(self, unit: str = "m") -> List[str]:
+        """Timestamps as ISO strings, formatted in bulk"""
+        return np.datetime_as_string(self.values(), unit=unit).tolist()
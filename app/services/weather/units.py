@@ -0,0 +1,145 @@
+"""Unit selection and vectorized conversion from the canonical units
+
+The weather API is always asked for celsius, km/h and mm, so one cached
+payload per location serves every unit combination. Responses are converted
+to the requested units after the cache, a whole series at a time.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Dict, NamedTuple, Optional
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from app.schemas.units import PrecipitationUnit, TemperatureUnit, WindSpeedUnit
+from app.utils.timing import span
+
+from .models import WeatherApiResponse
+
+
+class Quantity(str, Enum):
+    """Enum for the physical quantities that have a selectable unit"""
+
+    TEMPERATURE = "temperature"
+    WIND_SPEED = "wind_speed"
+    PRECIPITATION = "precipitation"
+
+
+class Conversion(NamedTuple):
+    """Linear conversion from the canonical unit: value * scale + offset"""
+
+    scale: float
+    offset: float
+    label: str
+    decimals: int
+
+
+CONVERSIONS: Dict[Enum, Conversion] = {
+    TemperatureUnit.CELSIUS: Conversion(1.0, 0.0, "°C", 1),
+    TemperatureUnit.FAHRENHEIT: Conversion(1.8, 32.0, "°F", 1),
+    WindSpeedUnit.KMH: Conversion(1.0, 0.0, "km/h", 1),
+    WindSpeedUnit.MS: Conversion(1 / 3.6, 0.0, "m/s", 1),
+    WindSpeedUnit.MPH: Conversion(1 / 1.609344, 0.0, "mp/h", 1),
+    WindSpeedUnit.KN: Conversion(1 / 1.852, 0.0, "kn", 1),
+    PrecipitationUnit.MM: Conversion(1.0, 0.0, "mm", 2),
+    PrecipitationUnit.INCH: Conversion(1 / 25.4, 0.0, "inch", 3),
+}
+
+# Quantity of each weather API variable that has a selectable unit
+VARIABLE_QUANTITIES: Dict[str, Quantity] = {
+    "temperature_2m": Quantity.TEMPERATURE,
+    "temperature_2m_max": Quantity.TEMPERATURE,
+    "temperature_2m_min": Quantity.TEMPERATURE,
+    "apparent_temperature": Quantity.TEMPERATURE,
+    "apparent_temperature_max": Quantity.TEMPERATURE,
+    "apparent_temperature_min": Quantity.TEMPERATURE,
+    "wind_speed_10m": Quantity.WIND_SPEED,
+    "precipitation": Quantity.PRECIPITATION,
+}
+
+SECTIONS = (
+    ("current", "current_units"),
+    ("hourly", "hourly_units"),
+    ("daily", "daily_units"),
+)
+
+
+@dataclass(frozen=True)
+class UnitSelection:
+    """Units a client asked for"""
+
+    temperature: TemperatureUnit = TemperatureUnit.CELSIUS
+    wind_speed: WindSpeedUnit = WindSpeedUnit.KMH
+    precipitation: PrecipitationUnit = PrecipitationUnit.MM
+
+    @property
+    def is_canonical(self) -> bool:
+        """Whether these are the units the weather API is asked for"""
+        return self == CANONICAL_UNITS
+
+    def conversion(self, quantity: Quantity) -> Conversion:
+        """Conversion from the canonical unit of a quantity"""
+        return CONVERSIONS[getattr(self, quantity.value)]
+
+    def convert(self, values: ArrayLike, quantity: Quantity) -> np.ndarray:
+        """Canonical values in the selected unit, NaN for missing values"""
+        scale, offset, _, decimals = self.conversion(quantity)
+        converted = np.asarray(values, dtype=float) * scale + offset
+        return np.round(converted, decimals)
+
+    def to_canonical(self, values: ArrayLike, quantity: Quantity) -> np.ndarray:
+        """Values in the selected unit back in the canonical unit"""
+        scale, offset, _, _ = self.conversion(quantity)
+        return (np.asarray(values, dtype=float) - offset) / scale
+
+
+CANONICAL_UNITS = UnitSelection()
+
+
+def _convert_value(value, units: UnitSelection, quantity: Quantity):
+    if isinstance(value, np.ndarray):
+        return units.convert(value, quantity)
+    if isinstance(value, list):
+        converted = units.convert(value, quantity).tolist()
+        return [None if v != v else v for v in converted]
+    if value is None:
+        return None
+    return units.convert(value, quantity).item()
+
+
+def convert_response(
+    data: WeatherApiResponse, units: Optional[UnitSelection]
+) -> WeatherApiResponse:
+    """Copy of a canonical-unit response in the selected units
+
+    Sections are copied before converting, the cached payload is never
+    modified.
+    """
+    if units is None or units.is_canonical:
+        return data
+
+    with span("convert"):
+        return _convert_sections(data, units)
+
+
+def _convert_sections(
+    data: WeatherApiResponse, units: UnitSelection
+) -> WeatherApiResponse:
+    converted = dict(data)
+    for section, units_section in SECTIONS:
+        values = data.get(section)
+        if not values:
+            continue
+        section_values = dict(values)
+        section_units = dict(data.get(units_section) or {})
+        for variable, quantity in VARIABLE_QUANTITIES.items():
+            if variable not in section_values:
+                continue
+            section_values[variable] = _convert_value(
+                section_values[variable], units, quantity
+            )
+            section_units[variable] = units.conversion(quantity).label
+        converted[section] = section_values
+        converted[units_section] = section_units
+    return converted
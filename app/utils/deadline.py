@@ -0,0 +1,31 @@
+"""Per-request deadline shared between the HTTP layer and upstream calls"""
+
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """Point in monotonic time after which work for a request is pointless"""
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> "Deadline":
+        """Deadline the given number of seconds from now"""
+        return cls(expires_at=time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Whether the deadline has already passed"""
+        return self.remaining() <= 0.0
+
+    def earliest(self, other: Optional["Deadline"]) -> "Deadline":
+        """The sooner of this deadline and another one"""
+        if other is None or self.expires_at <= other.expires_at:
+            return self
+        return other
@@ -0,0 +1,209 @@
+"""Structured logging pipeline that keeps log I/O off the event loop
+
+On the request path a log call only filters by level, samples, resolves lazy
+fields and enqueues the event dict. Rendering to JSON and writing happen on a
+background thread. When the queue is full events are dropped and counted
+rather than blocking the request.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from typing import Any, Callable, Dict, Optional, TextIO
+
+import structlog
+
+from app.utils.metrics import registry
+
+LOG_EVENTS_DROPPED = registry.counter(
+    "log_events_dropped_total", "Log events dropped because the log queue was full"
+)
+
+
+class LazyField:
+    """Log field computed only if the event survives level filtering and sampling"""
+
+    __slots__ = ("func", "args")
+
+    def __init__(self, func: Callable[..., Any], *args: Any):
+        self.func = func
+        self.args = args
+
+    def __call__(self) -> Any:
+        return self.func(*self.args)
+
+
+def lazy(func: Callable[..., Any], *args: Any) -> LazyField:
+    """Defer building an expensive log field, e.g. `lazy(",".join, keys)`"""
+    return LazyField(func, *args)
+
+
+class EventSampler:
+    """Processor keeping only a fraction of high-volume events
+
+    `rates` maps event names to the fraction to keep. Kept events carry a
+    `sample_rate` field so counts can be scaled back up downstream.
+    """
+
+    def __init__(
+        self, rates: Dict[str, float], rand: Callable[[], float] = random.random
+    ):
+        self.rates = rates
+        self.rand = rand
+
+    def __call__(self, _logger: Any, _method_name: str, event_dict: dict) -> dict:
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1.0:
+            return event_dict
+        if self.rand() >= rate:
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+def resolve_lazy_fields(_logger: Any, _method_name: str, event_dict: dict) -> dict:
+    """Processor evaluating `LazyField` values"""
+    for key, value in event_dict.items():
+        if isinstance(value, LazyField):
+            event_dict[key] = value()
+    return event_dict
+
+
+def _render_json(event_dict: dict) -> str:
+    return json.dumps(event_dict, default=str)
+
+
+class QueueLogWriter:
+    """Background thread rendering queued events and writing them to a stream"""
+
+    def __init__(
+        self,
+        max_size: int = 10000,
+        stream: Optional[TextIO] = None,
+        render: Callable[[dict], str] = _render_json,
+    ):
+        self.queue: queue.Queue = queue.Queue(maxsize=max_size)
+        self.stream = stream
+        self.render = render
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Start the writer thread if it isn't running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="log-writer", daemon=True
+                )
+                self._thread.start()
+
+    def put(self, event_dict: dict) -> None:
+        """Enqueue an event without blocking, dropping it if the queue is full"""
+        try:
+            self.queue.put_nowait(event_dict)
+        except queue.Full:
+            LOG_EVENTS_DROPPED.inc()
+
+    def flush(self) -> None:
+        """Block until every queued event has been written"""
+        if self._thread is not None and self._thread.is_alive():
+            self.queue.join()
+
+    def _run(self) -> None:
+        while True:
+            event_dict = self.queue.get()
+            try:
+                # Resolve the stream per write so redirected stdout is honoured
+                stream = self.stream or sys.stdout
+                stream.write(self.render(event_dict) + "\n")
+                if self.queue.empty():
+                    stream.flush()
+            except Exception:  # pylint: disable=broad-except
+                # Logging must never take the writer thread down
+                pass
+            finally:
+                self.queue.task_done()
+
+
+class QueueLogger:
+    """structlog logger handing event dicts to a `QueueLogWriter`"""
+
+    def __init__(self, writer: QueueLogWriter):
+        self.writer = writer
+
+    def msg(self, **event_dict: Any) -> None:
+        """Enqueue an event"""
+        self.writer.put(event_dict)
+
+    log = debug = info = warn = warning = msg
+    err = error = critical = exception = fatal = msg
+
+
+class QueueLoggerFactory:
+    """structlog logger factory sharing one writer between all loggers"""
+
+    def __init__(self, writer: QueueLogWriter):
+        self.writer = writer
+
+    def __call__(self, *_args: Any) -> QueueLogger:
+        return QueueLogger(self.writer)
+
+
+_writer: Optional[QueueLogWriter] = None
+
+
+def configure_logging(
+    level: str = "INFO",
+    sample_rates: Optional[Dict[str, float]] = None,
+    queue_size: int = 10000,
+    async_sink: bool = True,
+    stream: Optional[TextIO] = None,
+) -> None:
+    """Configure structlog for the service
+
+    With `async_sink` events are rendered as JSON and written by a background
+    thread, otherwise synchronously on the calling thread.
+    """
+    global _writer  # pylint: disable=global-statement
+
+    processors = [
+        EventSampler(sample_rates or {}),
+        resolve_lazy_fields,
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
+        structlog.processors.format_exc_info,
+    ]
+
+    if async_sink:
+        flush_logs()
+        _writer = QueueLogWriter(max_size=queue_size, stream=stream)
+        _writer.start()
+        logger_factory = QueueLoggerFactory(_writer)
+        # The final processor hands the event dict to QueueLogger.msg as kwargs
+        processors.append(lambda _logger, _name, event_dict: event_dict)
+    else:
+        logger_factory = structlog.PrintLoggerFactory(stream or sys.stdout)
+        processors.append(structlog.processors.JSONRenderer(default=str))
+
+    structlog.configure(
+        processors=processors,
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.getLevelName(level)
+        ),
+        logger_factory=logger_factory,
+        cache_logger_on_first_use=True,
+    )
+
+
+def flush_logs() -> None:
+    """Write out queued log events, e.g. before shutdown"""
+    if _writer is not None:
+        _writer.flush()
+
+
+atexit.register(flush_logs)
@@ -0,0 +1,102 @@
+"""Per-request phase timing reported through Server-Timing, logs and metrics
+
+`ServerTimingMiddleware` starts a `RequestTimings` collector for each request.
+Code on the request path wraps its phases in `span(name)`; outside a request,
+or with the middleware disabled, `span` returns a shared no-op context.
+"""
+
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
+
+from starlette.responses import JSONResponse
+
+from app.utils.metrics import registry
+
+PHASE_DURATION = registry.histogram(
+    "http_request_phase_duration_seconds",
+    "Time spent in each phase of handling a request",
+    ("phase",),
+)
+
+_NO_SPAN = nullcontext()
+
+
+class RequestTimings:
+    """Accumulated seconds per phase for one request"""
+
+    __slots__ = ("start", "phases")
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.phases: Dict[str, float] = {}
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add time to a phase, repeated phases are summed"""
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+        PHASE_DURATION.labels(name).observe(seconds)
+
+    def elapsed(self) -> float:
+        """Seconds since the request started"""
+        return time.perf_counter() - self.start
+
+    def server_timing(self) -> str:
+        """Server-Timing header value, durations in milliseconds"""
+        entries = [
+            f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.phases.items()
+        ]
+        entries.append(f"total;dur={self.elapsed() * 1000:.2f}")
+        return ", ".join(entries)
+
+
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+class _Span:
+    __slots__ = ("timings", "name", "start")
+
+    def __init__(self, timings: RequestTimings, name: str):
+        self.timings = timings
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(self) -> "_Span":
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc_info: Any) -> None:
+        self.timings.add(self.name, time.perf_counter() - self.start)
+
+
+def span(name: str):
+    """Context manager timing a phase of the current request"""
+    timings = request_timings.get()
+    if timings is None:
+        return _NO_SPAN
+    return _Span(timings, name)
+
+
+def timed(name: str) -> Callable:
+    """Decorator timing every call of a function as the given phase"""
+
+    def decorator(func: Callable) -> Callable:
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response recording its encoding time as the `encode` phase"""
+
+    def render(self, content: Any) -> bytes:
+        with span("encode"):
+            return super().render(content)
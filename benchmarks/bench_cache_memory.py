@@ -0,0 +1,86 @@
+"""Memory per cached location, decoded JSON vs compact cache entries
+
+Decodes a 16 day current + hourly + daily payload `--locations` times, as
+the upstream client does for each cache miss, and keeps either:
+
+- json: the decoded payload, as entries were stored before
+- compact: the payload after `compact_response`, as entries are stored now
+
+Memory is the tracemalloc growth while the entries are held, divided by the
+number of locations. Payloads use `timeformat=unixtime`, as the service
+requests them.
+
+    python -m benchmarks.bench_cache_memory [--locations 500] [--days 16]
+"""
+
+import argparse
+import gc
+import json
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Callable, List
+
+from app.services.weather.compact import compact_response
+
+from .payloads import build_forecast_payload
+
+
+def _unix(iso: str) -> int:
+    moment = datetime.fromisoformat(iso).replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def build_unix_payload(days: int) -> dict:
+    """Forecast payload with unix times"""
+    payload = build_forecast_payload(days)
+    payload["current"] = {
+        **payload["current"],
+        "time": _unix(payload["current"]["time"]),
+    }
+    payload["hourly"] = {
+        **payload["hourly"],
+        "time": [_unix(t) for t in payload["hourly"]["time"]],
+    }
+    payload["daily"] = {
+        **payload["daily"],
+        **{
+            key: [_unix(t) for t in payload["daily"][key]]
+            for key in ("time", "sunrise", "sunset")
+        },
+    }
+    return payload
+
+
+def bytes_per_location(
+    body: bytes, store: Callable[[dict], object], locations: int
+) -> float:
+    """Memory held per entry when `locations` decoded payloads are kept"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entries: List[object] = [store(json.loads(body)) for _ in range(locations)]
+    gc.collect()
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del entries
+    return held / locations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--locations", type=int, default=500)
+    parser.add_argument("--days", type=int, default=16)
+    args = parser.parse_args()
+
+    body = json.dumps(build_unix_payload(args.days)).encode()
+    before = bytes_per_location(body, lambda data: data, args.locations)
+    after = bytes_per_location(body, compact_response, args.locations)
+
+    print(f"{'':10}{'bytes/location':>16}")
+    print(f"{'json':10}{before:16,.0f}")
+    print(f"{'compact':10}{after:16,.0f}")
+    print(f"reduction: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
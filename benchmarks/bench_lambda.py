@@ -0,0 +1,291 @@
+"""Benchmark of the Lambda entrypoint with synthetic API Gateway events
+
+Calls `app.main.handler` in-process with API Gateway REST (v1) and HTTP API
+(v2) events for the weather routes. The upstream is the fake Open-Meteo app
+from `benchmarks.loadtest`, mounted through an in-process ASGI transport, so
+no network is used. Measures:
+
+- cold import: `import app.main` in a fresh interpreter
+- first invocation: the first handler call after the cold import
+- warm invocations: latency percentiles per event version, with upstream
+  data cached but the response cache and mapped views off, so mapping,
+  classification and validation run on every call
+- upstream misses: invocations for locations not fetched yet
+- response cache hits: repeated requests served from encoded responses
+- memory growth per invocation over `--invocations` calls (tracemalloc)
+
+    python -m benchmarks.bench_lambda [--cold-runs 5] [--invocations 2000]
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+from urllib.parse import urlencode
+
+ROUTES = ("/api/v1/weather/current", "/api/v1/weather/hourly")
+STAGE = "prod"
+
+# Quiet logs so they don't interleave with the report, set before the app loads
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+class FakeLambdaContext:
+    """Minimal Lambda context object"""
+
+    function_name = "weather-classification"
+    memory_limit_in_mb = 512
+    invoked_function_arn = (
+        "arn:aws:lambda:eu-west-2:000000000000:function:weather-classification"
+    )
+
+    def __init__(self, timeout_ms: int = 30000):
+        self.aws_request_id = f"{random.getrandbits(64):016x}"
+        self._deadline = time.monotonic() + timeout_ms / 1000
+
+    def get_remaining_time_in_millis(self) -> int:
+        """Time left before Lambda would time out the invocation"""
+        return max(0, int((self._deadline - time.monotonic()) * 1000))
+
+
+def _headers() -> Dict[str, str]:
+    return {
+        "accept": "application/json",
+        "host": "abc123.execute-api.eu-west-2.amazonaws.com",
+        "x-forwarded-proto": "https",
+        "x-forwarded-port": "443",
+    }
+
+
+def api_gateway_v1_event(path: str, query: Dict[str, str]) -> dict:
+    """REST API (payload format 1.0) proxy event"""
+    return {
+        "resource": "/{proxy+}",
+        "path": path,
+        "httpMethod": "GET",
+        "headers": _headers(),
+        "multiValueHeaders": {key: [value] for key, value in _headers().items()},
+        "queryStringParameters": query,
+        "multiValueQueryStringParameters": {
+            key: [value] for key, value in query.items()
+        },
+        "pathParameters": {"proxy": path.lstrip("/")},
+        "stageVariables": None,
+        "requestContext": {
+            "resourcePath": "/{proxy+}",
+            "httpMethod": "GET",
+            "path": f"/{STAGE}{path}",
+            "stage": STAGE,
+            "requestId": f"{random.getrandbits(64):016x}",
+            "identity": {"sourceIp": "203.0.113.10"},
+        },
+        "body": None,
+        "isBase64Encoded": False,
+    }
+
+
+def api_gateway_v2_event(path: str, query: Dict[str, str]) -> dict:
+    """HTTP API (payload format 2.0) event"""
+    raw_path = f"/{STAGE}{path}"
+    return {
+        "version": "2.0",
+        "routeKey": "$default",
+        "rawPath": raw_path,
+        "rawQueryString": urlencode(query),
+        "headers": _headers(),
+        "queryStringParameters": query,
+        "requestContext": {
+            "http": {
+                "method": "GET",
+                "path": raw_path,
+                "protocol": "HTTP/1.1",
+                "sourceIp": "203.0.113.10",
+                "userAgent": "bench",
+            },
+            "stage": STAGE,
+            "requestId": f"{random.getrandbits(64):016x}",
+        },
+        "isBase64Encoded": False,
+    }
+
+
+EVENT_BUILDERS: Dict[str, Callable[[str, Dict[str, str]], dict]] = {
+    "v1": api_gateway_v1_event,
+    "v2": api_gateway_v2_event,
+}
+
+
+def build_events(count: int, locations: int, seed: int) -> List[tuple]:
+    """(version, event) pairs over a fixed set of locations and both routes"""
+    rand = random.Random(seed)
+    points = [
+        (round(rand.uniform(-60, 70), 4), round(rand.uniform(-180, 180), 4))
+        for _ in range(locations)
+    ]
+    events = []
+    for i in range(count):
+        version = "v1" if i % 2 == 0 else "v2"
+        latitude, longitude = rand.choice(points)
+        query = {"latitude": str(latitude), "longitude": str(longitude)}
+        events.append((version, EVENT_BUILDERS[version](rand.choice(ROUTES), query)))
+    return events
+
+
+def load_handler(upstream_latency_ms: float) -> Callable:
+    """Import the app and point its weather client at the in-process fake"""
+    import httpx  # pylint: disable=import-outside-toplevel
+
+    from app.main import handler  # pylint: disable=import-outside-toplevel
+    from app.routers.v1.weather_router import (  # pylint: disable=import-outside-toplevel
+        weather_service,
+    )
+    from benchmarks.loadtest.fake_upstream import (  # pylint: disable=import-outside-toplevel
+        UpstreamConfig,
+        create_app,
+    )
+
+    upstream = create_app(
+        UpstreamConfig(latency_ms=upstream_latency_ms, latency_sigma=0, seed=1)
+    )
+    weather_service.api_client.base_url = "http://fake-upstream"
+    weather_service.api_client.transport = httpx.ASGITransport(app=upstream)
+    return handler
+
+
+def invoke(handler: Callable, event: dict) -> float:
+    """Call the handler once, returning its latency in seconds"""
+    start = time.perf_counter()
+    response = handler(event, FakeLambdaContext())
+    elapsed = time.perf_counter() - start
+    if response["statusCode"] != 200:
+        raise RuntimeError(f"Unexpected response: {response['statusCode']}")
+    return elapsed
+
+
+def cold_start(upstream_latency_ms: float) -> None:
+    """Measure import and first invocation, run in a fresh interpreter"""
+    start = time.perf_counter()
+    import app.main  # pylint: disable=import-outside-toplevel,unused-import
+
+    import_seconds = time.perf_counter() - start
+
+    handler = load_handler(upstream_latency_ms)
+    first_seconds = invoke(handler, build_events(1, 1, seed=0)[0][1])
+    print(json.dumps({"import": import_seconds, "first_invocation": first_seconds}))
+
+
+def _percentiles(values: List[float]) -> str:
+    values = sorted(values)
+    p50 = values[len(values) // 2]
+    p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+    return f"p50 {p50 * 1000:7.2f} ms  p99 {p99 * 1000:7.2f} ms"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cold-runs", type=int, default=5)
+    parser.add_argument("--invocations", type=int, default=2000)
+    parser.add_argument("--locations", type=int, default=50)
+    parser.add_argument("--misses", type=int, default=200)
+    parser.add_argument("--upstream-latency-ms", type=float, default=20.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cold", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.cold:
+        cold_start(args.upstream_latency_ms)
+        return
+
+    cold_runs = []
+    for _ in range(args.cold_runs):
+        output = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "benchmarks.bench_lambda",
+                "--cold",
+                f"--upstream-latency-ms={args.upstream_latency_ms}",
+            ],
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        cold_runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    handler = load_handler(args.upstream_latency_ms)
+    from app.routers.v1.weather_router import (  # pylint: disable=import-outside-toplevel
+        response_cache,
+        weather_service,
+    )
+
+    max_entries = response_cache.max_entries
+    max_mapped_views = weather_service.max_mapped_views
+    # Every warm call runs the service path, not a cached response or view
+    response_cache.max_entries = 0
+    weather_service.max_mapped_views = 0
+
+    # Warm up so the cache holds most locations, as on a long-lived instance
+    for _, event in build_events(args.locations * 4, args.locations, args.seed):
+        invoke(handler, event)
+
+    latencies: Dict[str, List[float]] = {"v1": [], "v2": []}
+    for version, event in build_events(args.invocations, args.locations, args.seed):
+        latencies[version].append(invoke(handler, event))
+
+    # One location each, none of them seen before
+    misses = [
+        invoke(handler, build_events(1, 1, seed=args.seed + 1 + i)[0][1])
+        for i in range(args.misses)
+    ]
+
+    response_cache.max_entries = max_entries
+    weather_service.max_mapped_views = max_mapped_views
+    hit_events = build_events(args.invocations, args.locations, args.seed)
+    for _, event in hit_events:
+        invoke(handler, event)
+    hits = [invoke(handler, event) for _, event in hit_events]
+
+    # Same locations as the warm up, so growth means a leak rather than new entries
+    memory_events = build_events(args.invocations, args.locations, args.seed)
+    gc.collect()
+    tracemalloc.start(10)
+    before = tracemalloc.take_snapshot()
+    traced_before = tracemalloc.get_traced_memory()[0]
+    for _, event in memory_events:
+        invoke(handler, event)
+    gc.collect()
+    traced_after = tracemalloc.get_traced_memory()[0]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    cold_import = statistics.median(run["import"] for run in cold_runs)
+    first_invocation = statistics.median(run["first_invocation"] for run in cold_runs)
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    print(f"cold import            median {cold_import * 1000:8.1f} ms")
+    print(f"first invocation       median {first_invocation * 1000:8.1f} ms")
+    for version, values in latencies.items():
+        print(f"warm invocation ({version})  {_percentiles(values)}  n={len(values)}")
+    print(f"upstream miss          {_percentiles(misses)}  n={len(misses)}")
+    print(f"response cache hit     {_percentiles(hits)}  n={len(hits)}")
+    growth = traced_after - traced_before
+    print(
+        f"memory growth          {growth / 1024:8.1f} KiB over {len(memory_events)} "
+        f"invocations ({growth / len(memory_events):.0f} B/invocation)"
+    )
+    print(f"max RSS                {max_rss:8.1f} MiB")
+    print("top allocation growth:")
+    for stat in after.compare_to(before, "lineno")[:5]:
+        print(f"  {stat}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Logging cost per cached /v1/weather/current request, before and after
+
+Replays the log calls a cache-hit request makes (router, service, client and
+cache, for both the current and daily lookups) against:
+
+- before: structlog's default synchronous console logger, the eagerly joined
+  cache keys and the `print()` calls the client used to make
+- after: the service pipeline from `app.utils.logging` with its default
+  sampling rates and the background writer
+
+Output goes to /dev/null so only the logging overhead is measured. The
+"flushed" figure also waits for the writer thread, i.e. total CPU spent.
+
+    python -m benchmarks.bench_logging [--requests 20000]
+"""
+
+import argparse
+import contextlib
+import os
+import time
+
+import structlog
+
+from app.config import settings
+from app.utils.logging import configure_logging, flush_logs, lazy
+
+CACHE_KEYS = [3, "current", "hourly", "daily"]
+PARAMS = {
+    "latitude": 51.5,
+    "longitude": -0.12,
+    "wind_speed_unit": "kmh",
+    "timezone": "auto",
+    "forecast_days": 3,
+}
+
+
+def _join_keys(cache_keys: list) -> str:
+    return "".join(str(x) for x in cache_keys)
+
+
+def request_before(logger) -> None:
+    """Log calls of a cache-hit request before the logging pipeline"""
+    logger.info("Requesting current weather...")
+    for _ in range(2):
+        logger.info("Fetching current weather data", latitude=51.5, longitude=-0.12)
+        logger.info("Fetching weather data", params=PARAMS)
+        logger.info("Cache hit", cache_keys=_join_keys(CACHE_KEYS))
+        print("----------- Using cached weather data")
+    logger.info("Requested current weather")
+
+
+def request_after(logger) -> None:
+    """Log calls of a cache-hit request with the logging pipeline"""
+    logger.info("Requesting current weather...")
+    for _ in range(2):
+        logger.info("Fetching current weather data", latitude=51.5, longitude=-0.12)
+        logger.info("Fetching weather data", params=PARAMS)
+        logger.info("Cache hit", cache_keys=lazy(_join_keys, CACHE_KEYS))
+    logger.info("Requested current weather")
+
+
+def run(request, requests: int, flush=None) -> tuple:
+    """Microseconds per request on the calling thread, and once flushed"""
+    logger = structlog.get_logger()
+    for _ in range(min(requests, 1000)):
+        request(logger)
+    if flush:
+        flush()
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        request(logger)
+    hot_path = time.perf_counter() - start
+    if flush:
+        flush()
+    flushed = time.perf_counter() - start
+    return hot_path / requests * 1e6, flushed / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        with contextlib.redirect_stdout(devnull):
+            structlog.reset_defaults()
+            structlog.configure(
+                logger_factory=structlog.PrintLoggerFactory(devnull),
+                cache_logger_on_first_use=True,
+            )
+            before = run(request_before, args.requests)
+
+            configure_logging(
+                level=settings.log_level,
+                sample_rates=settings.log_sample_rates,
+                queue_size=args.requests * 8,
+                stream=devnull,
+            )
+            after = run(request_after, args.requests, flush=flush_logs)
+
+    print(f"{'':8}{'hot path us/req':>18}{'flushed us/req':>18}")
+    print(f"{'before':8}{before[0]:18.1f}{before[1]:18.1f}")
+    print(f"{'after':8}{after[0]:18.1f}{after[1]:18.1f}")
+    print(f"hot path speedup: {before[0] / after[0]:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""Compare two pytest-benchmark JSON results and flag regressions
+
+    python -m benchmarks.compare \\
+        benchmarks/baselines/Linux-CPython-3.11-64bit/0001_main.json current.json \\
+        [--stat min] [--threshold 30]
+
+Exits with status 1 when any benchmark got slower than the baseline by more
+than `--threshold` percent.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict
+
+
+def load_stats(path: str, stat: str) -> Dict[str, float]:
+    """Benchmark name to the chosen statistic, in seconds"""
+    with open(path, encoding="utf-8") as file:
+        results = json.load(file)
+    return {bench["fullname"]: bench["stats"][stat] for bench in results["benchmarks"]}
+
+
+def compare(
+    baseline: Dict[str, float], current: Dict[str, float], threshold: float
+) -> list:
+    """Rows of (name, baseline, current, change %, regressed)"""
+    rows = []
+    for name in sorted(baseline.keys() | current.keys()):
+        before, after = baseline.get(name), current.get(name)
+        if before is None or after is None:
+            rows.append((name, before, after, None, False))
+            continue
+        change = (after - before) / before * 100
+        rows.append((name, before, after, change, change > threshold))
+    return rows
+
+
+def _format_us(seconds) -> str:
+    return "-" if seconds is None else f"{seconds * 1e6:,.1f}"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("baseline", help="pytest-benchmark JSON to compare against")
+    parser.add_argument("current", help="pytest-benchmark JSON of the new run")
+    parser.add_argument("--stat", default="median", choices=["min", "mean", "median"])
+    parser.add_argument(
+        "--threshold", type=float, default=10.0, help="Allowed slowdown in percent"
+    )
+    args = parser.parse_args()
+
+    rows = compare(
+        load_stats(args.baseline, args.stat),
+        load_stats(args.current, args.stat),
+        args.threshold,
+    )
+
+    width = max(len(row[0]) for row in rows)
+    print(f"{'benchmark':{width}}  {'baseline us':>14}  {'current us':>14}  change")
+    for name, before, after, change, regressed in rows:
+        change_text = "new/removed" if change is None else f"{change:+.1f}%"
+        flag = "  REGRESSION" if regressed else ""
+        print(
+            f"{name:{width}}  {_format_us(before):>14}  {_format_us(after):>14}  "
+            f"{change_text}{flag}"
+        )
+
+    regressions = sum(1 for row in rows if row[4])
+    if regressions:
+        print(f"\n{regressions} benchmark(s) regressed more than {args.threshold}%")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,44 @@
+"""Fixtures for the benchmark suite"""
+
+import os
+
+import pytest
+
+from app.config import settings
+from app.utils.logging import configure_logging, flush_logs
+
+from .payloads import build_daily_payload, build_forecast_payload, build_hourly_payload
+
+FORECAST_DAYS = 16
+
+
+@pytest.fixture(autouse=True, scope="session")
+def fixture_logging():
+    """Log as the service does, discarding the output"""
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        configure_logging(
+            level=settings.log_level,
+            sample_rates=settings.log_sample_rates,
+            queue_size=settings.log_queue_size,
+            stream=devnull,
+        )
+        yield
+        flush_logs()
+
+
+@pytest.fixture(name="daily_payload", scope="session")
+def fixture_daily_payload():
+    """16 day daily payload"""
+    return build_daily_payload(FORECAST_DAYS)
+
+
+@pytest.fixture(name="hourly_payload", scope="session")
+def fixture_hourly_payload():
+    """16 day hourly payload"""
+    return build_hourly_payload(FORECAST_DAYS)
+
+
+@pytest.fixture(name="forecast_payload", scope="session")
+def fixture_forecast_payload():
+    """16 day combined payload"""
+    return build_forecast_payload(FORECAST_DAYS)
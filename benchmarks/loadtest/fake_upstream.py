@@ -0,0 +1,136 @@
+"""Local stand-in for the Open-Meteo forecast API
+
+Serves `/forecast` with synthetic payloads shaped by the request's `current`,
+`hourly`, `daily` and `forecast_days` parameters, after a latency drawn from a
+log-normal distribution. A configurable fraction of requests fails with 500
+or is rate limited with 429 and a Retry-After header.
+
+    python -m benchmarks.loadtest.fake_upstream --port 9000 \\
+        --latency-ms 80 --latency-sigma 0.5 --error-rate 0.01 --rate-limit-rate 0
+"""
+
+import argparse
+import asyncio
+import json
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+from fastapi import FastAPI, Request, Response
+
+from benchmarks.payloads import (
+    build_current_payload,
+    build_daily_payload,
+    build_hourly_payload,
+)
+
+
+@dataclass
+class UpstreamConfig:
+    """Behaviour of the fake upstream"""
+
+    # Median latency, and the sigma of the log-normal around it (0 is fixed)
+    latency_ms: float = 80.0
+    latency_sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after_seconds: int = 1
+    seed: Optional[int] = None
+
+
+@dataclass
+class UpstreamStats:
+    """Requests seen by the fake upstream"""
+
+    requests: int = 0
+    statuses: Counter = field(default_factory=Counter)
+
+
+@lru_cache(maxsize=32)
+def _payload_template(days: int, sections: frozenset) -> dict:
+    payload = {}
+    if "current" in sections:
+        payload.update(build_current_payload())
+    if "daily" in sections:
+        payload.update(build_daily_payload(days))
+    if "hourly" in sections:
+        payload.update(build_hourly_payload(days))
+    return payload
+
+
+def create_app(config: UpstreamConfig) -> FastAPI:
+    """Fake upstream app with its own stats"""
+    app = FastAPI()
+    stats = UpstreamStats()
+    rand = random.Random(config.seed)
+
+    @app.get("/forecast")
+    async def forecast(request: Request) -> Response:
+        stats.requests += 1
+        latency = config.latency_ms / 1000
+        if config.latency_sigma:
+            latency *= rand.lognormvariate(0, config.latency_sigma)
+        await asyncio.sleep(latency)
+
+        roll = rand.random()
+        if roll < config.rate_limit_rate:
+            stats.statuses[429] += 1
+            return Response(
+                status_code=429,
+                headers={"Retry-After": str(config.retry_after_seconds)},
+            )
+        if roll < config.rate_limit_rate + config.error_rate:
+            stats.statuses[500] += 1
+            return Response(status_code=500)
+
+        params = request.query_params
+        sections = frozenset(
+            section for section in ("current", "hourly", "daily") if section in params
+        )
+        payload = {
+            **_payload_template(int(params.get("forecast_days", 7)), sections),
+            "latitude": float(params.get("latitude", 0)),
+            "longitude": float(params.get("longitude", 0)),
+        }
+        stats.statuses[200] += 1
+        return Response(json.dumps(payload), media_type="application/json")
+
+    @app.get("/stats")
+    async def get_stats() -> dict:
+        return {
+            "requests": stats.requests,
+            "statuses": {str(code): count for code, count in stats.statuses.items()},
+        }
+
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    import uvicorn  # pylint: disable=import-outside-toplevel
+
+    config = UpstreamConfig(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after_seconds=args.retry_after,
+        seed=args.seed,
+    )
+    uvicorn.run(create_app(config), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
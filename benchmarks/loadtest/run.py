@@ -0,0 +1,293 @@
+"""End-to-end load test of the app against the local fake upstream
+
+For each scenario a fresh fake upstream and a fresh app (uvicorn, with
+WEATHER_API_BASE_URL pointing at the fake) are started on localhost, then
+driven with concurrent requests. Everything runs offline on one machine.
+
+Scenarios:
+
+- hot-key: every request asks for the same location
+- uniform-random: every request asks for a random location
+- batch: bursts of `--batch-size` distinct locations, the same set each burst
+
+    python -m benchmarks.loadtest.run --scenario hot-key --requests 2000 \\
+        --concurrency 50 --latency-ms 80 --app-env WEATHER_API_MAX_CONCURRENCY=20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import socket
+import subprocess
+import sys
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+SCENARIOS = ("hot-key", "uniform-random", "batch")
+HOT_KEY = (51.5074, -0.1278)
+
+Location = Tuple[float, float]
+
+
+@dataclass
+class ScenarioResult:
+    """Measurements for one scenario"""
+
+    scenario: str
+    requests: int
+    duration_seconds: float
+    throughput_rps: float
+    p50_ms: float
+    p90_ms: float
+    p99_ms: float
+    max_ms: float
+    statuses: Dict[str, int]
+    upstream_requests: int
+    upstream_statuses: Dict[str, int]
+    cache_hit_ratio: Optional[float]
+
+
+def free_port() -> int:
+    """An unused localhost port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return 0.0
+    index = min(
+        len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1)
+    )
+    return sorted_values[index]
+
+
+def random_location(rand: random.Random) -> Location:
+    """Random location on land-ish latitudes"""
+    return round(rand.uniform(-60, 70), 4), round(rand.uniform(-180, 180), 4)
+
+
+def scenario_batches(
+    scenario: str, requests: int, batch_size: int, rand: random.Random
+) -> Iterator[List[Location]]:
+    """Locations to request, grouped into batches sent concurrently
+
+    hot-key and uniform-random yield one batch holding every request, which
+    the driver spreads over its concurrency limit.
+    """
+    if scenario == "hot-key":
+        yield [HOT_KEY] * requests
+    elif scenario == "uniform-random":
+        yield [random_location(rand) for _ in range(requests)]
+    else:
+        pool = [random_location(rand) for _ in range(batch_size)]
+        for start in range(0, requests, batch_size):
+            yield pool[: min(batch_size, requests - start)]
+
+
+def parse_cache_hit_ratio(metrics_text: str) -> Optional[float]:
+    """Hit ratio from the app's weather_cache_requests_total counters"""
+    counts = {
+        result: float(value)
+        for result, value in re.findall(
+            r'weather_cache_requests_total\{result="(\w+)"\} ([\d.e+]+)', metrics_text
+        )
+    }
+    total = counts.get("hit", 0.0) + counts.get("miss", 0.0)
+    return counts.get("hit", 0.0) / total if total else None
+
+
+def start_process(
+    args: List[str], env: Optional[Dict[str, str]] = None, show_output: bool = False
+):
+    """Start a Python module in a subprocess"""
+    output = None if show_output else subprocess.DEVNULL
+    return subprocess.Popen(  # pylint: disable=consider-using-with
+        [sys.executable, "-m", *args],
+        env={**os.environ, **(env or {})},
+        stdout=output,
+        stderr=output,
+    )
+
+
+async def wait_ready(client: httpx.AsyncClient, url: str, timeout: float = 20.0):
+    """Poll a URL until it answers"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            await client.get(url)
+            return
+        except httpx.TransportError:
+            if time.monotonic() > deadline:
+                raise
+            await asyncio.sleep(0.1)
+
+
+async def drive(
+    client: httpx.AsyncClient,
+    url: str,
+    batches: Iterator[List[Location]],
+    concurrency: int,
+) -> Tuple[List[float], Counter, float]:
+    """Send every request, returning latencies, status counts and duration"""
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def request(location: Location) -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                response = await client.get(
+                    url, params={"latitude": location[0], "longitude": location[1]}
+                )
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for batch in batches:
+        await asyncio.gather(*(request(location) for location in batch))
+    return latencies, statuses, time.perf_counter() - start
+
+
+async def run_scenario(scenario: str, args: argparse.Namespace) -> ScenarioResult:
+    """Start the fake upstream and the app, then load them"""
+    upstream_port, app_port = free_port(), free_port()
+    upstream = start_process(
+        [
+            "benchmarks.loadtest.fake_upstream",
+            f"--port={upstream_port}",
+            f"--latency-ms={args.latency_ms}",
+            f"--latency-sigma={args.latency_sigma}",
+            f"--error-rate={args.error_rate}",
+            f"--rate-limit-rate={args.rate_limit_rate}",
+            f"--seed={args.seed}",
+        ],
+        show_output=args.show_logs,
+    )
+    app_env = {
+        "WEATHER_API_BASE_URL": f"http://127.0.0.1:{upstream_port}",
+        "LOG_LEVEL": "WARNING",
+        **dict(item.split("=", 1) for item in args.app_env),
+    }
+    app = start_process(
+        [
+            "uvicorn",
+            "app.main:app",
+            f"--port={app_port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        env=app_env,
+        show_output=args.show_logs,
+    )
+    base_url = f"http://127.0.0.1:{app_port}/prod/api"
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    try:
+        async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+            await wait_ready(client, f"http://127.0.0.1:{upstream_port}/stats")
+            await wait_ready(client, f"{base_url}/hello")
+
+            batches = scenario_batches(
+                scenario, args.requests, args.batch_size, random.Random(args.seed)
+            )
+            latencies, statuses, duration = await drive(
+                client,
+                f"{base_url}/v1/weather/{args.endpoint}",
+                batches,
+                args.concurrency,
+            )
+
+            upstream_stats = (
+                await client.get(f"http://127.0.0.1:{upstream_port}/stats")
+            ).json()
+            metrics_text = (await client.get(f"{base_url}/metrics")).text
+    finally:
+        for process in (app, upstream):
+            process.terminate()
+            process.wait()
+
+    latencies.sort()
+    return ScenarioResult(
+        scenario=scenario,
+        requests=len(latencies),
+        duration_seconds=round(duration, 3),
+        throughput_rps=round(len(latencies) / duration, 1),
+        p50_ms=round(percentile(latencies, 50) * 1000, 2),
+        p90_ms=round(percentile(latencies, 90) * 1000, 2),
+        p99_ms=round(percentile(latencies, 99) * 1000, 2),
+        max_ms=round(latencies[-1] * 1000, 2),
+        statuses=dict(statuses),
+        upstream_requests=upstream_stats["requests"],
+        upstream_statuses=upstream_stats["statuses"],
+        cache_hit_ratio=parse_cache_hit_ratio(metrics_text),
+    )
+
+
+def print_results(results: List[ScenarioResult]) -> None:
+    """Results as a table"""
+    print(
+        f"{'scenario':16}{'reqs':>7}{'rps':>9}{'p50 ms':>9}{'p90 ms':>9}"
+        f"{'p99 ms':>9}{'max ms':>9}{'upstream':>10}{'hit %':>8}  statuses"
+    )
+    for result in results:
+        hit_ratio = (
+            "-" if result.cache_hit_ratio is None else f"{result.cache_hit_ratio:.1%}"
+        )
+        print(
+            f"{result.scenario:16}{result.requests:>7}{result.throughput_rps:>9}"
+            f"{result.p50_ms:>9}{result.p90_ms:>9}{result.p99_ms:>9}"
+            f"{result.max_ms:>9}{result.upstream_requests:>10}{hit_ratio:>8}"
+            f"  {result.statuses} upstream {result.upstream_statuses}"
+        )
+
+
+async def main_async(args: argparse.Namespace) -> None:
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    results = [await run_scenario(scenario, args) for scenario in scenarios]
+    print_results(results)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=(*SCENARIOS, "all"), default="all")
+    parser.add_argument("--endpoint", choices=("current", "hourly"), default="current")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument(
+        "--app-env",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="Setting override for the app, e.g. WEATHER_API_RATE_LIMIT_PER_SECOND=50",
+    )
+    parser.add_argument("--json", help="Also write results to this JSON file")
+    parser.add_argument(
+        "--show-logs", action="store_true", help="Show app and fake upstream output"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
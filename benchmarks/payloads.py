@@ -0,0 +1,69 @@
+"""Synthetic Open-Meteo payloads scaled up from the test mocks
+
+Series values cycle through the mock values so the shape, units and value
+types match what the mappers see in tests, just over a longer horizon.
+"""
+
+from datetime import date, datetime, timedelta
+from itertools import cycle, islice
+
+from tests.mocks.weather_data_mocks import (
+    mock_base_api_response_data,
+    mock_current_weather_api_response_data,
+    mock_daily_weather_api_response_data,
+    mock_hourly_weather_api_response_data,
+)
+
+START = datetime(2024, 9, 9)
+
+
+def _scaled_series(series: dict, length: int, times: list) -> dict:
+    scaled = {
+        key: list(islice(cycle(values), length))
+        for key, values in series.items()
+        if key != "time"
+    }
+    return {"time": times, **scaled}
+
+
+def build_current_payload() -> dict:
+    """Current conditions payload"""
+    return {**mock_base_api_response_data, **mock_current_weather_api_response_data}
+
+
+def build_daily_payload(days: int = 16) -> dict:
+    """Daily payload covering `days` days"""
+    start = date(2024, 9, 9)
+    times = [(start + timedelta(days=i)).isoformat() for i in range(days)]
+    daily = _scaled_series(mock_daily_weather_api_response_data["daily"], days, times)
+    daily["sunrise"] = [f"{day}T05:26" for day in times]
+    daily["sunset"] = [f"{day}T18:29" for day in times]
+    return {
+        **mock_base_api_response_data,
+        "daily_units": mock_daily_weather_api_response_data["daily_units"],
+        "daily": daily,
+    }
+
+
+def build_hourly_payload(days: int = 16) -> dict:
+    """Hourly payload covering `days` days"""
+    hours = days * 24
+    times = [
+        (START + timedelta(hours=i)).strftime("%Y-%m-%dT%H:%M") for i in range(hours)
+    ]
+    return {
+        **mock_base_api_response_data,
+        "hourly_units": mock_hourly_weather_api_response_data["hourly_units"],
+        "hourly": _scaled_series(
+            mock_hourly_weather_api_response_data["hourly"], hours, times
+        ),
+    }
+
+
+def build_forecast_payload(days: int = 16) -> dict:
+    """Combined current, daily and hourly payload as the service requests it"""
+    return {
+        **build_current_payload(),
+        **build_daily_payload(days),
+        **build_hourly_payload(days),
+    }
@@ -0,0 +1,51 @@
+"""Benchmarks for WeatherCache lookups and inserts at several occupancy levels"""
+
+import pytest
+
+from app.services.weather.cache import WeatherCache
+
+CACHE_KEYS = [16, "current", "hourly", "daily"]
+OCCUPANCY = [1, 100, 1000]
+
+
+def build_cache(entries: int, payload: dict) -> WeatherCache:
+    """Cache holding `entries` locations roughly 1km apart"""
+    cache = WeatherCache(cache_duration_minutes=10, max_stale_minutes=60)
+    for i in range(entries):
+        cache.set(CACHE_KEYS, payload, latitude=40 + i * 0.01, longitude=-3.0)
+    return cache
+
+
+def last_latitude(entries: int) -> float:
+    """Latitude of the most recently cached location"""
+    return 40 + (entries - 1) * 0.01
+
+
+@pytest.mark.parametrize("entries", OCCUPANCY)
+def test_cache_get_hit(benchmark, forecast_payload, entries):
+    """Hit on the most recently cached location"""
+    cache = build_cache(entries, forecast_payload)
+
+    result = benchmark(cache.get, CACHE_KEYS, last_latitude(entries), -3.0)
+
+    assert result is forecast_payload
+
+
+@pytest.mark.parametrize("entries", OCCUPANCY)
+def test_cache_get_miss(benchmark, forecast_payload, entries):
+    """Miss for a location that isn't cached"""
+    cache = build_cache(entries, forecast_payload)
+
+    result = benchmark(cache.get, CACHE_KEYS, -40.0, 100.0)
+
+    assert result is None
+
+
+@pytest.mark.parametrize("entries", OCCUPANCY)
+def test_cache_set(benchmark, forecast_payload, entries):
+    """Replacing an existing location's entry"""
+    cache = build_cache(entries, forecast_payload)
+
+    benchmark(cache.set, CACHE_KEYS, forecast_payload, last_latitude(entries), -3.0)
+
+    assert len(cache.store) == entries
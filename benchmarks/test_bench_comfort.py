@@ -0,0 +1,68 @@
+"""Benchmarks for the comfort index engine against a per-hour Python loop"""
+
+import numpy as np
+import pytest
+
+from app.models.weather_conditions import WeatherClassificationFields
+from app.services.classification.comfort_calculator import (
+    DEFAULT_COMFORT_PROFILE,
+    ComfortIndexCalculator,
+)
+
+HOURS = 16 * 24
+
+
+def comfort_index_loop(series: dict) -> list:
+    """Reference implementation scoring one hour and field at a time"""
+    composite = []
+    for hour in range(HOURS):
+        weighted, total_weight = 0.0, 0.0
+        for field, comfort_range in DEFAULT_COMFORT_PROFILE.items():
+            value = series[field][hour]
+            if value is None:
+                continue
+            if value < comfort_range.ideal_min:
+                distance = comfort_range.ideal_min - value
+            elif value > comfort_range.ideal_max:
+                distance = value - comfort_range.ideal_max
+            else:
+                distance = 0.0
+            score = min(1.0, max(0.0, 1.0 - distance / comfort_range.tolerance))
+            weighted += score * comfort_range.weight
+            total_weight += comfort_range.weight
+        composite.append(weighted / total_weight if total_weight else None)
+    return composite
+
+
+@pytest.fixture(name="comfort_series", scope="module")
+def fixture_comfort_series():
+    """16 days of random hourly values per field"""
+    rand = np.random.default_rng(1)
+    scales = {
+        WeatherClassificationFields.TEMPERATURE: (-5, 35),
+        WeatherClassificationFields.APPARENT_TEMPERATURE: (-10, 38),
+        WeatherClassificationFields.HUMIDITY: (10, 100),
+        WeatherClassificationFields.WIND_SPEED: (0, 60),
+        WeatherClassificationFields.PRECIPITATION: (0, 6),
+        WeatherClassificationFields.PRECIPITATION_PROBABILITY: (0, 100),
+        WeatherClassificationFields.CLOUD_COVER: (0, 100),
+        WeatherClassificationFields.UV_INDEX: (0, 10),
+    }
+    return {
+        field: rand.uniform(low, high, HOURS).tolist()
+        for field, (low, high) in scales.items()
+    }
+
+
+def test_comfort_vectorized(benchmark, comfort_series):
+    """All fields and hours in one pass"""
+    calculator = ComfortIndexCalculator()
+
+    scores = benchmark(calculator.score_series, comfort_series)
+
+    np.testing.assert_allclose(scores.composite, comfort_index_loop(comfort_series))
+
+
+def test_comfort_python_loop(benchmark, comfort_series):
+    """Per-hour, per-field Python loop"""
+    benchmark(comfort_index_loop, comfort_series)
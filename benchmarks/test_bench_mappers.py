@@ -0,0 +1,59 @@
+"""Benchmarks for the weather mappers and metric transformers"""
+
+from app.services.weather.mappers import (
+    map_current_weather,
+    map_daily_weather,
+    map_hourly_weather,
+)
+from app.services.weather.time_axis import TimeAxis
+from app.utils.metric_transformers import transform_maps_to_metric_range
+
+from .payloads import build_current_payload
+
+
+def test_map_current_weather(benchmark):
+    """Current conditions"""
+    payload = build_current_payload()
+
+    benchmark(map_current_weather, payload)
+
+
+def test_map_daily_weather(benchmark, daily_payload):
+    """16 daily forecasts"""
+    result = benchmark(map_daily_weather, daily_payload)
+
+    assert len(result) == 16
+
+
+def test_map_hourly_weather(benchmark, hourly_payload):
+    """384 hourly forecasts"""
+    result = benchmark(map_hourly_weather, hourly_payload)
+
+    assert len(result) == 384
+
+
+def test_parse_hourly_time_axis(benchmark, hourly_payload):
+    """384 hourly timestamps to datetimes"""
+    times = hourly_payload["hourly"]["time"]
+
+    result = benchmark(lambda: TimeAxis.parse(times).datetimes())
+
+    assert len(result) == 384
+
+
+def test_transform_maps_to_metric_range(benchmark, daily_payload):
+    """One day's min/max values"""
+    daily = daily_payload["daily"]
+    value_map = {
+        key: daily[key][0]
+        for key in (
+            "temperature_2m_max",
+            "temperature_2m_min",
+            "apparent_temperature_max",
+            "apparent_temperature_min",
+            "uv_index_max",
+            "precipitation_probability_max",
+        )
+    }
+
+    benchmark(transform_maps_to_metric_range, value_map, daily_payload["daily_units"])
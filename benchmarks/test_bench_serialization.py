@@ -0,0 +1,45 @@
+"""Benchmarks for building and serializing full weather responses"""
+
+from app.schemas.api.weather_response import WeatherForecastResponse
+from app.services.weather.mappers import (
+    map_current_weather,
+    map_daily_weather,
+    map_hourly_weather,
+)
+from app.utils.timing import TimedJSONResponse
+
+
+def build_response(payload: dict) -> WeatherForecastResponse:
+    """Response with current conditions plus 16 days of hourly and daily data"""
+    daily = map_daily_weather(payload)
+    return WeatherForecastResponse(
+        latitude=payload["latitude"],
+        longitude=payload["longitude"],
+        forecast_length=16,
+        current=map_current_weather(payload),
+        today=daily[0],
+        hourly=map_hourly_weather(payload),
+        daily=daily,
+    )
+
+
+def serialize(response: WeatherForecastResponse) -> bytes:
+    """Serialize as FastAPI does for a response model, then encode to JSON"""
+    content = WeatherForecastResponse.model_validate(response).model_dump(mode="json")
+    return TimedJSONResponse(content).body
+
+
+def test_response_serialization(benchmark, forecast_payload):
+    """Validate, dump and encode a full 16 day response"""
+    response = build_response(forecast_payload)
+
+    body = benchmark(serialize, response)
+
+    assert body.startswith(b"{")
+
+
+def test_response_end_to_end(benchmark, forecast_payload):
+    """Map the payload then serialize the response"""
+    body = benchmark(lambda: serialize(build_response(forecast_payload)))
+
+    assert body.startswith(b"{")
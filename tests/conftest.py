@@ -4,6 +4,8 @@ from httpx import Response
 import pytest
 import respx
 from app.config import settings
+from app.routers.base_router import health_service
+from app.routers.v1.weather_router import response_cache, weather_service
 from .mocks.weather_data_mocks import (
     mock_coordinates,
     mock_base_api_response_data,
@@ -25,6 +27,18 @@ def fixtures_weather_api_mock():
         yield respx_mock
 
 
+@pytest.fixture(autouse=True)
+def fixture_reset_weather_service():
+    """Clear shared weather service state so tests don't leak cached data"""
+    yield
+    weather_service.api_client.cache.clear()
+    response_cache.clear()
+    weather_service.api_client.circuit_breaker.reset()
+    if weather_service.clothing_cache is not None:
+        weather_service.clothing_cache.clear()
+    health_service.reset()
+
+
 # MOCK DATA
 @pytest.fixture
 def sample_coordinates():
@@ -1,8 +1,12 @@
+from datetime import datetime, timedelta
+
 from fastapi.testclient import TestClient
+from httpx import Response
 import pytest
 
 
 from app.main import app
+from app.routers.v1.weather_router import weather_service
 
 
 @pytest.fixture(name="client")
@@ -14,7 +18,7 @@ def fixture_test_api_client() -> TestClient:
 class TestHealthEndpoint:
     """Test cases for the health check endpoint"""
 
-    def test_health_check_response_format(self, client):
+    def test_health_check_response_format(self, client, weather_api_mock):
         """Test that health check response has correct format"""
         response = client.get("/prod/api/health")
 
@@ -22,12 +26,70 @@ class TestHealthEndpoint:
         assert response.status_code in [200, 503]
 
         data = response.json()
-        required_fields = ["status", "timestamp", "version", "uptime_seconds"]
+        required_fields = ["status", "timestamp", "version", "uptime_seconds", "checks"]
 
         for field in required_fields:
             assert field in data
 
         assert isinstance(data["uptime_seconds"], (int, float))
+        assert weather_api_mock["forecast"].called
+
+    def test_health_check_unhealthy_when_circuit_open(self, client):
+        """Test health check returns 503 while the circuit is open with no cached data"""
+        circuit_breaker = weather_service.api_client.circuit_breaker
+        for _ in range(circuit_breaker.minimum_calls):
+            circuit_breaker.record_failure()
+
+        response = client.get("/prod/api/health")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unhealthy"
+
+    def test_health_check_degraded_when_circuit_open_with_stale_data(self, client):
+        """Test health check stays 200 while stale data can be served"""
+        cache = weather_service.api_client.cache
+        cache.set(["forecast"], {}, 52.52, 13.41)
+        cache.store[0].timestamp = datetime.now() - timedelta(
+            minutes=cache.cache_duration_minutes + 1
+        )
+        circuit_breaker = weather_service.api_client.circuit_breaker
+        for _ in range(circuit_breaker.minimum_calls):
+            circuit_breaker.record_failure()
+
+        response = client.get("/prod/api/health")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "degraded"
+        upstream = next(c for c in data["checks"] if c["name"] == "weather_api")
+        assert upstream["details"]["servable_entries"] == 1
+
+    def test_health_check_healthy(self, client, weather_api_mock):
+        """Test health check reports healthy with uptime and checks"""
+        response = client.get("/prod/api/health")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "healthy"
+        assert data["uptime_seconds"] > 0
+        assert {check["name"] for check in data["checks"]} == {"cache", "weather_api"}
+        assert weather_api_mock["forecast"].called
+
+    def test_health_check_unhealthy_when_probe_fails(self, client, weather_api_mock):
+        """Test health check returns 503 when the upstream probe fails"""
+        weather_api_mock["forecast"].return_value = Response(500)
+
+        response = client.get("/prod/api/health")
+
+        assert response.status_code == 503
+        assert response.json()["status"] == "unhealthy"
+
+    def test_health_probe_cached(self, client, weather_api_mock):
+        """Test repeated health polls don't re-probe the upstream"""
+        for _ in range(3):
+            client.get("/prod/api/health")
+
+        assert weather_api_mock["forecast"].call_count == 1
 
 
 class TestHealthEndpointIntegration:
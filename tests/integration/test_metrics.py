@@ -0,0 +1,61 @@
+"""Integration tests for the metrics endpoint"""
+
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+@pytest.fixture(name="test_client")
+def fixture_test_client():
+    """Fixture for the api test client"""
+    return TestClient(app)
+
+
+class TestMetricsEndpoint:
+    """Test cases for the Prometheus metrics endpoint"""
+
+    def test_metrics_format(self, test_client):
+        """Test metrics are served as Prometheus text"""
+        test_client.get("/prod/api/hello")
+
+        response = test_client.get("/prod/api/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE http_request_duration_seconds histogram" in response.text
+        assert 'route="/api/hello"' in response.text
+        assert "weather_cache_requests_total" in response.text
+        assert "weather_upstream_queue_depth" in response.text
+
+    def test_weather_request_metrics(
+        self,
+        *,
+        test_client,
+        weather_api_mock,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+        mock_daily_weather_api_response,
+    ):
+        """Test weather requests record cache and upstream metrics"""
+        weather_api_mock["forecast"].respond(
+            json={
+                **mock_hourly_weather_api_response,
+                **mock_daily_weather_api_response,
+            },
+            status_code=200,
+        )
+        test_client.get(
+            "/prod/api/v1/weather/hourly?"
+            f"latitude={sample_coordinates['latitude']}&"
+            f"longitude={sample_coordinates['longitude']}"
+        )
+
+        response = test_client.get("/prod/api/metrics")
+
+        assert 'route="/api/v1/weather/hourly"' in response.text
+        assert 'weather_cache_requests_total{result="miss"}' in response.text
+        assert 'weather_singleflight_requests_total{role="leader"}' in response.text
+        assert (
+            'weather_upstream_request_duration_seconds_count{outcome="response"}'
+            in response.text
+        )
@@ -0,0 +1,76 @@
+"""Integration tests for the weather response cache"""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers.v1.weather_router import response_cache, weather_service
+from app.services.weather.snapping import SnapMode
+
+
+@pytest.fixture(name="test_client")
+def fixture_test_client():
+    """Fixture for the test client"""
+    return TestClient(app)
+
+
+@pytest.fixture(name="current_payload")
+def fixture_current_payload(
+    mock_current_weather_api_response, mock_daily_weather_api_response
+):
+    """Upstream payload for the current route"""
+    return {**mock_current_weather_api_response, **mock_daily_weather_api_response}
+
+
+def current_url(latitude: float, longitude: float) -> str:
+    """URL of the current route"""
+    return f"/prod/api/v1/weather/current?latitude={latitude}&longitude={longitude}"
+
+
+class TestResponseCache:
+    """Test cases for serving repeated requests from encoded responses"""
+
+    def test_repeat_request_served_from_cache(
+        self, test_client, weather_api_mock, current_payload, monkeypatch
+    ):
+        """Test nearby requests share one body, echoing their own coordinates"""
+        monkeypatch.setattr(weather_service.snapper, "mode", SnapMode.GRID)
+        weather_api_mock["forecast"].respond(json=current_payload, status_code=200)
+
+        first = test_client.get(current_url(51.5074, -0.1278))
+        second = test_client.get(current_url(51.5081, -0.1301))
+
+        assert response_cache.get_stats()["entries"] == 1
+        assert second.headers["server-timing"].startswith("response_cache;")
+        body, cached = first.json(), second.json()
+        assert (cached["latitude"], cached["longitude"]) == (51.5081, -0.1301)
+        for field in ("timestamp", "latitude", "longitude"):
+            del body[field], cached[field]
+        assert cached == body
+
+    def test_stale_responses_not_cached(
+        self, test_client, weather_api_mock, current_payload
+    ):
+        """Test responses built from expired data are never cached"""
+        weather_api_mock["forecast"].respond(json=current_payload, status_code=200)
+        test_client.get(current_url(51.5, -0.1278))
+        response_cache.clear()
+        for entry in weather_service.api_client.cache.store:
+            entry.timestamp = entry.timestamp.replace(year=2000)
+        weather_service.api_client.cache.max_stale_minutes = 10**8
+        weather_api_mock["forecast"].respond(status_code=503)
+
+        try:
+            response = test_client.get(current_url(51.5, -0.1278))
+        finally:
+            weather_service.api_client.cache.max_stale_minutes = 60
+
+        assert response.json()["stale"] is True
+        assert response_cache.get_stats()["entries"] == 0
+
+    def test_errors_not_cached(self, test_client):
+        """Test failed requests are never cached"""
+        response = test_client.get(current_url(51.5, -0.1278) + "&timezone=Nowhere")
+
+        assert response.status_code == 422
+        assert response_cache.get_stats()["entries"] == 0
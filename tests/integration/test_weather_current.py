@@ -1,8 +1,11 @@
 """Integration tests for current weather endpoint"""
 
+import time
+
 import pytest
 from fastapi.testclient import TestClient
 from app.main import app
+from app.schemas.api.weather_response import WeatherForecastResponse
 
 
 @pytest.fixture(name="test_client")
@@ -103,3 +106,122 @@ class TestCurrentWeatherEndpoint:
         assert today_result["temperature"]["min"] == 12.5
         assert today_result["temperature"]["max"] == 20.0
         assert today_result["temperature"]["unit"] == "°C"
+
+    def test_weather_current_server_timing(
+        self,
+        *,
+        test_client,
+        weather_api_mock,
+        sample_coordinates,
+        mock_current_weather_api_response,
+        mock_daily_weather_api_response,
+    ):
+        """Test the response reports the time spent in each phase"""
+        weather_api_mock["forecast"].respond(
+            json={
+                **mock_current_weather_api_response,
+                **mock_daily_weather_api_response,
+            },
+            status_code=200,
+        )
+
+        result = test_client.get(
+            (
+                "/prod/api/v1/weather/current?"
+                f"latitude={sample_coordinates['latitude']}&"
+                f"longitude={sample_coordinates['longitude']}"
+            )
+        )
+
+        phases = [
+            entry.split(";")[0] for entry in result.headers["Server-Timing"].split(", ")
+        ]
+        assert phases == [
+            "cache",
+            "upstream",
+            "map",
+            "classify",
+            "validate",
+            "encode",
+            "total",
+        ]
+
+    def test_validate_phase_covers_serialization(
+        self,
+        monkeypatch,
+        test_client,
+        weather_api_mock,
+        sample_coordinates,
+        mock_current_weather_api_response,
+        mock_daily_weather_api_response,
+    ):
+        """Test serializing the response model is timed as the validate phase"""
+        weather_api_mock["forecast"].respond(
+            json={
+                **mock_current_weather_api_response,
+                **mock_daily_weather_api_response,
+            },
+            status_code=200,
+        )
+        model_dump = WeatherForecastResponse.model_dump
+
+        def slow_model_dump(self, **kwargs):
+            time.sleep(0.05)
+            return model_dump(self, **kwargs)
+
+        monkeypatch.setattr(WeatherForecastResponse, "model_dump", slow_model_dump)
+
+        result = test_client.get(
+            (
+                "/prod/api/v1/weather/current?"
+                f"latitude={sample_coordinates['latitude']}&"
+                f"longitude={sample_coordinates['longitude']}"
+            )
+        )
+
+        phases = dict(
+            entry.split(";dur=")
+            for entry in result.headers["Server-Timing"].split(", ")
+        )
+        assert float(phases["validate"]) >= 50
+        assert result.json()["current"]["temperature"]["value"] == 16.2
+
+    @pytest.mark.asyncio
+    async def test_weather_current_units_share_cache(
+        self,
+        *,
+        test_client,
+        weather_api_mock,
+        sample_coordinates,
+        mock_current_weather_api_response,
+        mock_daily_weather_api_response,
+    ):
+        """Test other units are converted locally from one cached payload"""
+        weather_api_mock["forecast"].respond(
+            json={
+                **mock_current_weather_api_response,
+                **mock_daily_weather_api_response,
+            },
+            status_code=200,
+        )
+        url = (
+            "/prod/api/v1/weather/current?"
+            f"latitude={sample_coordinates['latitude']}&"
+            f"longitude={sample_coordinates['longitude']}"
+        )
+
+        metric = test_client.get(url).json()
+        imperial = test_client.get(
+            f"{url}&temperature_unit=fahrenheit&wind_speed_unit=mph"
+            "&precipitation_unit=inch"
+        ).json()
+
+        assert weather_api_mock["forecast"].calls.call_count == 1
+        assert imperial["temperature_unit"] == "fahrenheit"
+        assert imperial["current"]["temperature"] == {"value": 61.2, "unit": "°F"}
+        assert imperial["current"]["wind_speed"] == {"value": 4.0, "unit": "mp/h"}
+        assert imperial["current"]["precipitation"]["unit"] == "inch"
+        assert imperial["today"]["temperature"]["max"] == 68.0
+        assert imperial["current"]["humidity"] == metric["current"]["humidity"]
+        assert imperial["current"]["clothing"] == metric["current"]["clothing"]
+        assert metric["current"]["temperature"] == {"value": 16.2, "unit": "°C"}
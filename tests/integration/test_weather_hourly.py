@@ -86,3 +86,52 @@ class TestHourlyWeatherEndpoint:
         assert first_hour_result["is_day"] == 1
         assert first_hour_result["temperature"]["value"] == 15.9
         assert first_hour_result["temperature"]["unit"] == "°C"
+        assert first_hour_result["clothing"]["warmth"] == "mild"
+        assert all(hour["clothing"]["items"] for hour in hourly_result)
+
+    @pytest.mark.asyncio
+    async def test_weather_hourly_timezones_share_cache(
+        self,
+        *,
+        test_client,
+        weather_api_mock,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test other timezones are re-projected from one cached payload"""
+        # 2024-09-09T08:00Z, as returned with timeformat=unixtime
+        start = 1725868800
+        hourly = mock_hourly_weather_api_response["hourly"]
+        weather_api_mock["forecast"].respond(
+            json={
+                **mock_hourly_weather_api_response,
+                "hourly": {
+                    **hourly,
+                    "time": [start + 3600 * i for i in range(len(hourly["time"]))],
+                },
+            },
+            status_code=200,
+        )
+        url = (
+            "/prod/api/v1/weather/hourly?"
+            f"latitude={sample_coordinates['latitude']}&"
+            f"longitude={sample_coordinates['longitude']}&forecast_length=1"
+        )
+
+        local = test_client.get(url).json()
+        tokyo = test_client.get(f"{url}&timezone=Asia/Tokyo").json()
+
+        assert weather_api_mock["forecast"].calls.call_count == 1
+        assert local["hourly"][0]["time"] == "2024-09-09T09:00:00"
+        assert tokyo["hourly"][0]["time"] == "2024-09-09T17:00:00"
+        assert tokyo["timezone"] == "Asia/Tokyo"
+
+    def test_weather_hourly_unknown_timezone(self, test_client, sample_coordinates):
+        """Test unknown timezones are rejected"""
+        response = test_client.get(
+            "/prod/api/v1/weather/hourly?"
+            f"latitude={sample_coordinates['latitude']}&"
+            f"longitude={sample_coordinates['longitude']}&timezone=Not/AZone"
+        )
+
+        assert response.status_code == 422
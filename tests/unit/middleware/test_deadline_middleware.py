@@ -0,0 +1,75 @@
+"""Unit tests for Deadline and DeadlineMiddleware"""
+
+from unittest.mock import Mock
+
+import pytest
+
+from app.middleware.deadline import DeadlineMiddleware
+from app.utils.deadline import Deadline
+
+
+@pytest.fixture(name="middleware")
+def fixture_middleware() -> DeadlineMiddleware:
+    """Middleware with a 10 second default and 100ms margin"""
+    return DeadlineMiddleware(
+        Mock(), header="X-Request-Deadline-Ms", default_seconds=10, margin_ms=100
+    )
+
+
+class TestDeadline:
+    """Test cases for the Deadline value object"""
+
+    def test_remaining_and_expired(self):
+        """Test remaining time counts down and never goes negative"""
+        assert Deadline.after(5).remaining() <= 5
+        assert Deadline.after(5).expired() is False
+        assert Deadline.after(-1).remaining() == 0.0
+        assert Deadline.after(-1).expired() is True
+
+    def test_earliest(self):
+        """Test the sooner of two deadlines is chosen"""
+        sooner, later = Deadline.after(1), Deadline.after(10)
+
+        assert sooner.earliest(later) is sooner
+        assert later.earliest(sooner) is sooner
+        assert later.earliest(None) is later
+
+
+class TestDeadlineMiddleware:
+    """Test cases for building request deadlines"""
+
+    def test_default_deadline(self, middleware):
+        """Test the default budget applies without header or Lambda context"""
+        deadline = middleware.deadline_for({"type": "http", "headers": []})
+
+        assert 9.8 < deadline.remaining() <= 9.9
+
+    def test_header_deadline(self, middleware):
+        """Test a shorter budget from the request header is used"""
+        scope = {"type": "http", "headers": [(b"x-request-deadline-ms", b"2000")]}
+
+        assert 1.8 < middleware.deadline_for(scope).remaining() <= 1.9
+
+    def test_invalid_header_ignored(self, middleware):
+        """Test an unparsable header falls back to the default budget"""
+        scope = {"type": "http", "headers": [(b"x-request-deadline-ms", b"soon")]}
+
+        assert middleware.deadline_for(scope).remaining() > 9.8
+
+    def test_lambda_context_deadline(self, middleware):
+        """Test the Lambda context's remaining time bounds the deadline"""
+        context = Mock()
+        context.get_remaining_time_in_millis.return_value = 3000
+        scope = {"type": "http", "headers": [], "aws.context": context}
+
+        assert 2.8 < middleware.deadline_for(scope).remaining() <= 2.9
+
+    @pytest.mark.asyncio
+    async def test_sets_request_state(self, middleware):
+        """Test the deadline is stored in the scope state for request.state"""
+
+        async def app(scope, _receive, _send):
+            assert isinstance(scope["state"]["deadline"], Deadline)
+
+        middleware.app = app
+        await middleware({"type": "http", "headers": []}, None, None)
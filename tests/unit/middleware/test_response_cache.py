@@ -0,0 +1,131 @@
+"""Unit tests for ResponseCache and its body handling"""
+
+import json
+from datetime import datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+
+from app.middleware.response_cache import (
+    ResponseCache,
+    ResponseCacheMiddleware,
+    render_head,
+    split_body,
+)
+from app.services.weather.snapping import CoordinateSnapper, SnapMode
+
+BODY = (
+    b'{"timestamp":"2024-09-09T09:00:00","latitude":51.5,"longitude":-0.1278,'
+    b'"forecast_length":3,"stale":false}'
+)
+HEADERS = [(b"content-type", b"application/json")]
+
+
+def later(minutes: float = 10) -> datetime:
+    """A time `minutes` from now"""
+    return datetime.now() + timedelta(minutes=minutes)
+
+
+def scope(query: bytes, path: str = "/prod/api/v1/weather/current") -> dict:
+    """GET request scope for the weather routes"""
+    return {
+        "type": "http",
+        "method": "GET",
+        "path": path,
+        "root_path": "/prod",
+        "query_string": query,
+    }
+
+
+class TestBody:
+    """Test cases for splitting and re-rendering cached bodies"""
+
+    def test_split_and_render(self):
+        """Test a body is rebuilt with the request's coordinates"""
+        tail = split_body(BODY)
+        body = json.loads(render_head(51.5003, -0.1281) + tail)
+
+        assert tail == b'"forecast_length":3,"stale":false}'
+        assert body["latitude"] == 51.5003
+        assert body["longitude"] == -0.1281
+        assert body["forecast_length"] == 3
+        assert datetime.fromisoformat(body["timestamp"]) <= datetime.now()
+
+    @pytest.mark.parametrize("body", [b'{"message":"x"}', b'{"timestamp":"x"}'])
+    def test_other_bodies_not_split(self, body):
+        """Test bodies without the per-request fields aren't cached"""
+        assert split_body(body) is None
+
+
+class TestResponseCache:
+    """Test cases for ResponseCache"""
+
+    def test_expired_responses_dropped(self):
+        """Test responses are only served until their expiry"""
+        cache = ResponseCache()
+        cache.set(("a",), b"tail", HEADERS, later(-1))
+        cache.set(("b",), b"tail", HEADERS, later())
+
+        assert cache.get(("a",)) is None
+        assert cache.get(("b",)).body_tail() == b"tail"
+
+    def test_least_recently_used_evicted(self):
+        """Test the least recently used response goes first when full"""
+        cache = ResponseCache(max_entries=2)
+        cache.set(("a",), b"a", HEADERS, later())
+        cache.set(("b",), b"b", HEADERS, later())
+        cache.get(("a",))
+        cache.set(("c",), b"c", HEADERS, later())
+
+        assert list(cache.store) == [("a",), ("c",)]
+
+    def test_compressed(self):
+        """Test compressed bodies read back unchanged"""
+        cache = ResponseCache(compress=True)
+        tail = split_body(BODY) * 50
+        cache.set(("a",), tail, HEADERS, later())
+
+        assert cache.get(("a",)).body_tail() == tail
+        assert cache.get_stats()["bytes"] < len(tail)
+
+
+class TestRequestKey:
+    """Test cases for normalizing requests into cache keys"""
+
+    @pytest.fixture(name="middleware")
+    def fixture_middleware(self) -> ResponseCacheMiddleware:
+        """Middleware snapping to a 0.1 degree grid"""
+        return ResponseCacheMiddleware(
+            Mock(),
+            cache=ResponseCache(),
+            paths=("/api/v1/weather/current",),
+            snapper=CoordinateSnapper(SnapMode.GRID, resolution=0.1),
+        )
+
+    def test_nearby_requests_share_key(self, middleware):
+        """Test snapped coordinates and sorted parameters make the key"""
+        # pylint: disable=protected-access
+        first = middleware._request(
+            scope(b"latitude=51.5074&longitude=-0.1278&forecast_length=3")
+        )
+        second = middleware._request(
+            scope(b"forecast_length=3&longitude=-0.1301&latitude=51.4990")
+        )
+
+        assert first[0] == second[0]
+        assert second[1:] == (51.499, -0.1301)
+
+    @pytest.mark.parametrize(
+        "query, path",
+        [
+            (b"latitude=95&longitude=0", "/prod/api/v1/weather/current"),
+            (b"latitude=nan&longitude=0", "/prod/api/v1/weather/current"),
+            (b"latitude=1&latitude=2&longitude=0", "/prod/api/v1/weather/current"),
+            (b"longitude=0", "/prod/api/v1/weather/current"),
+            (b"latitude=1&longitude=0", "/prod/api/health"),
+        ],
+    )
+    def test_uncacheable_requests(self, middleware, query, path):
+        """Test requests the routes would reject or don't serve are passed on"""
+        # pylint: disable=protected-access
+        assert middleware._request(scope(query, path)) is None
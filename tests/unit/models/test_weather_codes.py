@@ -0,0 +1,83 @@
+"""Unit tests for the WMO weather code table"""
+
+import numpy as np
+import pytest
+
+from app.models import weather_codes
+from app.models.weather_codes import PrecipitationKind
+
+
+class TestWeatherCodes:
+    """Test cases for vectorized weather code lookups"""
+
+    def test_table_covers_every_code(self):
+        """Test all 100 codes are described, in code order"""
+        assert [c.code for c in weather_codes.WEATHER_CODES] == list(range(100))
+        assert all(c.description for c in weather_codes.WEATHER_CODES)
+
+    @pytest.mark.parametrize(
+        "code, description, kind, icon",
+        [
+            (0, "Clear sky", PrecipitationKind.NONE, "clear"),
+            (45, "Fog", PrecipitationKind.NONE, "fog"),
+            (63, "Moderate rain", PrecipitationKind.RAIN, "rain"),
+            (75, "Heavy snow fall", PrecipitationKind.SNOW, "snow"),
+            (
+                99,
+                "Thunderstorm with heavy hail",
+                PrecipitationKind.THUNDERSTORM,
+                "thunderstorm-hail",
+            ),
+        ],
+    )
+    def test_describe(self, code, description, kind, icon):
+        """Test Open-Meteo codes get their specific description"""
+        entry = weather_codes.describe(code)
+        assert entry.description == description
+        assert entry.precipitation == kind
+        assert entry.icon == icon
+
+    def test_series_lookups_match_table(self):
+        """Test vectorized lookups agree with the per-code entries"""
+        codes = np.array([0, 3, 61, 73, 95, 0])
+
+        assert weather_codes.severity(codes).tolist() == [
+            weather_codes.describe(c).severity for c in codes
+        ]
+        assert weather_codes.precipitation(codes).tolist() == [
+            weather_codes.describe(c).precipitation.value for c in codes
+        ]
+        assert weather_codes.icons(codes) == [
+            weather_codes.describe(c).icon for c in codes
+        ]
+
+    def test_worst(self):
+        """Test the most severe code wins, the higher code on ties"""
+        assert weather_codes.worst([0, 95, 61, 3]) == 95
+        assert weather_codes.worst([51, 61, 0]) == 61
+
+    def test_worst_by_group(self):
+        """Test each contiguous group reduces to its most severe code"""
+        codes = [0, 1, 61, 3, 2, 0, 73, 71]
+
+        worst = weather_codes.worst_by_group(codes, [0, 3, 6])
+
+        assert worst.tolist() == [61, 3, 73]
+
+    def test_worst_by_group_missing_codes(self):
+        """Test missing codes are skipped and all-missing groups are flagged"""
+        codes = [0, None, 61, float("nan"), None, 3]
+
+        worst = weather_codes.worst_by_group(codes, [0, 3, 5])
+
+        assert worst.tolist() == [61, weather_codes.MISSING_CODE, 3]
+
+    def test_tables_read_only(self):
+        """Test the shared arrays can't be modified by callers"""
+        with pytest.raises(ValueError):
+            weather_codes.SEVERITY[0] = 5
+
+    def test_out_of_range(self):
+        """Test codes outside 0-99 are rejected"""
+        with pytest.raises(IndexError):
+            weather_codes.severity([100])
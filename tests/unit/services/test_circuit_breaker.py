@@ -0,0 +1,237 @@
+"""Unit tests for the upstream circuit breaker and stale cache fallback"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from app.services.weather.api_client import WeatherAPIClient
+from app.services.weather.cache import stale_data_served
+from app.services.weather.circuit_breaker import CircuitBreaker, CircuitState
+from app.services.weather.exceptions import (
+    WeatherAPICircuitOpenError,
+    WeatherAPIDeadlineExceededError,
+)
+from app.services.weather.retry import RetryPolicy
+from app.utils.deadline import Deadline
+
+
+@pytest.fixture(name="circuit_breaker")
+def fixture_circuit_breaker() -> CircuitBreaker:
+    """Breaker that opens after two failures out of four calls"""
+    return CircuitBreaker(
+        failure_rate_threshold=0.5,
+        minimum_calls=4,
+        window_size=4,
+        open_seconds=0.05,
+        half_open_probes=1,
+    )
+
+
+@pytest.fixture(name="api_client")
+def fixture_api_client() -> WeatherAPIClient:
+    """Api client without retries and an already open circuit"""
+    api_client = WeatherAPIClient(
+        "https://api.test.com",
+        timeout=30.0,
+        cache_duration_minutes=10,
+        retry_policy=RetryPolicy(max_retries=0),
+        circuit_breaker=CircuitBreaker(minimum_calls=1, open_seconds=60),
+    )
+    api_client.circuit_breaker.record_failure()
+    return api_client
+
+
+class TestCircuitBreaker:
+    """Test cases for CircuitBreaker state transitions"""
+
+    def test_opens_when_error_rate_crosses_threshold(self, circuit_breaker):
+        """Test the circuit opens once enough calls have failed"""
+        circuit_breaker.record_success()
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+        assert circuit_breaker.state == CircuitState.CLOSED
+
+        circuit_breaker.record_failure()
+
+        assert circuit_breaker.state == CircuitState.OPEN
+        assert circuit_breaker.allow_request() is False
+
+    def test_half_open_probe_closes_circuit(self, circuit_breaker):
+        """Test a successful probe after the open period closes the circuit"""
+        for _ in range(4):
+            circuit_breaker.record_failure()
+
+        with patch("time.monotonic", return_value=10**9):
+            assert circuit_breaker.state == CircuitState.HALF_OPEN
+            assert circuit_breaker.allow_request() is True
+            # Only one probe is allowed at a time
+            assert circuit_breaker.allow_request() is False
+
+            circuit_breaker.record_success()
+
+        assert circuit_breaker.state == CircuitState.CLOSED
+        assert circuit_breaker.error_rate == 0.0
+
+    def test_half_open_probe_failure_reopens_circuit(self, circuit_breaker):
+        """Test a failed probe re-opens the circuit"""
+        for _ in range(4):
+            circuit_breaker.record_failure()
+
+        with patch("time.monotonic", return_value=10**9):
+            assert circuit_breaker.allow_request() is True
+            circuit_breaker.record_failure()
+
+            assert circuit_breaker.state == CircuitState.OPEN
+
+    def test_released_probe_frees_slot(self, circuit_breaker):
+        """Test a probe that ends without an outcome lets another through"""
+        for _ in range(4):
+            circuit_breaker.record_failure()
+
+        with patch("time.monotonic", return_value=10**9):
+            assert circuit_breaker.allow_request() is True
+            circuit_breaker.release()
+
+            assert circuit_breaker.state == CircuitState.HALF_OPEN
+            assert circuit_breaker.allow_request() is True
+
+
+class TestWeatherAPIClientCircuitBreaker:
+    """Test cases for WeatherAPIClient fail fast and stale fallback"""
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(self, api_client, sample_coordinates):
+        """Test no upstream call is made while the circuit is open"""
+        with patch("httpx.AsyncClient") as mock_client:
+            with pytest.raises(WeatherAPICircuitOpenError):
+                await api_client.fetch_weather_data({**sample_coordinates})
+
+            mock_client.return_value.__aenter__.return_value.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_serves_stale_data(
+        self, api_client, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test expired cache entries are served while the circuit is open"""
+        params = {**sample_coordinates, "forecast_days": 3, "current": ["temperature"]}
+        api_client.cache.set(
+            [3, "current"], mock_current_weather_api_response, **sample_coordinates
+        )
+        api_client.cache.store[0].timestamp = datetime.now() - timedelta(minutes=30)
+        stale_data_served.set(False)
+
+        with patch("httpx.AsyncClient"):
+            result = await api_client.fetch_weather_data(params)
+
+        assert result == mock_current_weather_api_response
+        assert stale_data_served.get() is True
+
+    @pytest.mark.asyncio
+    async def test_stale_data_capped_by_max_staleness(
+        self, api_client, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test entries older than the max staleness are not served"""
+        params = {**sample_coordinates, "forecast_days": 3, "current": ["temperature"]}
+        api_client.cache.set(
+            [3, "current"], mock_current_weather_api_response, **sample_coordinates
+        )
+        too_old = api_client.cache.max_stale_minutes + 11
+        api_client.cache.store[0].timestamp = datetime.now() - timedelta(
+            minutes=too_old
+        )
+
+        with patch("httpx.AsyncClient"):
+            with pytest.raises(WeatherAPICircuitOpenError):
+                await api_client.fetch_weather_data(params)
+
+    @pytest.mark.asyncio
+    async def test_upstream_failures_open_circuit(self, sample_coordinates):
+        """Test repeated upstream timeouts open the circuit"""
+        api_client = WeatherAPIClient(
+            "https://api.test.com",
+            timeout=30.0,
+            cache_duration_minutes=10,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(minimum_calls=2, window_size=2),
+        )
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.side_effect = httpx.TimeoutException("Timeout")
+
+            for _ in range(3):
+                with pytest.raises(Exception):
+                    await api_client.fetch_weather_data({**sample_coordinates})
+
+            assert mock_get.call_count == 2
+            assert api_client.circuit_breaker.state == CircuitState.OPEN
+
+    @pytest.mark.asyncio
+    async def test_cancelled_probe_releases_slot(self, sample_coordinates):
+        """Test a half-open probe cancelled mid-request doesn't block the next"""
+        api_client = WeatherAPIClient(
+            "https://api.test.com",
+            timeout=30.0,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(
+                minimum_calls=1, open_seconds=0, half_open_probes=1
+            ),
+        )
+        api_client.circuit_breaker.record_failure()
+
+        async def hanging_response(*_args, **_kwargs):
+            await asyncio.sleep(10)
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.side_effect = hanging_response
+            # pylint: disable=protected-access
+            probe = asyncio.ensure_future(
+                api_client._fetch_upstream(
+                    ["current"], {**sample_coordinates}, Deadline.after(30)
+                )
+            )
+            await asyncio.sleep(0.01)
+            probe.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await probe
+
+        assert api_client.circuit_breaker.state == CircuitState.HALF_OPEN
+        assert api_client.circuit_breaker.allow_request() is True
+
+    @pytest.mark.asyncio
+    async def test_short_deadlines_dont_open_circuit(
+        self, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test callers running out of their own deadline can't trip the breaker"""
+        api_client = WeatherAPIClient(
+            "https://api.test.com",
+            timeout=30.0,
+            retry_policy=RetryPolicy(max_retries=0),
+            circuit_breaker=CircuitBreaker(minimum_calls=2, window_size=2),
+        )
+
+        async def slow_response(*_args, **_kwargs):
+            await asyncio.sleep(0.2)
+            return Mock(
+                raise_for_status=Mock(),
+                json=Mock(return_value=mock_current_weather_api_response),
+            )
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.side_effect = slow_response
+            for _ in range(3):
+                with pytest.raises(WeatherAPIDeadlineExceededError):
+                    await api_client.fetch_weather_data(
+                        {**sample_coordinates}, deadline=Deadline.after(0.05)
+                    )
+
+            assert api_client.circuit_breaker.state == CircuitState.CLOSED
+            result = await api_client.fetch_weather_data(
+                {**sample_coordinates}, deadline=Deadline.after(5)
+            )
+
+        assert result == mock_current_weather_api_response
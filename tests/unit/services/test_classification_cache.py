@@ -0,0 +1,156 @@
+"""Unit tests for the classification result cache"""
+
+import numpy as np
+import pytest
+
+from app.services.classification.clothing import FEATURES, ClothingClassifier
+from app.services.classification.result_cache import ClassificationCache
+
+
+class RecordingModel:
+    """Sums each row and records the rows it was asked to score"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, rows: np.ndarray) -> np.ndarray:
+        self.calls.append(rows.copy())
+        return np.column_stack([np.nansum(rows, axis=1), np.zeros(len(rows))])
+
+
+def build_rows(*temperatures, **fixed) -> np.ndarray:
+    """Feature rows differing only in temperature"""
+    rows = np.zeros((len(temperatures), len(FEATURES)))
+    rows[:, FEATURES.index("temperature")] = temperatures
+    for feature, value in fixed.items():
+        rows[:, FEATURES.index(feature)] = value
+    return rows
+
+
+def whole_degrees(rows: np.ndarray) -> np.ndarray:
+    """Key of rows rounded to whole numbers"""
+    return np.round(np.nan_to_num(rows, nan=-999)).astype(np.int32)
+
+
+@pytest.fixture(name="model")
+def fixture_model() -> RecordingModel:
+    """Model that records its calls"""
+    return RecordingModel()
+
+
+@pytest.fixture(name="classifier")
+def fixture_classifier() -> ClothingClassifier:
+    """Clothing classifier"""
+    return ClothingClassifier()
+
+
+def clothing_cache(classifier: ClothingClassifier) -> ClassificationCache:
+    """Cache in front of the clothing classifier, as the service builds it"""
+
+    def infer(rows):
+        classification = classifier.classify_matrix(rows)
+        return np.column_stack([classification.outfit, classification.comfort_index])
+
+    return ClassificationCache(infer, classifier.discretize, name="test")
+
+
+class TestClassificationCache:
+    """Test cases for caching classification results by key"""
+
+    def test_equal_keys_share_entry(self, model):
+        """Test rows with the same key are classified once"""
+        cache = ClassificationCache(model, whole_degrees, name="test")
+
+        first = cache.classify(build_rows(20.1, 19.9, 25.0))
+        second = cache.classify(build_rows(20.2))
+
+        assert [len(rows) for rows in model.calls] == [2]
+        np.testing.assert_array_equal(first[0], first[1])
+        np.testing.assert_array_equal(second[0], first[0])
+        assert cache.get_stats()["hits"] == 2
+        assert cache.get_stats()["misses"] == 2
+        assert cache.get_stats()["hit_rate"] == pytest.approx(0.5)
+
+    def test_misses_use_original_values(self, model):
+        """Test results are computed from the features as requested"""
+        cache = ClassificationCache(model, whole_degrees, name="test")
+
+        cache.classify(build_rows(17.8))
+
+        assert model.calls[0][0, FEATURES.index("temperature")] == 17.8
+
+    def test_lru_eviction(self, model):
+        """Test the least recently used entry is evicted past max_entries"""
+        cache = ClassificationCache(model, whole_degrees, name="test", max_entries=2)
+
+        cache.classify(build_rows(10.0))
+        cache.classify(build_rows(20.0))
+        cache.classify(build_rows(10.0))
+        cache.classify(build_rows(30.0))
+        cache.classify(build_rows(10.0))
+        cache.classify(build_rows(20.0))
+
+        assert len(model.calls) == 4
+        assert cache.get_stats()["evictions"] == 2
+        assert cache.get_stats()["entries"] == 2
+
+    def test_empty_forecast(self, model):
+        """Test an empty batch is passed straight through"""
+        cache = ClassificationCache(model, whole_degrees, name="test")
+
+        assert cache.classify(build_rows()).shape == (0, 2)
+
+
+class TestClothingCache:
+    """Test cases for caching clothing results by the classifier's decisions"""
+
+    def test_threshold_sides_keyed_apart(self, classifier):
+        """Test values either side of a warmth boundary never share an entry"""
+        cache = clothing_cache(classifier)
+        # 18.0 is a warmth boundary
+        rows = build_rows(17.99, 18.0)
+        rows[:, FEATURES.index("apparent_temperature")] = [17.99, 18.0]
+
+        keys = classifier.discretize(rows)
+
+        assert not np.array_equal(keys[0], keys[1])
+        np.testing.assert_array_equal(
+            cache.classify(rows)[:, 0], classifier.classify_matrix(rows).outfit
+        )
+
+    def test_results_match_uncached(self, classifier):
+        """Test cached results read exactly as classifying without the cache"""
+        cache = clothing_cache(classifier)
+        rng = np.random.default_rng(0)
+        # Values around every boundary, so many rows share keys
+        rows = rng.uniform(0, 40, size=(2000, len(FEATURES)))
+        rows[:, FEATURES.index("temperature")] = rng.uniform(16, 20, 2000)
+        rows[:, FEATURES.index("apparent_temperature")] = rng.uniform(17, 19, 2000)
+        rows[:, FEATURES.index("precipitation")] = rng.uniform(0, 3, 2000)
+        rows[:, FEATURES.index("weather_code")] = rng.choice([0, 61, 71], 2000)
+        rows[:, FEATURES.index("is_day")] = rng.integers(0, 2, 2000)
+        rows[::7, FEATURES.index("uv_index")] = np.nan
+
+        cached = np.concatenate(
+            [cache.classify(rows[:1000]), cache.classify(rows[1000:])]
+        )
+        fresh = classifier.classify_matrix(rows)
+
+        assert cache.get_stats()["hits"] > 0
+        assert classifier.recommendations(
+            cached[:, 0].astype(np.intp), cached[:, 1]
+        ) == classifier.recommendations(fresh.outfit, fresh.comfort_index)
+
+    def test_categorical_inputs_keyed_apart(self, classifier):
+        """Test precipitation kind and daylight are part of the key"""
+        keys = classifier.discretize(
+            np.vstack(
+                [
+                    build_rows(20.0, weather_code=61),
+                    build_rows(20.0, weather_code=71),
+                    build_rows(20.0, weather_code=71, is_day=1),
+                ]
+            )
+        )
+
+        assert len({row.tobytes() for row in keys}) == 3
@@ -0,0 +1,136 @@
+"""Unit tests for the clothing classifier"""
+
+import numpy as np
+import pytest
+
+from app.models.weather_conditions import WeatherClassificationFields as Fields
+from app.schemas.metric_value import MetricValue
+from app.schemas.weather_data import WeatherForecastData
+from app.services.classification.clothing import (
+    ClothingClassifier,
+    RainProtection,
+    SunProtection,
+    WarmthLevel,
+)
+
+
+@pytest.fixture(name="classifier", scope="module")
+def fixture_classifier() -> ClothingClassifier:
+    """Classifier with the default tables"""
+    return ClothingClassifier()
+
+
+def build_hour(**overrides) -> WeatherForecastData:
+    """Mild, dry daytime hour with optional overrides"""
+    values = {
+        "temperature": 15.0,
+        "apparent_temperature": 15.0,
+        "humidity": 50.0,
+        "wind_speed": 10.0,
+        "precipitation": 0.0,
+        "precipitation_probability": 0.0,
+        "cloud_cover": 40.0,
+        "uv_index": 1.0,
+    }
+    weather_code = overrides.pop("weather_code", 1)
+    is_day = overrides.pop("is_day", True)
+    values.update(overrides)
+    return WeatherForecastData(
+        weather_code=weather_code,
+        is_day=is_day,
+        **{
+            field: MetricValue[float](value=value, unit="")
+            for field, value in values.items()
+        },
+    )
+
+
+class TestClothingClassifier:
+    """Test cases for clothing classification"""
+
+    @pytest.mark.parametrize(
+        "apparent, expected",
+        [
+            (-10, WarmthLevel.VERY_COLD),
+            (-5, WarmthLevel.COLD),
+            (8, WarmthLevel.COOL),
+            (15, WarmthLevel.MILD),
+            (20, WarmthLevel.WARM),
+            (30, WarmthLevel.HOT),
+        ],
+    )
+    def test_warmth_uses_apparent_temperature(self, classifier, apparent, expected):
+        """Test warmth levels follow apparent temperature, boundaries rounding up"""
+        [result] = classifier.classify_forecast(
+            [build_hour(apparent_temperature=apparent)]
+        )
+        assert result.warmth == expected.value
+
+    @pytest.mark.parametrize(
+        "overrides, expected",
+        [
+            ({}, RainProtection.NONE),
+            ({"precipitation_probability": 40.0}, RainProtection.UMBRELLA),
+            ({"precipitation": 3.0}, RainProtection.WATERPROOF),
+            (
+                {"precipitation_probability": 70.0, "precipitation": 0.5},
+                RainProtection.WATERPROOF,
+            ),
+            ({"weather_code": 61}, RainProtection.UMBRELLA),
+            ({"weather_code": 95}, RainProtection.WATERPROOF),
+        ],
+    )
+    def test_rain_protection(self, classifier, overrides, expected):
+        """Test rain protection from probability, amount and weather code"""
+        [result] = classifier.classify_forecast([build_hour(**overrides)])
+        assert result.rain_protection == expected.value
+
+    def test_sun_protection_only_during_day(self, classifier):
+        """Test high UV needs full protection by day and none at night"""
+        day, night = classifier.classify_forecast(
+            [build_hour(uv_index=7.0), build_hour(uv_index=7.0, is_day=False)]
+        )
+        assert day.sun_protection == SunProtection.FULL.value
+        assert "sunscreen" in day.items
+        assert night.sun_protection == SunProtection.NONE.value
+
+    def test_items_for_snow_and_wind(self, classifier):
+        """Test snow and strong wind add their items to the outfit"""
+        [result] = classifier.classify_forecast(
+            [build_hour(weather_code=73, apparent_temperature=-8, wind_speed=40.0)]
+        )
+        assert result.warmth == WarmthLevel.VERY_COLD.value
+        assert "snow boots" in result.items
+        assert "windproof layer" in result.items
+        assert "waterproof jacket" in result.items
+
+    def test_series_missing_values(self, classifier):
+        """Test missing apparent temperature falls back to temperature"""
+        classification = classifier.classify_series(
+            {
+                Fields.TEMPERATURE: [30.0, 30.0],
+                Fields.APPARENT_TEMPERATURE: [None, 2.0],
+            },
+            weather_code=[0, 0],
+            is_day=[1, 1],
+        )
+        assert len(classification) == 2
+        np.testing.assert_array_equal(
+            classification.warmth,
+            [
+                list(WarmthLevel).index(WarmthLevel.HOT),
+                list(WarmthLevel).index(WarmthLevel.COLD),
+            ],
+        )
+
+    def test_comfort_index_attached(self, classifier):
+        """Test recommendations carry the composite comfort index"""
+        pleasant, stormy = classifier.classify_forecast(
+            [
+                build_hour(apparent_temperature=21.0, temperature=21.0),
+                build_hour(
+                    weather_code=95, precipitation=8.0, precipitation_probability=100
+                ),
+            ]
+        )
+        assert 0 <= stormy.comfort_index < pleasant.comfort_index <= 1
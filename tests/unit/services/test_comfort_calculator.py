@@ -0,0 +1,109 @@
+"""Unit tests for the comfort index calculator"""
+
+import numpy as np
+import pytest
+
+from app.models.weather_conditions import (
+    WeatherClassificationFields as Fields,
+    WeatherConditions,
+)
+from app.services.classification.comfort_calculator import (
+    ComfortIndexCalculator,
+    ComfortRange,
+)
+
+
+@pytest.fixture(name="calculator")
+def fixture_calculator() -> ComfortIndexCalculator:
+    """Calculator with the default profile"""
+    return ComfortIndexCalculator()
+
+
+def build_conditions(**overrides) -> WeatherConditions:
+    """Pleasant conditions with optional overrides"""
+    return WeatherConditions(
+        **{
+            "weather_code": 1,
+            "temperature": 21.0,
+            "apparent_temperature": 21.0,
+            "humidity": 45.0,
+            "wind_speed": 8.0,
+            "precipitation": 0.0,
+            "precipitation_probability": 5.0,
+            "cloud_cover": 30.0,
+            "uv_index": 3.0,
+            "is_day": True,
+            **overrides,
+        }
+    )
+
+
+class TestComfortIndexCalculator:
+    """Test cases for comfort scores"""
+
+    @pytest.mark.parametrize(
+        "value, expected", [(21, 1.0), (18, 1.0), (30, 0.5), (12, 0.5), (40, 0.0)]
+    )
+    def test_normalize(self, calculator, value, expected):
+        """Test scalar scores fall linearly outside the ideal band"""
+        assert calculator.normalize(value, Fields.TEMPERATURE) == pytest.approx(
+            expected
+        )
+
+    def test_series_matches_scalar(self, calculator):
+        """Test vectorized scores match the scalar wrapper hour by hour"""
+        wind_speeds = [0.0, 15.0, 25.0, 32.5, 60.0]
+
+        scores = calculator.score_series({Fields.WIND_SPEED: wind_speeds})
+
+        expected = [calculator.normalize(v, Fields.WIND_SPEED) for v in wind_speeds]
+        np.testing.assert_allclose(scores.field(Fields.WIND_SPEED), expected)
+
+    def test_composite_weighted(self):
+        """Test the composite is the weighted mean of field scores"""
+        calculator = ComfortIndexCalculator(
+            {
+                Fields.TEMPERATURE: ComfortRange(18, 24, 10, weight=3),
+                Fields.HUMIDITY: ComfortRange(30, 60, 10, weight=1),
+            }
+        )
+
+        scores = calculator.score_series(
+            {Fields.TEMPERATURE: [21, 21], Fields.HUMIDITY: [45, 80]}
+        )
+
+        np.testing.assert_allclose(scores.composite, [1.0, 0.75])
+
+    def test_missing_values_excluded(self, calculator):
+        """Test missing values don't drag the composite down"""
+        scores = calculator.score_series(
+            {Fields.TEMPERATURE: [21, None], Fields.HUMIDITY: [45, 45]}
+        )
+
+        assert np.isnan(scores.field(Fields.TEMPERATURE)[1])
+        np.testing.assert_allclose(scores.composite, [1.0, 1.0])
+
+    def test_comfort_index(self, calculator):
+        """Test pleasant conditions score higher than a cold, wet hour"""
+        pleasant = calculator.comfort_index(build_conditions())
+        miserable = calculator.comfort_index(
+            build_conditions(
+                temperature=2.0,
+                apparent_temperature=-3.0,
+                precipitation=4.0,
+                precipitation_probability=90.0,
+                wind_speed=40.0,
+            )
+        )
+
+        assert pleasant == pytest.approx(1.0)
+        assert miserable < 0.5
+
+    def test_score_conditions(self, calculator):
+        """Test a forecast is scored hour by hour"""
+        forecast = [build_conditions(), build_conditions(temperature=30.0)]
+
+        scores = calculator.score_conditions(forecast)
+
+        assert len(scores) == 2
+        np.testing.assert_allclose(scores.field(Fields.TEMPERATURE), [1.0, 0.5])
@@ -0,0 +1,88 @@
+"""Unit tests for coordinate snapping"""
+
+import pytest
+
+from app.services.weather.cache import WeatherCache, requested_coordinates
+from app.services.weather.snapping import (
+    CoordinateSnapper,
+    SnapMode,
+    geohash_bounds,
+    geohash_encode,
+)
+
+
+class TestGeohash:
+    """Test cases for geohash encoding"""
+
+    def test_encode_known_value(self):
+        """Test encoding matches the reference geohash"""
+        assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+    def test_bounds_contain_point(self):
+        """Test a point lies inside the cell of its own geohash"""
+        min_lat, max_lat, min_lon, max_lon = geohash_bounds(
+            geohash_encode(51.5074, -0.1278, 6)
+        )
+        assert min_lat <= 51.5074 <= max_lat
+        assert min_lon <= -0.1278 <= max_lon
+
+
+class TestCoordinateSnapper:
+    """Test cases for CoordinateSnapper"""
+
+    def test_none_keeps_coordinates(self):
+        """Test coordinates pass through unchanged without a policy"""
+        assert CoordinateSnapper().snap(51.5074, -0.1278) == (51.5074, -0.1278)
+
+    @pytest.mark.parametrize(
+        "resolution, expected",
+        [(0.05, (51.5, -0.15)), (0.1, (51.5, -0.1)), (0.25, (51.5, -0.25))],
+    )
+    def test_grid(self, resolution, expected):
+        """Test coordinates round to the grid without float noise"""
+        snapper = CoordinateSnapper(SnapMode.GRID, resolution=resolution)
+        assert snapper.snap(51.5074, -0.1278) == expected
+
+    def test_geohash_shares_cell_centre(self):
+        """Test nearby points in one geohash cell snap to its centre"""
+        snapper = CoordinateSnapper(SnapMode.GEOHASH, geohash_precision=5)
+        first = snapper.snap(51.5074, -0.1278)
+        assert snapper.snap(51.5080, -0.1290) == first
+        assert first != (51.5074, -0.1278)
+
+    def test_grid_stays_in_range(self):
+        """Test snapping never leaves the valid coordinate range"""
+        snapper = CoordinateSnapper(SnapMode.GRID, resolution=0.7)
+        latitude, longitude = snapper.snap(89.9, 179.9)
+        assert latitude <= 90
+        assert longitude <= 180
+
+    def test_records_requested_coordinates(self):
+        """Test the original coordinates are kept for the current request"""
+        CoordinateSnapper(SnapMode.GRID).snap(51.5074, -0.1278)
+        assert requested_coordinates.get() == (51.5074, -0.1278)
+
+
+class TestSnappedHits:
+    """Test cases for reporting cache hits gained by snapping"""
+
+    def test_counts_hits_from_other_locations(self):
+        """Test only hits for a different original location are counted"""
+        cache = WeatherCache()
+        snapper = CoordinateSnapper(SnapMode.GRID, resolution=0.05)
+
+        cache.set(["current"], {"value": 1}, *snapper.snap(51.5074, -0.1278))
+        assert cache.get(["current"], *snapper.snap(51.5074, -0.1278)) is not None
+        assert cache.get(["current"], *snapper.snap(51.4990, -0.1400)) is not None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 2
+        assert stats["snapped_hits"] == 1
+
+    def test_no_snapped_hits_without_snapping(self):
+        """Test plain lookups never count as snapped hits"""
+        cache = WeatherCache()
+        cache.set(["current"], {"value": 1}, 51.5074, -0.1278)
+        cache.get(["current"], 51.5074, -0.1278)
+
+        assert cache.get_stats()["snapped_hits"] == 0
@@ -0,0 +1,82 @@
+"""Unit tests for the health service"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.schemas.health_check import HealthStatus
+from app.services.health import HealthService
+from app.services.weather import WeatherService
+
+
+def build_health_service(handler, **thresholds) -> HealthService:
+    """Health service whose weather client talks to a mock transport"""
+    weather_service = WeatherService()
+    weather_service.api_client.transport = httpx.MockTransport(handler)
+    return HealthService(weather_service, probe_interval_seconds=60, **thresholds)
+
+
+def ok_handler(_request: httpx.Request) -> httpx.Response:
+    """Upstream that always answers"""
+    return httpx.Response(200, json={})
+
+
+class TestHealthService:
+    """Test cases for health status thresholds"""
+
+    @pytest.mark.asyncio
+    async def test_healthy(self):
+        """Test a fast, error free upstream is healthy"""
+        health = await build_health_service(ok_handler).check()
+
+        assert health.status == HealthStatus.HEALTHY
+        assert health.checks[1].latency_ms is not None
+
+    @pytest.mark.asyncio
+    async def test_p95_latency_thresholds(self):
+        """Test the p95 of real requests degrades, then fails, the check"""
+        health_service = build_health_service(
+            ok_handler, degraded_latency_ms=100, unhealthy_latency_ms=500
+        )
+        latency_tracker = health_service.weather_service.api_client.latency_tracker
+        for _ in range(latency_tracker.min_samples):
+            latency_tracker.record(0.2)
+
+        assert (await health_service.check()).status == HealthStatus.DEGRADED
+
+        for _ in range(latency_tracker.min_samples):
+            latency_tracker.record(1.0)
+
+        assert (await health_service.check()).status == HealthStatus.UNHEALTHY
+
+    @pytest.mark.asyncio
+    async def test_error_rate_threshold(self):
+        """Test upstream error rate degrades the check"""
+        health_service = build_health_service(
+            ok_handler, degraded_error_rate=0.1, unhealthy_error_rate=0.9
+        )
+        circuit_breaker = health_service.weather_service.api_client.circuit_breaker
+        circuit_breaker.record_success()
+        circuit_breaker.record_failure()
+
+        health = await health_service.check()
+
+        assert health.status == HealthStatus.DEGRADED
+        assert health.checks[1].details["error_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_probe_cached_between_intervals(self):
+        """Test concurrent and repeated checks share one upstream probe"""
+        requests = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests.append(request)
+            return httpx.Response(200, json={})
+
+        health_service = build_health_service(handler)
+
+        await asyncio.gather(*(health_service.check() for _ in range(3)))
+        await health_service.check()
+
+        assert len(requests) == 1
@@ -0,0 +1,104 @@
+"""Unit tests for the classification micro-batcher"""
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from app.services.classification.batching import MicroBatcher
+from app.services.classification.clothing import FEATURES, ClothingClassifier
+
+
+class RecordingModel:
+    """Doubles its inputs and records the size of every call"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, rows: np.ndarray) -> np.ndarray:
+        self.calls.append(len(rows))
+        return rows * 2
+
+
+class TestMicroBatcher:
+    """Test cases for merging concurrent inference calls"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_batch(self):
+        """Test concurrent callers are scored together and get their own rows"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, name="test", max_wait_ms=5)
+        inputs = [np.full((n, 2), float(n)) for n in (1, 3, 2)]
+
+        results = await asyncio.gather(*(batcher.submit(rows) for rows in inputs))
+
+        assert model.calls == [6]
+        for rows, result in zip(inputs, results):
+            np.testing.assert_array_equal(result, rows * 2)
+
+    @pytest.mark.asyncio
+    async def test_full_batch_runs_without_waiting(self):
+        """Test reaching max_batch_rows flushes before the window closes"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, name="test", max_batch_rows=4, max_wait_ms=10000)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(batcher.submit(np.ones((2, 1))) for _ in range(2)))
+
+        assert model.calls == [4]
+        assert time.perf_counter() - start < 1
+        assert batcher.pending_rows == 0
+
+    @pytest.mark.asyncio
+    async def test_window_bounds_wait(self):
+        """Test a lone request runs once the window has passed"""
+        model = RecordingModel()
+        batcher = MicroBatcher(model, name="test", max_wait_ms=20)
+
+        start = time.perf_counter()
+        result = await batcher.submit(np.ones((1, 1)))
+
+        assert result.tolist() == [[2.0]]
+        assert 0.015 <= time.perf_counter() - start < 1
+        assert batcher.get_stats()["batches"] >= 1
+
+    @pytest.mark.asyncio
+    async def test_inference_error_reaches_every_caller(self):
+        """Test a failing batch fails each caller and later batches still run"""
+
+        def failing(rows):
+            raise RuntimeError("boom")
+
+        batcher = MicroBatcher(failing, name="test", max_wait_ms=1)
+
+        results = await asyncio.gather(
+            batcher.submit(np.ones((1, 1))),
+            batcher.submit(np.ones((1, 1))),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(result, RuntimeError) for result in results)
+        batcher.infer = RecordingModel()
+        assert (await batcher.submit(np.ones((1, 1)))).tolist() == [[2.0]]
+
+    @pytest.mark.asyncio
+    async def test_batched_clothing_matches_unbatched(self):
+        """Test batched classification returns what each request gets alone"""
+        classifier = ClothingClassifier()
+        rng = np.random.default_rng(0)
+        requests = []
+        for hours in (1, 24, 5):
+            features = rng.uniform(0, 40, size=(hours, len(FEATURES)))
+            features[:, FEATURES.index("weather_code")] = rng.integers(0, 99, hours)
+            features[:, FEATURES.index("is_day")] = rng.integers(0, 2, hours)
+            requests.append(features)
+
+        def infer(rows):
+            return classifier.classify_matrix(rows).outfit
+
+        batcher = MicroBatcher(infer, name="test", max_wait_ms=5)
+        batched = await asyncio.gather(*(batcher.submit(rows) for rows in requests))
+
+        for rows, outfit in zip(requests, batched):
+            np.testing.assert_array_equal(outfit, infer(rows))
@@ -0,0 +1,167 @@
+"""Unit tests for the memory-mapped model registry"""
+
+import sys
+
+import numpy as np
+import pytest
+
+from app.services.model_registry import (
+    ModelLoadError,
+    ModelNotFoundError,
+    ModelRegistry,
+    map_artifact,
+    resident_bytes,
+)
+
+
+@pytest.fixture(name="weights")
+def fixture_weights() -> dict:
+    """Arrays of a small model, including a Fortran-ordered and an empty one"""
+    rng = np.random.default_rng(0)
+    return {
+        "coef": rng.normal(size=(8, 4)),
+        "intercept": np.arange(4, dtype=np.float32),
+        "fortran": np.asfortranarray(rng.normal(size=(3, 5))),
+        "empty": np.zeros((0, 2)),
+    }
+
+
+@pytest.fixture(name="model_dir")
+def fixture_model_dir(tmp_path, weights):
+    """Registry root holding two versions of one model"""
+    clothing = tmp_path / "clothing"
+    clothing.mkdir()
+    np.savez(clothing / "v2.npz", **weights)
+    np.savez(clothing / "v10.npz", **{k: v * 2 for k, v in weights.items()})
+    (clothing / "README.txt").write_text("not an artifact")
+    return tmp_path
+
+
+class TestMapArtifact:
+    """Test cases for mapping artifacts"""
+
+    def test_map_npz(self, tmp_path, weights):
+        """Test every archive member is mapped read-only with its layout"""
+        path = tmp_path / "model.npz"
+        np.savez(path, **weights)
+
+        arrays = map_artifact(str(path))
+
+        assert set(arrays) == set(weights)
+        for name, expected in weights.items():
+            np.testing.assert_array_equal(arrays[name], expected)
+            assert arrays[name].dtype == expected.dtype
+        assert not arrays["coef"].flags.writeable
+        assert isinstance(arrays["coef"].base, np.memmap)
+        assert arrays["fortran"].flags.f_contiguous
+
+    def test_map_npy(self, tmp_path, weights):
+        """Test a single array file is mapped under numpy's positional name"""
+        path = tmp_path / "model.npy"
+        np.save(path, weights["coef"])
+
+        arrays = map_artifact(str(path))
+
+        np.testing.assert_array_equal(arrays["arr_0"], weights["coef"])
+        assert isinstance(arrays["arr_0"].base, np.memmap)
+
+    def test_compressed_rejected(self, tmp_path, weights):
+        """Test compressed archives fail rather than being read into memory"""
+        path = tmp_path / "model.npz"
+        np.savez_compressed(path, **weights)
+
+        with pytest.raises(ModelLoadError, match="compressed"):
+            map_artifact(str(path))
+
+    def test_corrupt_file(self, tmp_path):
+        """Test unreadable artifacts raise ModelLoadError"""
+        path = tmp_path / "model.npz"
+        path.write_bytes(b"not a zip file")
+
+        with pytest.raises(ModelLoadError):
+            map_artifact(str(path))
+
+
+class TestModelRegistry:
+    """Test cases for lazy loading and version swaps"""
+
+    def test_scan_is_lazy(self, model_dir):
+        """Test scanning lists versions in natural order without mapping"""
+        registry = ModelRegistry(str(model_dir))
+
+        assert registry.scan() == {"clothing": ["v2", "v10"]}
+        assert registry.get_stats() == {}
+
+    def test_get_latest_version_once(self, model_dir, weights):
+        """Test the latest version is mapped on first use then reused"""
+        registry = ModelRegistry(str(model_dir))
+        registry.scan()
+
+        artifact = registry.get("clothing")
+
+        assert artifact.version == "v10"
+        np.testing.assert_array_equal(artifact["coef"], weights["coef"] * 2)
+        assert registry.get("clothing") is artifact
+        assert registry.get_stats()["clothing"]["mapped_bytes"] == artifact.nbytes
+
+    def test_get_without_scan(self, model_dir):
+        """Test versions are discovered on first use when scan wasn't called"""
+        registry = ModelRegistry(str(model_dir))
+
+        assert registry.active_version("clothing") == "v10"
+        assert registry.get("clothing").version == "v10"
+
+    def test_activate_swaps_version(self, model_dir, weights):
+        """Test pinning swaps the artifact while old holders keep theirs"""
+        registry = ModelRegistry(str(model_dir))
+        registry.scan()
+        previous = registry.get("clothing")
+
+        current = registry.activate("clothing", "v2")
+
+        assert registry.get("clothing") is current
+        np.testing.assert_array_equal(current["coef"], weights["coef"])
+        np.testing.assert_array_equal(previous["coef"], weights["coef"] * 2)
+
+        registry.unpin("clothing")
+        assert registry.get("clothing").version == "v10"
+
+    def test_refresh_picks_up_new_version(self, model_dir, weights):
+        """Test a newly deployed version replaces the loaded one on next use"""
+        registry = ModelRegistry(str(model_dir))
+        registry.scan()
+        assert registry.get("clothing").version == "v10"
+
+        np.savez(model_dir / "clothing" / "v11.npz", **weights)
+        registry.refresh()
+
+        assert registry.get("clothing").version == "v11"
+
+    def test_unknown_model(self, model_dir):
+        """Test unknown models and versions raise ModelNotFoundError"""
+        registry = ModelRegistry(str(model_dir))
+        registry.scan()
+
+        with pytest.raises(ModelNotFoundError):
+            registry.get("missing")
+        with pytest.raises(ModelNotFoundError):
+            registry.activate("clothing", "v99")
+
+    def test_no_root(self):
+        """Test a registry without a directory has no models"""
+        assert ModelRegistry(None).scan() == {}
+
+    @pytest.mark.skipif(sys.platform != "linux", reason="reads /proc/self/smaps")
+    def test_resident_bytes(self, tmp_path):
+        """Test touched pages of a mapped artifact are reported as resident"""
+        model_dir = tmp_path / "large"
+        model_dir.mkdir()
+        np.save(model_dir / "v1.npy", np.ones(1 << 16))
+        registry = ModelRegistry(str(tmp_path))
+        registry.scan()
+        artifact = registry.get("large")
+
+        artifact["arr_0"].sum()
+
+        assert resident_bytes(artifact.path) > 0
+        assert registry.get_stats()["large"]["resident_bytes"] > 0
@@ -0,0 +1,150 @@
+"""Unit tests for the upstream rate limiter, using a local fake upstream"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.services.weather.api_client import WeatherAPIClient
+from app.services.weather.rate_limiter import (
+    TokenBucket,
+    UpstreamRateLimiter,
+    parse_retry_after,
+)
+from app.services.weather.retry import RetryPolicy
+
+
+class FakeUpstream:
+    """In-process stand-in for Open-Meteo tracking load it receives"""
+
+    def __init__(self, payload: dict, latency: float = 0.01):
+        self.payload = payload
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.request_times: list[float] = []
+        self.responses: list[httpx.Response] = []
+
+    async def handler(self, _request: httpx.Request) -> httpx.Response:
+        """Handle a forecast request"""
+        self.request_times.append(time.monotonic())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+        finally:
+            self.in_flight -= 1
+        if self.responses:
+            return self.responses.pop(0)
+        return httpx.Response(200, json=self.payload)
+
+
+def build_api_client(
+    upstream: FakeUpstream, rate_limiter: UpstreamRateLimiter
+) -> WeatherAPIClient:
+    """Api client talking to the fake upstream"""
+    return WeatherAPIClient(
+        "https://api.test.com",
+        timeout=30.0,
+        cache_duration_minutes=10,
+        retry_policy=RetryPolicy(max_retries=1, base_delay=0.001, max_delay=0.002),
+        rate_limiter=rate_limiter,
+        transport=httpx.MockTransport(upstream.handler),
+    )
+
+
+class TestParseRetryAfter:
+    """Test cases for Retry-After parsing"""
+
+    def test_delta_seconds(self):
+        """Test numeric Retry-After values"""
+        assert parse_retry_after("2") == 2.0
+        assert parse_retry_after("-5") == 0.0
+
+    def test_http_date(self):
+        """Test HTTP-date Retry-After values in the past"""
+        assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+    def test_invalid(self):
+        """Test missing or garbage values"""
+        assert parse_retry_after(None) is None
+        assert parse_retry_after("soon") is None
+
+
+class TestTokenBucket:
+    """Test cases for the token bucket"""
+
+    def test_burst_then_wait(self):
+        """Test the burst is available immediately and then callers must wait"""
+        bucket = TokenBucket(rate_per_second=10, burst=2)
+
+        assert bucket.try_take() == 0.0
+        assert bucket.try_take() == 0.0
+        assert 0 < bucket.try_take() <= 0.1
+
+    def test_pause(self):
+        """Test a pause withholds tokens"""
+        bucket = TokenBucket(rate_per_second=10, burst=2)
+        bucket.pause(1)
+
+        assert 0.9 < bucket.try_take() <= 1
+
+
+class TestUpstreamRateLimiterUnderLoad:
+    """Load tests for the limiter in front of a fake upstream"""
+
+    @pytest.mark.asyncio
+    async def test_caps_concurrency_and_rate(self, mock_current_weather_api_response):
+        """Test concurrent fetches respect both the rate and concurrency caps"""
+        upstream = FakeUpstream(mock_current_weather_api_response, latency=0.02)
+        limiter = UpstreamRateLimiter(rate_per_second=100, burst=5, max_concurrency=3)
+        api_client = build_api_client(upstream, limiter)
+        queue_depths = []
+
+        async def fetch(i: int):
+            await api_client.fetch_weather_data({"latitude": i, "longitude": i})
+            queue_depths.append(limiter.queue_depth)
+
+        start = time.monotonic()
+        await asyncio.gather(*(fetch(i) for i in range(40)))
+        elapsed = time.monotonic() - start
+
+        assert len(upstream.request_times) == 40
+        assert upstream.max_in_flight <= 3
+        # 5 burst tokens, the remaining 35 requests are paced at 100/s
+        assert elapsed >= 0.3
+        assert max(queue_depths) > 0
+        assert limiter.queue_depth == 0
+        assert limiter.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_cache_hits_skip_the_queue(self, mock_current_weather_api_response):
+        """Test cached requests return without waiting behind the limiter"""
+        upstream = FakeUpstream(mock_current_weather_api_response)
+        limiter = UpstreamRateLimiter(rate_per_second=1, burst=1, max_concurrency=1)
+        api_client = build_api_client(upstream, limiter)
+        params = {"latitude": 1.0, "longitude": 1.0}
+        await api_client.fetch_weather_data(params)
+
+        start = time.monotonic()
+        await asyncio.gather(
+            *(api_client.fetch_weather_data(params) for _ in range(20))
+        )
+
+        assert time.monotonic() - start < 0.5
+        assert len(upstream.request_times) == 1
+
+    @pytest.mark.asyncio
+    async def test_honours_retry_after(self, mock_current_weather_api_response):
+        """Test a 429 pauses upstream calls for the Retry-After period"""
+        upstream = FakeUpstream(mock_current_weather_api_response, latency=0)
+        upstream.responses.append(httpx.Response(429, headers={"Retry-After": "0.2"}))
+        limiter = UpstreamRateLimiter(rate_per_second=100, burst=5, max_concurrency=3)
+        api_client = build_api_client(upstream, limiter)
+
+        result = await api_client.fetch_weather_data({"latitude": 1, "longitude": 1})
+
+        assert result["current"]["weather_code"] == 2
+        assert len(upstream.request_times) == 2
+        assert upstream.request_times[1] - upstream.request_times[0] >= 0.2
@@ -0,0 +1,64 @@
+"""Unit tests for compact time axes"""
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from app.services.weather.time_axis import TimeAxis
+
+HOURS = ["2024-09-09T09:00", "2024-09-09T10:00", "2024-09-09T11:00"]
+
+
+class TestTimeAxis:
+    """Test cases for TimeAxis"""
+
+    def test_regular_axis_is_compact(self):
+        """Test evenly spaced times are stored as start, step and count"""
+        axis = TimeAxis.parse(HOURS)
+
+        assert axis.is_regular
+        assert axis.start == np.datetime64("2024-09-09T09:00")
+        assert axis.step == np.timedelta64(1, "h")
+        assert len(axis) == 3
+
+    def test_irregular_axis_keeps_values(self):
+        """Test unevenly spaced times keep every value"""
+        sunrises = ["2024-09-09T05:26", "2024-09-10T05:28", "2024-09-11T05:29"]
+        axis = TimeAxis.parse(sunrises)
+
+        assert not axis.is_regular
+        assert axis.iso() == sunrises
+
+    def test_datetimes(self):
+        """Test timestamps materialize as naive datetimes"""
+        assert TimeAxis.parse(HOURS).datetimes() == [
+            datetime(2024, 9, 9, hour) for hour in (9, 10, 11)
+        ]
+
+    def test_daily_dates(self):
+        """Test dates parse to midnight of each day"""
+        axis = TimeAxis.parse(["2024-09-09", "2024-09-10"])
+
+        assert axis.step == np.timedelta64(1, "D")
+        assert axis[1] == datetime(2024, 9, 10)
+
+    def test_iso_round_trip(self):
+        """Test ISO strings are formatted back in the API's format"""
+        assert TimeAxis.parse(HOURS).iso() == HOURS
+
+    def test_indexing(self):
+        """Test single timestamps are computed from the start and step"""
+        axis = TimeAxis.parse(HOURS)
+
+        assert axis[-1] == datetime(2024, 9, 9, 11)
+        with pytest.raises(IndexError):
+            axis[3]  # pylint: disable=pointless-statement
+
+    @pytest.mark.parametrize("values", [[], ["2024-09-09T09:00"]])
+    def test_short_axes(self, values):
+        """Test empty and single value axes"""
+        axis = TimeAxis.parse(values)
+
+        assert axis.iso() == values
+        assert len(axis.datetimes()) == len(values)
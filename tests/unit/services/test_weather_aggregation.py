@@ -0,0 +1,141 @@
+"""Unit tests for daily aggregates derived from hourly data"""
+
+import numpy as np
+import pytest
+
+from app.services.weather.aggregation import aggregate_daily, local_times
+from app.services.weather.exceptions import WeatherAPIFormatError
+from app.services.weather.mappers import map_daily_weather
+from app.services.weather.time_axis import TimeAxis
+
+
+@pytest.fixture(name="two_day_response")
+def fixture_two_day_response(mock_hourly_weather_api_response):
+    """Hourly response spanning the end of one local day and the next"""
+    hourly = mock_hourly_weather_api_response["hourly"]
+    return {
+        **mock_hourly_weather_api_response,
+        "hourly": {
+            **hourly,
+            "time": [
+                "2024-09-09T22:00",
+                "2024-09-09T23:00",
+                "2024-09-10T00:00",
+                "2024-09-10T01:00",
+                "2024-09-10T02:00",
+            ],
+            "precipitation_probability": [0, None, 10, 30, 15],
+        },
+    }
+
+
+@pytest.fixture(name="dst_change_response")
+def fixture_dst_change_response(mock_hourly_weather_api_response):
+    """Unix-time hourly response over the end of British Summer Time
+
+    72 hours from local midnight on 2024-10-26, clocks go back an hour on the
+    27th, which so has 25 hours.
+    """
+    hourly = mock_hourly_weather_api_response["hourly"]
+    hours = 72
+    return {
+        **mock_hourly_weather_api_response,
+        "hourly": {
+            **{name: [values[0]] * hours for name, values in hourly.items()},
+            "time": list(range(1729897200, 1729897200 + hours * 3600, 3600)),
+            "precipitation": [0.5] * hours,
+        },
+    }
+
+
+class TestAggregateDaily:
+    """Test cases for the local daily aggregation stage"""
+
+    def test_groups_by_local_day(self, two_day_response):
+        """Test hours are reduced per local day"""
+        daily = aggregate_daily(two_day_response)["daily"]
+
+        assert daily["time"] == ["2024-09-09", "2024-09-10"]
+        assert daily["temperature_2m_max"] == [17.2, 19.4]
+        assert daily["temperature_2m_min"] == [15.9, 18.6]
+        assert daily["apparent_temperature_min"] == [15.1, 17.2]
+        assert daily["precipitation_probability_max"] == [0, 30]
+        assert daily["uv_index_max"] == [3.65, 4.95]
+        assert daily["precipitation_hours"] == [0.0, 2.0]
+        assert daily["weather_code"] == [1, 80]
+        assert daily["cloud_cover_mean"] == [20, 78]
+
+    def test_unix_times_shifted_to_local(self, mock_hourly_weather_api_response):
+        """Test unix times are grouped by the local day of the response"""
+        # 2024-09-09T23:30Z is already the 10th at UTC+1
+        data = {
+            **mock_hourly_weather_api_response,
+            "hourly": {"time": [1725924600]},
+        }
+
+        assert np.datetime_as_string(local_times(data)).tolist() == ["2024-09-10T00:30"]
+
+    def test_dst_change_groups_by_local_day(self, dst_change_response):
+        """Test unix times use the zone's offset at each hour, not a fixed one"""
+        daily = aggregate_daily(dst_change_response)["daily"]
+
+        assert daily["precipitation_hours"] == [24.0, 25.0, 23.0]
+        # Local midnights, BST on the 26th and 27th and GMT on the 28th
+        assert daily["time"] == [1729897200, 1729983600, 1730073600]
+        # Sunrise moves by minutes a day, not by the hour the clocks moved
+        assert np.all(np.abs(np.diff(daily["sunrise"]) - 86400) < 600)
+
+    def test_missing_weather_codes(self, two_day_response):
+        """Test missing codes are skipped, days without any have none"""
+        data = {
+            **two_day_response,
+            "hourly": {
+                **two_day_response["hourly"],
+                "weather_code": [None, None, 3, float("nan"), 61],
+            },
+        }
+
+        assert aggregate_daily(data)["daily"]["weather_code"] == [None, 61]
+
+    def test_localized_time_axis(self, mock_hourly_weather_api_response):
+        """Test localized time axes are used as they are"""
+        hourly = mock_hourly_weather_api_response["hourly"]
+        data = {
+            **mock_hourly_weather_api_response,
+            "hourly": {**hourly, "time": TimeAxis.parse(hourly["time"])},
+        }
+
+        assert aggregate_daily(data) == aggregate_daily(
+            mock_hourly_weather_api_response
+        )
+
+    def test_sunrise_and_sunset(self, mock_hourly_weather_api_response):
+        """Test sunrise and sunset are computed for the location"""
+        daily = aggregate_daily(mock_hourly_weather_api_response)["daily"]
+
+        # London, 9 September at UTC+1
+        assert daily["sunrise"][0].startswith("2024-09-09T06:2")
+        assert daily["sunset"][0].startswith("2024-09-09T19:")
+
+    def test_maps_like_upstream_daily(self, mock_hourly_weather_api_response):
+        """Test the derived sections map with the existing daily mapper"""
+        data = {
+            **mock_hourly_weather_api_response,
+            **aggregate_daily(mock_hourly_weather_api_response),
+        }
+
+        [day] = map_daily_weather(data)
+
+        assert day.temperature.max == 19.4
+        assert day.temperature.unit == "°C"
+        assert day.precipitation_hours == 2.0
+        assert day.weather_code == 80
+        assert day.sunshine_duration > 0
+
+    def test_missing_hourly_field(self, mock_hourly_weather_api_response):
+        """Test incomplete hourly data raises WeatherAPIFormatError"""
+        hourly = dict(mock_hourly_weather_api_response["hourly"])
+        del hourly["uv_index"]
+
+        with pytest.raises(WeatherAPIFormatError):
+            aggregate_daily({**mock_hourly_weather_api_response, "hourly": hourly})
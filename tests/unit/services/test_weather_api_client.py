@@ -8,11 +8,13 @@ import httpx
 
 from app.services.weather.api_client import WeatherAPIClient
 from app.services.weather.exceptions import (
+    WeatherAPIDeadlineExceededError,
     WeatherAPITimeoutError,
     WeatherAPIHTTPError,
     WeatherServiceError,
 )
 from app.services.weather.models import WeatherApiParams
+from app.utils.deadline import Deadline
 
 
 @pytest.fixture(name="api_client")
@@ -145,6 +147,60 @@ class TestWeatherAPIClient:
 
             assert "Weather service unavailable" in str(exc_info.value)
 
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_share_one_fetch(
+        self, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test concurrent identical cache misses make a single upstream call"""
+        calls = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=mock_current_weather_api_response)
+
+        api_client = WeatherAPIClient(
+            "https://api.test.com",
+            timeout=30.0,
+            cache_duration_minutes=10,
+            transport=httpx.MockTransport(handler),
+        )
+        params: WeatherApiParams = {**sample_coordinates, "current": ["temperature"]}
+
+        results = await asyncio.gather(
+            *(api_client.fetch_weather_data(params) for _ in range(5))
+        )
+
+        assert len(calls) == 1
+        assert all(result["current"]["weather_code"] == 2 for result in results)
+
+    @pytest.mark.asyncio
+    async def test_short_leader_deadline_spares_followers(
+        self, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test a first caller's short deadline doesn't fail later callers"""
+
+        async def handler(_request: httpx.Request) -> httpx.Response:
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, json=mock_current_weather_api_response)
+
+        api_client = WeatherAPIClient(
+            "https://api.test.com",
+            timeout=30.0,
+            cache_duration_minutes=10,
+            transport=httpx.MockTransport(handler),
+        )
+        params: WeatherApiParams = {**sample_coordinates, "current": ["temperature"]}
+
+        leader, follower = await asyncio.gather(
+            api_client.fetch_weather_data(params, deadline=Deadline.after(0.1)),
+            api_client.fetch_weather_data(params, deadline=Deadline.after(5)),
+            return_exceptions=True,
+        )
+
+        assert isinstance(leader, WeatherAPIDeadlineExceededError)
+        assert follower["current"]["weather_code"] == 2
+
     # @pytest.mark.asyncio
     # async def test_cache_expiration(
     #     self, sample_coordinates, mock_current_weather_api_response
@@ -0,0 +1,89 @@
+"""Unit tests for compact cache storage of weather payloads"""
+
+import numpy as np
+
+from app.services.weather.aggregation import aggregate_daily
+from app.services.weather.compact import CompactSeries, compact_response, to_list
+from app.services.weather.mappers import map_daily_weather, map_hourly_weather
+from app.services.weather.time_axis import TimeAxis
+from app.services.weather.units import UnitSelection, convert_response
+from app.schemas.units import TemperatureUnit
+
+
+class TestCompactSeries:
+    """Test cases for CompactSeries"""
+
+    def test_column_types(self, mock_hourly_weather_api_response):
+        """Test each variable gets the narrowest exact representation"""
+        hourly = CompactSeries.from_section(mock_hourly_weather_api_response["hourly"])
+
+        # pylint: disable=protected-access
+        assert isinstance(hourly["time"], TimeAxis)
+        assert hourly._columns["weather_code"].dtype == np.int8
+        assert hourly._columns["temperature_2m"].dtype == np.float32
+        assert hourly["temperature_2m"].dtype == np.float64
+
+    def test_values_round_trip(self, mock_hourly_weather_api_response):
+        """Test values read back exactly as the API sent them"""
+        raw = mock_hourly_weather_api_response["hourly"]
+        hourly = CompactSeries.from_section(raw)
+
+        for name, values in raw.items():
+            if name != "time":
+                assert to_list(hourly[name]) == values
+
+    def test_missing_values(self):
+        """Test nulls are stored as NaN and read back as None"""
+        hourly = CompactSeries.from_section({"uv_index": [1.5, None, 2.25]})
+
+        assert to_list(hourly["uv_index"]) == [1.5, None, 2.25]
+
+    def test_imprecise_values_stay_float64(self):
+        """Test values float32 can't restore keep full precision"""
+        hourly = CompactSeries.from_section({"value": [0.123456789, 1.0]})
+
+        # pylint: disable=protected-access
+        assert hourly._columns["value"].dtype == np.float64
+        assert to_list(hourly["value"]) == [0.123456789, 1.0]
+
+    def test_smaller_than_lists(self, mock_hourly_weather_api_response):
+        """Test arrays hold fewer bytes than the boxed values they replace"""
+        raw = mock_hourly_weather_api_response["hourly"]
+        hourly = CompactSeries.from_section(raw)
+
+        values = sum(len(v) for k, v in raw.items() if k != "time")
+        assert hourly.nbytes < values * 8
+
+
+class TestCompactResponse:
+    """Test cases for consuming compact payloads"""
+
+    def test_maps_like_raw_payload(
+        self, mock_hourly_weather_api_response, mock_daily_weather_api_response
+    ):
+        """Test the mappers give the same forecasts from compact payloads"""
+        hourly = mock_hourly_weather_api_response
+        daily = mock_daily_weather_api_response
+
+        assert map_hourly_weather(compact_response(hourly)) == map_hourly_weather(
+            hourly
+        )
+        assert map_daily_weather(compact_response(daily)) == map_daily_weather(daily)
+
+    def test_converts_and_aggregates(self, mock_hourly_weather_api_response):
+        """Test unit conversion and daily aggregation accept compact payloads"""
+        raw = mock_hourly_weather_api_response
+        compact = compact_response(raw)
+        units = UnitSelection(temperature=TemperatureUnit.FAHRENHEIT)
+
+        assert (
+            to_list(convert_response(compact, units)["hourly"]["temperature_2m"])
+            == convert_response(raw, units)["hourly"]["temperature_2m"]
+        )
+        assert aggregate_daily(compact) == aggregate_daily(raw)
+
+    def test_other_sections_unchanged(self, mock_current_weather_api_response):
+        """Test scalar sections are kept as they are"""
+        raw = mock_current_weather_api_response
+
+        assert compact_response(raw)["current"] == raw["current"]
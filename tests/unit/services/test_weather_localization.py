@@ -0,0 +1,113 @@
+"""Unit tests for re-projecting unix-time weather data into local time"""
+
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from app.services.weather.localization import (
+    get_zone,
+    localize_response,
+    utc_offsets,
+)
+
+
+def unix(iso: str) -> int:
+    """Unix time of a UTC ISO timestamp"""
+    return int(datetime.fromisoformat(iso).replace(tzinfo=timezone.utc).timestamp())
+
+
+@pytest.fixture(name="unix_response")
+def fixture_unix_response():
+    """Response for London in summer time as returned with timeformat=unixtime"""
+    return {
+        "latitude": 51.5,
+        "longitude": -0.1278,
+        "utc_offset_seconds": 3600,
+        "timezone": "Europe/London",
+        "timezone_abbreviation": "GMT+1",
+        "current_units": {"time": "unixtime", "temperature_2m": "°C"},
+        "current": {"time": unix("2024-09-09T08:00"), "temperature_2m": 16.2},
+        "hourly_units": {"time": "unixtime"},
+        "hourly": {"time": [unix("2024-09-09T08:00"), unix("2024-09-09T09:00")]},
+        "daily_units": {"time": "unixtime", "sunrise": "unixtime"},
+        "daily": {
+            "time": [unix("2024-09-08T23:00")],
+            "sunrise": [unix("2024-09-09T05:28")],
+            "sunset": [unix("2024-09-09T18:27")],
+        },
+    }
+
+
+class TestLocalizeResponse:
+    """Test cases for localize_response"""
+
+    def test_location_timezone(self, unix_response):
+        """Test times default to the location's own timezone"""
+        localized = localize_response(unix_response)
+
+        assert localized["current"]["time"] == "2024-09-09T09:00"
+        assert localized["hourly"]["time"].iso() == [
+            "2024-09-09T09:00",
+            "2024-09-09T10:00",
+        ]
+        assert localized["daily"]["time"].iso(unit="D") == ["2024-09-09"]
+        assert localized["daily"]["sunrise"].iso() == ["2024-09-09T06:28"]
+        assert localized["hourly_units"]["time"] == "iso8601"
+        assert localized["timezone"] == "Europe/London"
+
+    def test_requested_timezone(self, unix_response):
+        """Test one payload re-projects into another timezone"""
+        localized = localize_response(unix_response, "America/New_York")
+
+        assert localized["hourly"]["time"].iso() == [
+            "2024-09-09T04:00",
+            "2024-09-09T05:00",
+        ]
+        assert localized["daily"]["sunrise"].iso() == ["2024-09-09T01:28"]
+        # Days stay the location's calendar days
+        assert localized["daily"]["time"].iso(unit="D") == ["2024-09-09"]
+        assert localized["timezone"] == "America/New_York"
+        assert localized["utc_offset_seconds"] in (-4 * 3600, -5 * 3600)
+
+    def test_cached_payload_unchanged(self, unix_response):
+        """Test localizing copies rather than modifying the cached payload"""
+        times = list(unix_response["hourly"]["time"])
+        localize_response(unix_response, "Asia/Tokyo")
+
+        assert unix_response["hourly"]["time"] == times
+        assert unix_response["timezone"] == "Europe/London"
+
+    def test_iso_response_passes_through(self, mock_hourly_weather_api_response):
+        """Test responses already in ISO times are returned as they are"""
+        response = mock_hourly_weather_api_response
+        assert localize_response(response) is response
+
+    def test_unknown_location_timezone_uses_offset(self, unix_response):
+        """Test an unknown API timezone falls back to utc_offset_seconds"""
+        unix_response["timezone"] = "Not/AZone"
+        localized = localize_response(unix_response)
+
+        assert localized["hourly"]["time"].iso()[0] == "2024-09-09T09:00"
+
+
+class TestUtcOffsets:
+    """Test cases for utc_offsets"""
+
+    def test_single_offset_without_transition(self):
+        """Test an axis without a transition gets one offset"""
+        times = np.array([unix("2024-09-09T08:00"), unix("2024-09-10T08:00")])
+        assert utc_offsets(times, get_zone("Europe/London"), 0) == 3600
+
+    def test_offsets_across_transition(self):
+        """Test an axis crossing the end of summer time gets per-time offsets"""
+        times = np.array(
+            [unix("2024-10-27T00:00"), unix("2024-10-27T01:00")], dtype=np.int64
+        )
+        offsets = utc_offsets(times, get_zone("Europe/London"), 0)
+        np.testing.assert_array_equal(offsets, [3600, 0])
+
+    def test_unknown_zone(self):
+        """Test unknown timezone names raise ValueError"""
+        with pytest.raises(ValueError):
+            get_zone("Not/AZone")
@@ -0,0 +1,249 @@
+"""Unit tests for upstream retry, hedging, latency tracking and deadlines"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import httpx
+import pytest
+
+from app.services.weather.api_client import WeatherAPIClient
+from app.services.weather.exceptions import (
+    WeatherAPIDeadlineExceededError,
+    WeatherAPIHTTPError,
+)
+from app.services.weather.retry import LatencyTracker, RetryBudget, RetryPolicy
+from app.utils.deadline import Deadline
+
+
+def build_response(status_code: int, json_data=None) -> Mock:
+    """Builds a mock httpx response with the given status code"""
+    response = Mock()
+    response.status_code = status_code
+    response.json = Mock(return_value=json_data)
+    if status_code >= 400:
+        response.raise_for_status = Mock(
+            side_effect=httpx.HTTPStatusError(
+                "Error",
+                request=httpx.Request("GET", "http://test.com"),
+                response=response,
+            )
+        )
+    else:
+        response.raise_for_status = Mock()
+    return response
+
+
+@pytest.fixture(name="api_client")
+def fixture_api_client() -> WeatherAPIClient:
+    """Api client with fast retries"""
+    return WeatherAPIClient(
+        "https://api.test.com",
+        timeout=30.0,
+        retry_policy=RetryPolicy(max_retries=2, base_delay=0.001, max_delay=0.002),
+    )
+
+
+class TestRetryPolicy:
+    """Test cases for the decorrelated jitter retry policy"""
+
+    def test_next_delay_within_bounds(self):
+        """Test delays stay between the base and max delay"""
+        policy = RetryPolicy(max_retries=5, base_delay=0.1, max_delay=1.0)
+        delay = policy.base_delay
+        for _ in range(50):
+            delay = policy.next_delay(delay)
+            assert policy.base_delay <= delay <= policy.max_delay
+
+    def test_max_attempts_includes_first_attempt(self):
+        """Test attempt count is retries plus the original request"""
+        assert RetryPolicy(max_retries=2).max_attempts == 3
+
+
+class TestRetryBudget:
+    """Test cases for the retry budget"""
+
+    def test_budget_exhausts(self):
+        """Test retries are refused once tokens run out"""
+        budget = RetryBudget(ratio=0.1, min_per_second=0.0, max_tokens=2.0)
+
+        assert budget.try_withdraw() is True
+        assert budget.try_withdraw() is True
+        assert budget.try_withdraw() is False
+
+    def test_requests_deposit_tokens(self):
+        """Test original requests earn back retry tokens"""
+        budget = RetryBudget(ratio=0.5, min_per_second=0.0, max_tokens=1.0)
+        assert budget.try_withdraw() is True
+
+        budget.record_request()
+        budget.record_request()
+
+        assert budget.try_withdraw() is True
+
+
+class TestLatencyTracker:
+    """Test cases for the rolling latency tracker"""
+
+    def test_percentile_requires_min_samples(self):
+        """Test no percentile is reported before enough samples"""
+        tracker = LatencyTracker(min_samples=5)
+        tracker.record(0.1)
+
+        assert tracker.percentile(95) is None
+
+    def test_percentile(self):
+        """Test percentile over recorded samples"""
+        tracker = LatencyTracker(min_samples=1)
+        for i in range(100):
+            tracker.record(i / 100)
+
+        assert tracker.percentile(95) == 0.95
+        assert tracker.percentile(50) == 0.5
+
+
+class TestWeatherAPIClientRetries:
+    """Test cases for WeatherAPIClient retry and hedging behaviour"""
+
+    @pytest.mark.asyncio
+    async def test_retries_server_error_then_succeeds(
+        self, api_client, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test a 503 is retried and the following success returned"""
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.side_effect = [
+                build_response(503),
+                build_response(200, mock_current_weather_api_response),
+            ]
+
+            result = await api_client.fetch_weather_data(
+                {**sample_coordinates, "current": ["temperature"]}
+            )
+
+            assert mock_get.call_count == 2
+            assert result["current"]["weather_code"] == 2
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_error(self, api_client):
+        """Test 4xx responses other than 429 fail without retrying"""
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.return_value = build_response(400)
+
+            with pytest.raises(WeatherAPIHTTPError):
+                await api_client.fetch_weather_data({"test": "param"})
+
+            assert mock_get.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_limited_by_budget(self):
+        """Test an exhausted retry budget stops retries"""
+        api_client = WeatherAPIClient(
+            "https://api.test.com",
+            timeout=30.0,
+            retry_policy=RetryPolicy(max_retries=5, base_delay=0.001, max_delay=0.002),
+            retry_budget=RetryBudget(ratio=0.0, min_per_second=0.0, max_tokens=1.0),
+        )
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.return_value = build_response(503)
+
+            with pytest.raises(WeatherAPIHTTPError):
+                await api_client.fetch_weather_data({"test": "param"})
+
+            # One original attempt plus the single retry the budget allows
+            assert mock_get.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hedges_slow_request(
+        self, api_client, sample_coordinates, mock_current_weather_api_response
+    ):
+        """Test a request slower than p95 is hedged and the fast answer wins"""
+        for _ in range(api_client.latency_tracker.min_samples):
+            api_client.latency_tracker.record(0.01)
+
+        responses = iter(
+            [
+                (1.0, build_response(200, {"slow": True})),
+                (0.0, build_response(200, mock_current_weather_api_response)),
+            ]
+        )
+
+        async def delayed_response(*_args, **_kwargs):
+            delay, response = next(responses)
+            await asyncio.sleep(delay)
+            return response
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.side_effect = delayed_response
+
+            result = await asyncio.wait_for(
+                api_client.fetch_weather_data(
+                    {**sample_coordinates, "current": ["temperature"]}
+                ),
+                timeout=0.5,
+            )
+
+            assert mock_get.call_count == 2
+            assert result["current"]["weather_code"] == 2
+
+    @pytest.mark.asyncio
+    async def test_cancel_during_hedge_delay(self, api_client, sample_coordinates):
+        """Test cancelling the caller before the hedge cancels the first attempt"""
+        for _ in range(api_client.latency_tracker.min_samples):
+            api_client.latency_tracker.record(1.0)
+        cancelled = asyncio.Event()
+
+        async def slow_response(*_args, **_kwargs):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        client = Mock()
+        client.get = slow_response
+        # pylint: disable=protected-access
+        task = asyncio.ensure_future(api_client._hedged_get(client, sample_coordinates))
+        await asyncio.sleep(0.01)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert cancelled.is_set()
+        assert api_client.rate_limiter.in_flight == 0
+
+
+class TestWeatherAPIClientDeadline:
+    """Test cases for WeatherAPIClient deadline propagation"""
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_skips_upstream(self, api_client):
+        """Test no upstream call is started once the deadline has passed"""
+        with patch("httpx.AsyncClient") as mock_client:
+            with pytest.raises(WeatherAPIDeadlineExceededError):
+                await api_client.fetch_weather_data(
+                    {"test": "param"}, deadline=Deadline.after(-1)
+                )
+
+            mock_client.return_value.__aenter__.return_value.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_slow_upstream_cut_off_at_deadline(self, api_client):
+        """Test a slow upstream call is cancelled when the deadline passes"""
+
+        async def slow_response(*_args, **_kwargs):
+            await asyncio.sleep(5)
+
+        with patch("httpx.AsyncClient") as mock_client:
+            mock_get = mock_client.return_value.__aenter__.return_value.get
+            mock_get.side_effect = slow_response
+
+            with pytest.raises(WeatherAPIDeadlineExceededError):
+                await asyncio.wait_for(
+                    api_client.fetch_weather_data(
+                        {"test": "param"}, deadline=Deadline.after(0.05)
+                    ),
+                    timeout=1,
+                )
@@ -3,8 +3,12 @@
 from unittest.mock import patch
 import pytest
 
+from app.config import settings
 from app.schemas.weather_data import WeatherForecastData, WeatherDailyForecastData
 from app.services.weather.api_client import WeatherAPIClient
+from app.services.weather.compact import compact_response
+from app.services.weather.mappers import map_hourly_weather
+from app.services.weather.units import TemperatureUnit, UnitSelection
 from app.services.weather.service import WeatherService
 
 
@@ -114,3 +118,164 @@ class TestWeatherService:
         assert now_result.temperature.unit == "°C"
         assert now_result.wind_speed.value == 7.4
         assert now_result.wind_speed.unit == "km/h"
+
+    @pytest.mark.asyncio
+    async def test_get_daily_weather_from_hourly(
+        self,
+        monkeypatch,
+        mock_weather_api_response,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test daily weather is aggregated locally when daily isn't fetched"""
+        monkeypatch.setattr(settings, "weather_daily_from_hourly", True)
+        weather_service = WeatherService()
+        mock_weather_api_response.return_value = mock_hourly_weather_api_response
+
+        result = await weather_service.get_daily_weather(**sample_coordinates)
+
+        params = mock_weather_api_response.call_args.args[0]
+        assert "daily" not in params
+        assert "sunshine_duration" in params["hourly"]
+        assert len(result) == 1
+        assert result[0].temperature.max == 19.4
+        assert result[0].weather_code == 80
+
+    @pytest.mark.asyncio
+    async def test_daily_from_hourly_keeps_location_days(
+        self,
+        monkeypatch,
+        mock_weather_api_response,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test aggregated days are the location's, whatever the timezone"""
+        monkeypatch.setattr(settings, "weather_daily_from_hourly", True)
+        weather_service = WeatherService()
+        # 09:00 to 13:00 in London, 20:00 to 00:00 the next day in Auckland
+        hourly = mock_hourly_weather_api_response["hourly"]
+        mock_weather_api_response.return_value = {
+            **mock_hourly_weather_api_response,
+            "hourly": {**hourly, "time": [1725868800 + 3600 * i for i in range(5)]},
+        }
+
+        result = await weather_service.get_daily_weather(
+            **sample_coordinates, timezone="Pacific/Auckland"
+        )
+
+        assert len(result) == 1
+        assert result[0].time.date().isoformat() == "2024-09-09"
+        assert result[0].temperature.min == 15.9
+        assert result[0].temperature.max == 19.4
+        # London's sunrise, around 05:25 UTC, shown in Auckland time
+        assert result[0].sunrise.isoformat().startswith("2024-09-09T17:2")
+
+    @pytest.mark.asyncio
+    async def test_coordinates_snapped_before_fetch(
+        self,
+        monkeypatch,
+        mock_weather_api_response,
+        mock_current_weather_api_response,
+    ):
+        """Test the upstream request uses the snapped coordinates"""
+        monkeypatch.setattr(settings, "weather_snap_mode", "grid")
+        monkeypatch.setattr(settings, "weather_snap_resolution", 0.1)
+        weather_service = WeatherService()
+        mock_weather_api_response.return_value = mock_current_weather_api_response
+
+        await weather_service.get_current_weather(51.5074, -0.1278)
+
+        params = mock_weather_api_response.call_args.args[0]
+        assert (params["latitude"], params["longitude"]) == (51.5, -0.1)
+
+
+class TestMappedViews:
+    """Test cases for reusing forecasts mapped from a cached payload"""
+
+    @pytest.mark.asyncio
+    async def test_cached_payload_mapped_once(
+        self,
+        weather_service,
+        mock_weather_api_response,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test repeat requests for one payload reuse the mapped forecast"""
+        mock_weather_api_response.return_value = compact_response(
+            mock_hourly_weather_api_response
+        )
+
+        with patch(
+            "app.services.weather.service.map_hourly_weather",
+            wraps=map_hourly_weather,
+        ) as mapper:
+            first = await weather_service.get_hourly_weather(**sample_coordinates)
+            second = await weather_service.get_hourly_weather(**sample_coordinates)
+
+        assert second is first
+        assert mapper.call_count == 1
+        assert first[0].clothing is not None
+
+    @pytest.mark.asyncio
+    async def test_views_by_units_and_timezone(
+        self,
+        weather_service,
+        mock_weather_api_response,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test other units and timezones are mapped separately"""
+        payload = compact_response(mock_hourly_weather_api_response)
+        mock_weather_api_response.return_value = payload
+
+        metric = await weather_service.get_hourly_weather(**sample_coordinates)
+        imperial = await weather_service.get_hourly_weather(
+            **sample_coordinates,
+            units=UnitSelection(temperature=TemperatureUnit.FAHRENHEIT),
+        )
+        tokyo = await weather_service.get_hourly_weather(
+            **sample_coordinates, timezone="Asia/Tokyo"
+        )
+
+        assert len(payload.views) == 3
+        assert metric[0].temperature.unit == "°C"
+        assert imperial[0].temperature.unit == "°F"
+        assert tokyo is not metric
+
+    @pytest.mark.asyncio
+    async def test_views_bounded(
+        self,
+        monkeypatch,
+        mock_weather_api_response,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test the oldest view is dropped once a payload holds the maximum"""
+        monkeypatch.setattr(settings, "weather_mapped_views_per_entry", 2)
+        weather_service = WeatherService()
+        payload = compact_response(mock_hourly_weather_api_response)
+        mock_weather_api_response.return_value = payload
+
+        for timezone in ("UTC", "Asia/Tokyo", "America/New_York"):
+            await weather_service.get_hourly_weather(
+                **sample_coordinates, timezone=timezone
+            )
+
+        assert [key[3] for key in payload.views] == ["Asia/Tokyo", "America/New_York"]
+
+    @pytest.mark.asyncio
+    async def test_uncached_payload_mapped_each_time(
+        self,
+        weather_service,
+        mock_weather_api_response,
+        sample_coordinates,
+        mock_hourly_weather_api_response,
+    ):
+        """Test payloads without views are mapped on every request"""
+        mock_weather_api_response.return_value = mock_hourly_weather_api_response
+
+        first = await weather_service.get_hourly_weather(**sample_coordinates)
+        second = await weather_service.get_hourly_weather(**sample_coordinates)
+
+        assert second is not first
+        assert second == first
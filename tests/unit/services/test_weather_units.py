@@ -0,0 +1,90 @@
+"""Unit tests for unit conversion of weather responses"""
+
+import numpy as np
+import pytest
+
+from app.services.weather.units import (
+    CANONICAL_UNITS,
+    PrecipitationUnit,
+    Quantity,
+    TemperatureUnit,
+    UnitSelection,
+    WindSpeedUnit,
+    convert_response,
+)
+
+IMPERIAL = UnitSelection(
+    temperature=TemperatureUnit.FAHRENHEIT,
+    wind_speed=WindSpeedUnit.MPH,
+    precipitation=PrecipitationUnit.INCH,
+)
+
+
+class TestUnitSelection:
+    """Test cases for vectorized unit conversion"""
+
+    @pytest.mark.parametrize(
+        "units, quantity, values, expected",
+        [
+            (IMPERIAL, Quantity.TEMPERATURE, [0.0, 100.0, -40.0], [32.0, 212.0, -40.0]),
+            (
+                UnitSelection(wind_speed=WindSpeedUnit.MS),
+                Quantity.WIND_SPEED,
+                [36.0],
+                [10.0],
+            ),
+            (
+                UnitSelection(wind_speed=WindSpeedUnit.KN),
+                Quantity.WIND_SPEED,
+                [18.52],
+                [10.0],
+            ),
+            (IMPERIAL, Quantity.PRECIPITATION, [25.4, 1.0], [1.0, 0.039]),
+        ],
+    )
+    def test_convert(self, units, quantity, values, expected):
+        """Test canonical values convert to the selected unit"""
+        np.testing.assert_allclose(units.convert(values, quantity), expected)
+
+    def test_missing_values_stay_missing(self):
+        """Test None values convert to NaN rather than failing"""
+        assert np.isnan(IMPERIAL.convert([None], Quantity.TEMPERATURE)[0])
+
+    def test_canonical(self):
+        """Test the default selection is the canonical one"""
+        assert UnitSelection().is_canonical
+        assert not IMPERIAL.is_canonical
+
+
+class TestConvertResponse:
+    """Test cases for converting whole API responses"""
+
+    def test_converts_series_and_labels(self, mock_hourly_weather_api_response):
+        """Test hourly series and unit labels are converted"""
+        converted = convert_response(mock_hourly_weather_api_response, IMPERIAL)
+
+        assert converted["hourly"]["temperature_2m"][0] == 60.6
+        assert converted["hourly_units"]["temperature_2m"] == "°F"
+        assert converted["hourly_units"]["wind_speed_10m"] == "mp/h"
+        assert converted["hourly"]["precipitation"][3] == 0.043
+        assert (
+            converted["hourly"]["relative_humidity_2m"]
+            == mock_hourly_weather_api_response["hourly"]["relative_humidity_2m"]
+        )
+
+    def test_cached_payload_untouched(self, mock_current_weather_api_response):
+        """Test converting leaves the source payload as it was"""
+        converted = convert_response(mock_current_weather_api_response, IMPERIAL)
+
+        assert converted["current"]["temperature_2m"] == 61.2
+        assert mock_current_weather_api_response["current"]["temperature_2m"] == 16.2
+        assert mock_current_weather_api_response["current_units"]["temperature_2m"] == (
+            "°C"
+        )
+
+    def test_canonical_is_passthrough(self, mock_current_weather_api_response):
+        """Test canonical units return the payload without copying"""
+        data = mock_current_weather_api_response
+
+        assert convert_response(data, CANONICAL_UNITS) is data
+        assert convert_response(data, None) is data
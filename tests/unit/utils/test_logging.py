@@ -0,0 +1,95 @@
+"""Unit tests for the logging pipeline"""
+
+import io
+import json
+
+import pytest
+import structlog
+
+from app.utils.logging import (
+    EventSampler,
+    QueueLogWriter,
+    lazy,
+    resolve_lazy_fields,
+)
+from app.utils.metrics import registry
+
+
+class TestEventSampler:
+    """Test cases for per-event sampling"""
+
+    def test_unsampled_event_kept(self):
+        """Test events without a rate are always kept"""
+        sampler = EventSampler({"Cache hit": 0.1}, rand=lambda: 0.99)
+
+        assert sampler(None, "info", {"event": "Data cached"}) == {
+            "event": "Data cached"
+        }
+
+    def test_sampled_event_dropped(self):
+        """Test events outside the sample are dropped"""
+        sampler = EventSampler({"Cache hit": 0.1}, rand=lambda: 0.5)
+
+        with pytest.raises(structlog.DropEvent):
+            sampler(None, "info", {"event": "Cache hit"})
+
+    def test_sampled_event_kept_with_rate(self):
+        """Test kept events record their sample rate"""
+        sampler = EventSampler({"Cache hit": 0.1}, rand=lambda: 0.05)
+
+        event_dict = sampler(None, "info", {"event": "Cache hit"})
+
+        assert event_dict["sample_rate"] == 0.1
+
+
+class TestLazyFields:
+    """Test cases for lazily built log fields"""
+
+    def test_resolved(self):
+        """Test lazy fields are evaluated by the processor"""
+        event_dict = resolve_lazy_fields(
+            None, "info", {"event": "Cache hit", "keys": lazy("".join, ["3", "a"])}
+        )
+
+        assert event_dict["keys"] == "3a"
+
+    def test_not_built_when_filtered(self):
+        """Test lazy fields aren't evaluated for events below the log level"""
+        calls = []
+        logger = structlog.wrap_logger(
+            structlog.ReturnLogger(),
+            processors=[resolve_lazy_fields, lambda _l, _m, event: event],
+            wrapper_class=structlog.make_filtering_bound_logger(20),
+        )
+
+        logger.debug("Cache hit", keys=lazy(calls.append, "built"))
+
+        assert not calls
+
+
+class TestQueueLogWriter:
+    """Test cases for the background log writer"""
+
+    def test_writes_json_lines(self):
+        """Test queued events are rendered and written by the writer thread"""
+        stream = io.StringIO()
+        writer = QueueLogWriter(stream=stream)
+        writer.start()
+
+        writer.put({"event": "Cache hit", "cache_size": 2})
+        writer.flush()
+
+        assert json.loads(stream.getvalue()) == {"event": "Cache hit", "cache_size": 2}
+
+    def test_drops_when_full(self):
+        """Test a full queue drops events instead of blocking"""
+        dropped = registry.get("log_events_dropped_total").labels()
+        dropped_before = dropped.value
+        # Not started, so nothing drains the queue
+        writer = QueueLogWriter(max_size=1)
+
+        writer.put({"event": "first"})
+        writer.put({"event": "second"})
+
+        assert writer.queue.qsize() == 1
+        assert dropped.value == dropped_before + 1
@@ -0,0 +1,94 @@
+"""Unit tests for the in-process metrics registry"""
+
+import pytest
+
+from app.utils.metrics import MetricsRegistry
+
+
+@pytest.fixture(name="metrics_registry")
+def fixture_metrics_registry() -> MetricsRegistry:
+    """Fresh registry for each test"""
+    return MetricsRegistry()
+
+
+class TestMetricsRegistry:
+    """Test cases for metric recording and Prometheus rendering"""
+
+    def test_counter(self, metrics_registry):
+        """Test labelled counters render one sample per label set"""
+        counter = metrics_registry.counter("hits_total", "Hits", ("result",))
+        counter.labels("hit").inc()
+        counter.labels("hit").inc()
+        counter.labels("miss").inc(3)
+
+        output = metrics_registry.render()
+
+        assert "# TYPE hits_total counter" in output
+        assert 'hits_total{result="hit"} 2.0' in output
+        assert 'hits_total{result="miss"} 3.0' in output
+
+    def test_gauge(self, metrics_registry):
+        """Test unlabelled gauges are set to the latest value"""
+        gauge = metrics_registry.gauge("queue_depth", "Queue depth")
+        gauge.set(4)
+        gauge.set(2)
+
+        assert "queue_depth 2" in metrics_registry.render()
+
+    def test_histogram(self, metrics_registry):
+        """Test histogram buckets are cumulative with sum and count"""
+        histogram = metrics_registry.histogram(
+            "latency_seconds", "Latency", ("route",), buckets=(0.1, 1.0)
+        )
+        child = histogram.labels("/a")
+        child.observe(0.05)
+        child.observe(0.5)
+        child.observe(5)
+
+        output = metrics_registry.render()
+
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in output
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in output
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in output
+        assert 'latency_seconds_sum{route="/a"} 5.55' in output
+        assert 'latency_seconds_count{route="/a"} 3' in output
+
+    def test_label_values_escaped(self, metrics_registry):
+        """Test quotes in label values are escaped"""
+        counter = metrics_registry.counter("errors_total", "Errors", ("reason",))
+        counter.labels('bad "quote"').inc()
+
+        assert 'errors_total{reason="bad \\"quote\\""} 1.0' in metrics_registry.render()
+
+    def test_wrong_label_count(self, metrics_registry):
+        """Test label values must match the declared label names"""
+        counter = metrics_registry.counter("errors_total", "Errors", ("reason",))
+
+        with pytest.raises(ValueError):
+            counter.labels("a", "b")
+
+    def test_clear_keeps_bound_children(self, metrics_registry):
+        """Test clearing resets values without invalidating bound children"""
+        child = metrics_registry.counter("hits_total", "Hits", ("result",)).labels(
+            "hit"
+        )
+        child.inc()
+        metrics_registry.clear()
+        child.inc()
+
+        assert 'hits_total{result="hit"} 1.0' in metrics_registry.render()
+
+    def test_register_returns_existing(self, metrics_registry):
+        """Test registering the same name twice returns the first metric"""
+        first = metrics_registry.counter("hits_total", "Hits")
+
+        assert metrics_registry.counter("hits_total", "Hits") is first
+
+    def test_register_other_type_rejected(self, metrics_registry):
+        """Test a name can't be registered again as another metric type"""
+        metrics_registry.counter("requests", "Requests")
+
+        with pytest.raises(ValueError):
+            metrics_registry.histogram("requests", "Requests")
+        with pytest.raises(ValueError):
+            metrics_registry.gauge("requests", "Requests")
@@ -0,0 +1,42 @@
+"""Unit tests for sunrise and sunset calculation"""
+
+import numpy as np
+
+from app.utils.solar import sunrise_sunset
+
+
+def as_strings(times: np.ndarray) -> list:
+    """Minute-resolution ISO strings"""
+    return np.datetime_as_string(times, unit="m").tolist()
+
+
+class TestSunriseSunset:
+    """Test cases for solar times"""
+
+    def test_known_times(self):
+        """Test London's solstice times are within a couple of minutes"""
+        sunrise, sunset = sunrise_sunset(["2024-06-21"], 51.5074, -0.1278, 3600)
+
+        # Published: 04:43 and 21:21 BST
+        assert as_strings(sunrise) == ["2024-06-21T04:43"]
+        assert as_strings(sunset) == ["2024-06-21T21:21"]
+
+    def test_southern_hemisphere(self):
+        """Test Sydney's equinox times"""
+        sunrise, sunset = sunrise_sunset(["2024-03-20"], -33.8688, 151.2093, 39600)
+
+        # Published: 06:59 and 19:07 AEDT
+        assert abs(sunrise[0] - np.datetime64("2024-03-20T06:59")) <= np.timedelta64(
+            2, "m"
+        )
+        assert abs(sunset[0] - np.datetime64("2024-03-20T19:07")) <= np.timedelta64(
+            2, "m"
+        )
+
+    def test_polar_day_and_night(self):
+        """Test the midnight sun spans the day and polar night collapses"""
+        sunrise, sunset = sunrise_sunset(["2024-06-21", "2024-12-21"], 78.2, 15.6, 7200)
+
+        assert as_strings(sunrise)[0] == "2024-06-21T00:00"
+        assert as_strings(sunset)[0] == "2024-06-21T23:59"
+        assert sunrise[1] == sunset[1]
@@ -0,0 +1,58 @@
+"""Unit tests for request phase timing"""
+
+from app.utils.timing import RequestTimings, request_timings, span, timed
+
+
+class TestSpan:
+    """Test cases for timing spans"""
+
+    def test_no_op_outside_request(self):
+        """Test spans do nothing without an active collector"""
+        with span("cache") as active:
+            assert active is None
+
+    def test_repeated_phases_summed(self):
+        """Test a phase entered twice accumulates its time"""
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        try:
+            with span("cache"):
+                pass
+            with span("cache"):
+                pass
+            with span("map"):
+                pass
+        finally:
+            request_timings.reset(token)
+
+        assert list(timings.phases) == ["cache", "map"]
+        assert timings.phases["cache"] > 0
+
+    def test_timed_decorator(self):
+        """Test decorated functions are timed and return their result"""
+
+        @timed("map")
+        def mapper(value):
+            return value * 2
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        try:
+            assert mapper(2) == 4
+        finally:
+            request_timings.reset(token)
+
+        assert "map" in timings.phases
+
+
+class TestRequestTimings:
+    """Test cases for the Server-Timing header"""
+
+    def test_server_timing(self):
+        """Test phases are reported in milliseconds followed by the total"""
+        timings = RequestTimings()
+        timings.add("upstream", 0.0123)
+
+        header = timings.server_timing()
+
+        assert header.startswith("upstream;dur=12.30, total;dur=")